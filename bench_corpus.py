@@ -0,0 +1,39 @@
+"""
+СИНТЕТИЧЕСКИЙ КОРПУС РЕЦЕПТОВ
+Рецепты формата book/ для бенчмарков и нагрузочных прогонов без папки book/;
+в рабочем коде бота не используется
+"""
+
+import random
+from typing import Dict
+
+from recipes_loader import RecipesLoader
+
+# Продукты синтетических рецептов
+PRODUCTS = ["Курица", "Говядина", "Рис", "Гречка", "Яйцо", "Молоко", "Сыр", "Лосось",
+            "Картофель", "Морковь", "Лук", "Помидоры", "Огурцы", "Творог", "Овсянка",
+            "Хлеб", "Миндаль", "Фасоль", "Брокколи", "Индейка", "Макароны", "Кефир"]
+
+
+def synthetic_recipes(per_meal: int = 400, seed: int = 42) -> Dict[str, Dict[str, list]]:
+    """Рецепты {цель: {приём: [рецепты]}}, по per_meal на приём пищи"""
+    rng = random.Random(seed)
+    return {
+        goal: {
+            meal_type: [
+                {"Название блюда": f"Блюдо {goal} {meal_type} {i}",
+                 "Ингредиенты": [f"{p} — {rng.randint(50, 300)} г" for p in rng.sample(PRODUCTS, 6)],
+                 "Ккал": rng.randint(250, 900),
+                 "Конец. Б/Ж/У": f"{rng.randint(8, 55)}/{rng.randint(4, 35)}/{rng.randint(10, 100)}",
+                 "Приготовление": "Приготовить."}
+                for i in range(per_meal)
+            ]
+            for meal_type in RecipesLoader.MEAL_FILES
+        }
+        for goal in ("gain_weight", "lose_weight", "maintain")
+    }
+
+
+def load_synthetic_corpus(loader: RecipesLoader, per_meal: int = 400, seed: int = 42):
+    """Подменяет рецепты загрузчика синтетическим корпусом того же формата"""
+    loader.replace_recipes(synthetic_recipes(per_meal, seed))
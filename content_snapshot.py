@@ -0,0 +1,282 @@
+"""
+СНИМОК КОНТЕНТА
+Скомпилированный кэш папки book/ с проверкой по mtime и хэшам исходных файлов
+и фоновое отслеживание изменений для горячей перезагрузки
+"""
+
+import os
+import time
+import pickle
+import hashlib
+import logging
+import threading
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIR = os.getenv("CONTENT_SNAPSHOT_DIR", os.path.join("data", "snapshots"))
+
+
+class FileStamp(NamedTuple):
+    """Отпечаток исходного файла"""
+    size: int
+    mtime_ns: int
+    sha1: str
+
+
+def file_hash(path: str) -> str:
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def file_stamp(path: str) -> FileStamp:
+    st = os.stat(path)
+    return FileStamp(st.st_size, st.st_mtime_ns, file_hash(path))
+
+
+def list_json_files(root: str) -> List[str]:
+    """Все .json файлы под root (отсортированы, чтобы манифест был стабильным)"""
+    files = []
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            if filename.endswith('.json'):
+                files.append(os.path.join(dirpath, filename))
+    return sorted(files)
+
+
+class ContentSnapshot:
+    """
+    Снимок скомпилированных данных загрузчика
+
+    Хранит в одном pickle-файле готовые структуры (рецепты, записи, индексы)
+    и манифест исходных файлов. При старте снимок читается одним чтением,
+    если набор файлов не изменился: сначала сравниваются размер и mtime,
+    а при расхождении - SHA-1 содержимого (простое касание файла не
+    приводит к пересборке).
+    """
+
+    def __init__(self, name: str, schema: int, directory: str = SNAPSHOT_DIR):
+        self.name = name
+        self.schema = schema  # увеличивать при изменении формата данных
+        self.path = os.path.join(directory, f"{name}.pickle")
+
+    def _read(self) -> Optional[dict]:
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Snapshot {self.name} is unreadable, rebuilding: {e}")
+            return None
+
+    def _check(self, cached: dict, files: List[str]) -> Tuple[bool, bool]:
+        """Возвращает (снимок актуален, манифест нужно обновить)"""
+        if cached.get("schema") != self.schema:
+            return False, False
+        manifest: Dict[str, FileStamp] = cached.get("manifest", {})
+        if set(manifest) != set(files):
+            return False, False
+
+        touched = False
+        for path in files:
+            try:
+                st = os.stat(path)
+            except OSError:
+                return False, False
+            old = manifest[path]
+            if st.st_size == old.size and st.st_mtime_ns == old.mtime_ns:
+                continue
+            if st.st_size != old.size or file_hash(path) != old.sha1:
+                return False, False
+            touched = True
+        return True, touched
+
+    def _write(self, manifest: Dict[str, FileStamp], data: Any):
+        tmp_path = self.path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                pickle.dump({"schema": self.schema, "manifest": manifest, "data": data},
+                            f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            # Без снимка бот работает, просто стартует медленнее
+            logger.warning(f"Cannot write snapshot {self.name}: {e}")
+
+    def load(self, files: List[str], build: Callable[[], Any]) -> Any:
+        """
+        Получить данные из снимка или собрать их заново
+
+        Args:
+            files: Исходные файлы, от которых зависят данные
+            build: Функция полной сборки данных из исходников
+        """
+        start = time.perf_counter()
+        cached = self._read()
+        if cached is not None:
+            valid, touched = self._check(cached, files)
+            if valid:
+                if touched:
+                    self._write({path: file_stamp(path) for path in files}, cached["data"])
+                logger.info(f"Snapshot {self.name}: loaded in {(time.perf_counter() - start) * 1000:.1f} ms")
+                return cached["data"]
+
+        # Манифест снимаем до сборки: если файл изменится во время сборки,
+        # следующий старт это заметит
+        manifest = {}
+        for path in files:
+            try:
+                manifest[path] = file_stamp(path)
+            except OSError:
+                pass
+        data = build()
+        self._write(manifest, data)
+        logger.info(f"Snapshot {self.name}: rebuilt from {len(files)} files "
+                    f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+        return data
+
+
+class FileWatcher:
+    """
+    Отслеживает изменения набора файлов по размеру и mtime
+
+    pending() возвращает изменённые, новые и удалённые файлы; файл считается
+    обработанным только после mark_seen(), поэтому неудачная перезагрузка
+    (например, битый JSON) повторится при следующей проверке.
+    """
+
+    def __init__(self, list_files: Callable[[], List[str]]):
+        self.list_files = list_files
+        self._current: Dict[str, Tuple[int, int]] = self._scan()
+        self._seen: Dict[str, Tuple[int, int]] = dict(self._current)
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        stats = {}
+        for path in self.list_files():
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            stats[path] = (st.st_size, st.st_mtime_ns)
+        return stats
+
+    def pending(self) -> List[str]:
+        self._current = current = self._scan()
+        seen = self._seen
+        return sorted(path for path in current.keys() | seen.keys()
+                      if current.get(path) != seen.get(path))
+
+    def mark_seen(self, paths: List[str]):
+        for path in paths:
+            if path in self._current:
+                self._seen[path] = self._current[path]
+            else:
+                self._seen.pop(path, None)
+
+
+class ContentWatcher:
+    """
+    Фоновый поток, периодически вызывающий reload_if_changed() загрузчиков
+
+    Перезагрузка идёт в отдельном потоке, а не в цикле событий бота;
+    загрузчики сами подменяют свои данные атомарно.
+    """
+
+    def __init__(self, interval: float = 5.0):
+        self.interval = interval
+        self._targets: List[Callable[[], bool]] = []
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def watch(self, reload_if_changed: Callable[[], bool]):
+        if reload_if_changed not in self._targets:
+            self._targets.append(reload_if_changed)
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            for reload_if_changed in self._targets:
+                try:
+                    reload_if_changed()
+                except Exception as e:
+                    logger.error(f"Content reload failed: {e}")
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="content-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+
+
+# Общий наблюдатель за book/
+content_watcher = ContentWatcher()
+
+
+if __name__ == "__main__":
+    # Время старта загрузчиков: сборка из JSON против чтения снимка
+    import json
+    import random
+    import shutil
+    import tempfile
+
+    workdir = None
+    if not os.path.isdir("book"):
+        # Папки book/ нет - синтетический корпус того же формата во временной папке
+        workdir = tempfile.mkdtemp()
+        rng = random.Random(42)
+        products = ["Курица", "Говядина", "Рис", "Гречка", "Яйцо", "Молоко", "Сыр", "Лосось",
+                    "Картофель", "Морковь", "Лук", "Помидоры", "Огурцы", "Творог", "Овсянка"]
+        for goal in ("lose_weight", "maintain", "gain_weight"):
+            os.makedirs(os.path.join(workdir, "book", goal))
+            for meal in ("breakfast", "lunch", "dinner"):
+                recipes = [{
+                    "Название блюда": f"Блюдо {i}",
+                    "Ингредиенты": [f"{p} — {rng.randint(50, 300)} г" for p in rng.sample(products, 6)],
+                    "Ккал": rng.randint(250, 800),
+                    "Конец. Б/Ж/У": f"{rng.randint(10, 50)}/{rng.randint(5, 30)}/{rng.randint(10, 90)}",
+                } for i in range(300)]
+                with open(os.path.join(workdir, "book", goal, f"{meal}.json"), 'w', encoding='utf-8') as f:
+                    json.dump(recipes, f, ensure_ascii=False)
+        for level in ("beginner", "intermediate", "advanced"):
+            for location in ("home", "gym", "both"):
+                path = os.path.join(workdir, "book", "workouts_by_level", level, location)
+                os.makedirs(path)
+                for key in ("lose_weight_strength", "gain_weight_strength", "maintain_weight_cardio", "all_full_body"):
+                    exercises = [{
+                        "Название упражнения": f"Упражнение {i}",
+                        "Описание": "Описание " * 20,
+                        "Техника выполнения": "Техника " * 30,
+                        "Мышечные группы": "грудь, трицепс",
+                    } for i in range(80)]
+                    with open(os.path.join(path, f"{key}.json"), 'w', encoding='utf-8') as f:
+                        json.dump(exercises, f, ensure_ascii=False)
+        os.chdir(workdir)
+
+    from recipes_loader import RecipesLoader
+    from workouts_loader_v4 import WorkoutsLoaderV4
+
+    for loader_cls in (RecipesLoader, WorkoutsLoaderV4):
+        snapshot_path = loader_cls.SNAPSHOT.path
+        if os.path.exists(snapshot_path):
+            os.remove(snapshot_path)
+
+        start = time.perf_counter()
+        loader_cls()
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        loader_cls()
+        warm = time.perf_counter() - start
+
+        print(f"{loader_cls.__name__}: без снимка {cold * 1000:.1f} мс, со снимком {warm * 1000:.1f} мс")
+
+    if workdir:
+        os.chdir("/")
+        shutil.rmtree(workdir)
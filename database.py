@@ -5,20 +5,35 @@ SQLite для хранения профилей, истории, предпоч
 
 import sqlite3
 import json
+import threading
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 
 
 class Database:
-    """Управление базой данных"""
+    """
+    Управление базой данных
+
+    Соединение SQLite нельзя использовать из другого потока, поэтому у
+    каждого потока своё (conn - соединение текущего потока): генерация
+    планов без пула процессов идёт в потоках run_in_executor.
+    """
 
     def __init__(self, db_path='fitness_bot.db'):
         self.db_path = db_path
-        self.conn = None
+        self._local = threading.local()
         self.init_database()
 
+    @property
+    def conn(self) -> Optional[sqlite3.Connection]:
+        return getattr(self._local, "conn", None)
+
+    @conn.setter
+    def conn(self, value: Optional[sqlite3.Connection]):
+        self._local.conn = value
+
     def connect(self):
-        """Подключение к БД"""
+        """Подключение к БД (своё для каждого потока)"""
         if not self.conn:
             self.conn = sqlite3.connect(self.db_path)
             self.conn.row_factory = sqlite3.Row
@@ -103,6 +118,36 @@ class Database:
             )
         ''')
 
+        # Таблица последних планов питания (структурированный план в JSON)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS meal_plans (
+                user_id INTEGER PRIMARY KEY,
+                plan_data TEXT NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users(user_id)
+            )
+        ''')
+
+        # Таблица последних тренировок (план тренировки в JSON)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS workout_plans (
+                user_id INTEGER PRIMARY KEY,
+                plan_data TEXT NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users(user_id)
+            )
+        ''')
+
+        # Таблица истории разнообразия (недавние продукты и упражнения, JSON)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS user_variety (
+                user_id INTEGER PRIMARY KEY,
+                history_data TEXT NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users(user_id)
+            )
+        ''')
+
         # Таблица достижений
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS achievements (
@@ -424,6 +469,95 @@ class Database:
 
         return [dict(row) for row in cursor.fetchall()]
 
+    # === ПЛАНЫ ПИТАНИЯ ===
+
+    def save_meal_plan(self, user_id: int, plan_data: str) -> bool:
+        """Сохранить последний план питания (заменяет предыдущий)"""
+        try:
+            conn = self.connect()
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                INSERT OR REPLACE INTO meal_plans (user_id, plan_data, updated_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+            ''', (user_id, plan_data))
+            conn.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"[ERROR] Database error in save_meal_plan({user_id}): {e}")
+            return False
+
+    def get_meal_plan(self, user_id: int) -> Optional[str]:
+        """Получить последний план питания"""
+        try:
+            conn = self.connect()
+            cursor = conn.cursor()
+
+            cursor.execute('SELECT plan_data FROM meal_plans WHERE user_id = ?', (user_id,))
+            row = cursor.fetchone()
+            return row['plan_data'] if row else None
+        except sqlite3.Error as e:
+            print(f"[ERROR] Database error in get_meal_plan({user_id}): {e}")
+            return None
+
+    def save_workout_plan(self, user_id: int, plan_data: str) -> bool:
+        """Сохранить последнюю тренировку (заменяет предыдущую)"""
+        try:
+            conn = self.connect()
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                INSERT OR REPLACE INTO workout_plans (user_id, plan_data, updated_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+            ''', (user_id, plan_data))
+            conn.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"[ERROR] Database error in save_workout_plan({user_id}): {e}")
+            return False
+
+    def get_workout_plan(self, user_id: int) -> Optional[str]:
+        """Получить последнюю тренировку"""
+        try:
+            conn = self.connect()
+            cursor = conn.cursor()
+
+            cursor.execute('SELECT plan_data FROM workout_plans WHERE user_id = ?', (user_id,))
+            row = cursor.fetchone()
+            return row['plan_data'] if row else None
+        except sqlite3.Error as e:
+            print(f"[ERROR] Database error in get_workout_plan({user_id}): {e}")
+            return None
+
+    def save_variety_history(self, user_id: int, history_data: str) -> bool:
+        """Сохранить историю разнообразия (заменяет предыдущую)"""
+        try:
+            conn = self.connect()
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                INSERT OR REPLACE INTO user_variety (user_id, history_data, updated_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+            ''', (user_id, history_data))
+            conn.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"[ERROR] Database error in save_variety_history({user_id}): {e}")
+            return False
+
+    def get_variety_history(self, user_id: int) -> Optional[str]:
+        """Получить историю разнообразия"""
+        try:
+            conn = self.connect()
+            cursor = conn.cursor()
+
+            cursor.execute('SELECT history_data FROM user_variety WHERE user_id = ?', (user_id,))
+            row = cursor.fetchone()
+            return row['history_data'] if row else None
+        except sqlite3.Error as e:
+            print(f"[ERROR] Database error in get_variety_history({user_id}): {e}")
+            return None
+
     # === ДОСТИЖЕНИЯ ===
 
     def add_achievement(self, user_id: int, achievement_type: str, achievement_name: str) -> bool:
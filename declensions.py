@@ -0,0 +1,406 @@
+"""
+СКЛОНЕНИЯ
+Винительный и творительный падежи названий продуктов: заранее собранная
+таблица, правки администратора и правила для незнакомых фраз
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from typing import Callable, Dict, Iterable, NamedTuple, Set
+
+from content_snapshot import SNAPSHOT_DIR
+from recipes_loader import recipes_loader
+
+logger = logging.getLogger(__name__)
+
+# Собранная таблица - артефакт сборки рядом со снимками контента (пересобирается,
+# если её нет, изменились правила или набор названий)
+DECLENSIONS_FILE = os.getenv("DECLENSIONS_FILE", os.path.join(SNAPSHOT_DIR, "declensions.json"))
+
+# Правки администратора: {"accusative": {"Фраза": "форма"}, "instrumental": {...}}
+DECLENSION_OVERRIDES_FILE = os.getenv("DECLENSION_OVERRIDES_FILE", "declension_overrides.json")
+
+# Меняется при любом изменении правил или исключений ниже - старая таблица пересобирается
+RULES_VERSION = 1
+
+ACCUSATIVE_EXCEPTIONS = {
+    "Греческий йогурт": "греческого йогурта",
+    "Цельнозерновой хлеб": "цельнозерновой хлеб",
+    "Рис белый (варёный)": "белый варёный рис",
+    "Рис бурый варёный": "бурый варёный рис",
+    "Куриная грудка": "куриную грудку",
+    "Филе индейки": "филе индейки",
+    "Треска": "треску",
+    "Морковь": "морковь",
+    "Овсянка": "овсянку",
+    "Творог обезжиренный": "обезжиренного творога",
+    "Банан": "банан",
+    "Яблоко": "яблоко",
+    "Огурцы": "огурцы",
+    "Брокколи": "брокколи",
+    "Болгарский перец": "болгарский перец",
+    "Гречка варёная": "варёную гречку",
+    "Яйца": "яйца",
+    "Лосось": "лосося",
+    "Тунец консервированный": "консервированного тунца",
+    "Креветки": "креветки",
+    "Тофу": "тофу",
+    "Протеиновый порошок": "протеинового порошка",
+    "Кускус": "кускус",
+    "Чечевица": "чечевицу",
+    "Нут": "нут",
+    "Фасоль": "фасоль",
+    "Киноа": "киноа",
+    "Цветная капуста": "цветную капусту",
+    "Баклажан": "баклажан",
+    "Стручковая фасоль": "стручковую фасоль",
+    "Тыква": "тыкву",
+    "Шпинат": "шпинат",
+    "Киви": "киви",
+    "Манго": "манго",
+    "Грейпфрут": "грейпфрут",
+    "Ананас": "ананас",
+    "Ягоды": "ягоды",
+    "Авокадо": "авокадо",
+    "Миндаль": "миндаль",
+    "Грецкие орехи": "грецкие орехи",
+    "Семена чиа": "семена чиа",
+    "Льняное семя": "льняное семя",
+    "Кешью": "кешью",
+    "Фундук": "фундук",
+    "Арахисовая паста": "арахисовой пасты",
+    "Оливковое масло": "оливкового масла"
+}
+
+INSTRUMENTAL_EXCEPTIONS = {
+    "Греческий йогурт": "греческим йогуртом",
+    "Цельнозерновой хлеб": "цельнозерновым хлебом",
+    "Рис белый (варёный)": "белым варёным рисом",
+    "Рис бурый варёный": "бурым варёным рисом",
+    "Куриная грудка": "куриной грудкой",
+    "Филе индейки": "филе индейки",
+    "Треска": "треской",
+    "Морковь": "морковью",
+    "Овсянка": "овсянкой",
+    "Творог обезжиренный": "обезжиренным творогом",
+    "Банан": "бананом",
+    "Яблоко": "яблоком",
+    "Огурцы": "огурцами",
+    "Брокколи": "брокколи",
+    "Болгарский перец": "болгарским перцем",
+    "Гречка варёная": "варёной гречкой",
+    "Яйца": "яйцами",
+    "Лосось": "лососем",
+    "Тунец консервированный": "консервированным тунцом",
+    "Креветки": "креветками",
+    "Тофу": "тофу",
+    "Протеиновый порошок": "протеиновым порошком",
+    "Кускус": "кускусом",
+    "Чечевица": "чечевицей",
+    "Нут": "нутом",
+    "Фасоль": "фасолью",
+    "Киноа": "киноа",
+    "Цветная капуста": "цветной капустой",
+    "Баклажан": "баклажаном",
+    "Стручковая фасоль": "стручковой фасолью",
+    "Тыква": "тыквой",
+    "Шпинат": "шпинатом",
+    "Киви": "киви",
+    "Манго": "манго",
+    "Грейпфрут": "грейпфрутом",
+    "Ананас": "ананасом",
+    "Ягоды": "ягодами",
+    "Авокадо": "авокадо",
+    "Миндаль": "миндалём",
+    "Грецкие орехи": "грецкими орехами",
+    "Семена чиа": "семенами чиа",
+    "Льняное семя": "льняным семенем",
+    "Кешью": "кешью",
+    "Фундук": "фундуком",
+    "Арахисовая паста": "арахисовой пастой",
+    "Оливковое масло": "оливковым маслом"
+}
+
+
+def accusative_by_rules(phrase: str) -> str:
+    """Винительный падеж (для 'что' в шагах приготовления) по исключениям и окончаниям"""
+    if phrase in ACCUSATIVE_EXCEPTIONS:
+        return ACCUSATIVE_EXCEPTIONS[phrase]
+
+    words = phrase.split()
+
+    if len(words) >= 2:
+        adj = words[0]
+        noun = ' '.join(words[1:])
+
+        # Склоняем прилагательное
+        if adj.endswith('ый'):
+            adj = adj[:-2] + 'ый'  # не меняется для муж. рода неодуш.
+        elif adj.endswith('ой'):
+            adj = adj[:-2] + 'ой'
+        elif adj.endswith('ий'):
+            adj = adj[:-2] + 'ий'
+        elif adj.endswith('ая'):
+            adj = adj[:-2] + 'ую'
+        elif adj.endswith('яя'):
+            adj = adj[:-2] + 'юю'
+
+        # Склоняем существительное
+        if noun.endswith('а'):
+            noun = noun[:-1] + 'у'
+        elif noun.endswith('я'):
+            noun = noun[:-1] + 'ю'
+        elif noun.endswith('ка'):
+            noun = noun[:-1] + 'у'
+        # Остальные не меняются
+
+        return f"{adj.lower()} {noun}"
+    else:
+        word = phrase
+
+        # Одно слово
+        if word.endswith('а'):
+            return word[:-1] + 'у'
+        elif word.endswith('я'):
+            return word[:-1] + 'ю'
+        elif word.endswith('ка'):
+            return word[:-1] + 'у'
+        else:
+            return word.lower()
+
+
+def instrumental_by_rules(phrase: str) -> str:
+    """Творительный падеж (для 'с чем') по исключениям и окончаниям"""
+    if phrase in INSTRUMENTAL_EXCEPTIONS:
+        return INSTRUMENTAL_EXCEPTIONS[phrase]
+
+    words = phrase.split()
+
+    if len(words) >= 2:
+        # Склоняем прилагательное и существительное
+        adj = words[0]
+        noun = ' '.join(words[1:])
+
+        # Склоняем прилагательное
+        if adj.endswith('ый'):
+            adj = adj[:-2] + 'ым'
+        elif adj.endswith('ой'):
+            adj = adj[:-2] + 'ым'
+        elif adj.endswith('ий'):
+            adj = adj[:-2] + 'им'
+        elif adj.endswith('ая'):
+            adj = adj[:-2] + 'ой'
+        elif adj.endswith('яя'):
+            adj = adj[:-2] + 'ей'
+
+        # Склоняем существительное
+        if noun.endswith('а'):
+            noun = noun[:-1] + 'ой'
+        elif noun.endswith('я'):
+            noun = noun[:-1] + 'ей'
+        elif noun.endswith('ь'):
+            noun = noun[:-1] + 'ью'
+        elif noun.endswith('ка'):
+            noun = noun[:-1] + 'ой'
+        else:
+            # Мужской род на согласную
+            noun = noun + 'ом'
+
+        return f"{adj.lower()} {noun}"
+    else:
+        # Одно слово
+        word = phrase
+
+        if word.endswith('а'):
+            return word[:-1] + 'ой'
+        elif word.endswith('я'):
+            return word[:-1] + 'ей'
+        elif word.endswith('ь'):
+            return word[:-1] + 'ью'
+        elif word.endswith('ка'):
+            return word[:-1] + 'ой'
+        else:
+            return word + 'ом'
+
+
+# Падеж -> правила
+CASES: Dict[str, Callable[[str], str]] = {
+    "accusative": accusative_by_rules,
+    "instrumental": instrumental_by_rules,
+}
+
+
+def collect_phrases() -> Set[str]:
+    """Названия продуктов базы знаний и ингредиентов корпуса рецептов"""
+    from knowledge_base import NutritionDatabase
+
+    phrases = {product.get('name_ru', '') for product in NutritionDatabase.get_all_products()}
+    for meals in recipes_loader.current_content().records.values():
+        for records in meals.values():
+            for record in records:
+                phrases.update(record.ingredient_names)
+    phrases.discard('')
+    return phrases
+
+
+def phrases_digest(phrases: Iterable[str]) -> str:
+    """Отпечаток набора названий: таблица собрана для другого корпуса - пересборка"""
+    return hashlib.sha1("\n".join(sorted(set(phrases))).encode("utf-8")).hexdigest()
+
+
+def build_declension_table(phrases: Iterable[str], path: str = DECLENSIONS_FILE) -> Dict[str, Dict[str, str]]:
+    """Склоняет все фразы по правилам и сохраняет таблицу (шаг сборки)"""
+    phrases = sorted(set(phrases))
+    tables = {case: {phrase: rules(phrase) for phrase in phrases} for case, rules in CASES.items()}
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"rules_version": RULES_VERSION, "phrases": phrases_digest(phrases), "tables": tables},
+                  f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    logger.info(f"Declension table built: {len(phrases)} phrases -> {path}")
+    return tables
+
+
+class _Tables(NamedTuple):
+    """Неизменяемый снимок таблиц (заменяется целиком при перезагрузке правок)"""
+    forms: Dict[str, Dict[str, str]]   # падеж -> фраза -> форма (собранное + правки)
+    overrides_mtime: float
+
+
+class DeclensionTable:
+    """
+    Склонение названий продуктов одним поиском в словаре
+
+    Таблица собирается заранее (build_declension_table) для всех названий
+    базы знаний и корпуса рецептов; если файла нет или он собран старыми
+    правилами или для другого набора названий, он пересобирается при
+    первом обращении - и после перезагрузки рецептов. Поверх таблицы
+    накладываются правки администратора из DECLENSION_OVERRIDES_FILE -
+    они перечитываются без перезапуска (reload_if_changed). Правила
+    вызываются только для фраз, которых нет в таблице.
+    """
+
+    def __init__(self, path: str = DECLENSIONS_FILE, overrides_path: str = DECLENSION_OVERRIDES_FILE):
+        self.path = path
+        self.overrides_path = overrides_path
+        self._lock = threading.Lock()
+        self._compiled: Dict[str, Dict[str, str]] = None
+        self._tables: _Tables = None
+
+    def _get_overrides_mtime(self) -> float:
+        try:
+            return os.stat(self.overrides_path).st_mtime
+        except OSError:
+            return 0.0
+
+    def _load_compiled(self) -> Dict[str, Dict[str, str]]:
+        phrases = collect_phrases()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("rules_version") == RULES_VERSION and data.get("phrases") == phrases_digest(phrases):
+                return data["tables"]
+        except (OSError, ValueError, KeyError):
+            pass
+        try:
+            return build_declension_table(phrases, self.path)
+        except OSError as e:
+            logger.warning(f"Cannot write declension table {self.path}: {e}")
+            return {case: {} for case in CASES}
+
+    def _read_overrides(self) -> Dict[str, Dict[str, str]]:
+        if not os.path.exists(self.overrides_path):
+            return {}
+        try:
+            with open(self.overrides_path, 'r', encoding='utf-8') as f:
+                overrides = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Declension overrides are unreadable, ignored: {e}")
+            return {}
+        if not isinstance(overrides, dict):
+            logger.error("Declension overrides must be an object {case: {phrase: form}}, ignored")
+            return {}
+        return overrides
+
+    def _build(self) -> _Tables:
+        mtime = self._get_overrides_mtime()
+        overrides = self._read_overrides()
+        forms = {case: {**self._compiled.get(case, {}), **overrides.get(case, {})} for case in CASES}
+        return _Tables(forms, mtime)
+
+    def _current(self) -> _Tables:
+        tables = self._tables
+        if tables is None:
+            with self._lock:
+                if self._tables is None:
+                    self._compiled = self._load_compiled()
+                    self._tables = self._build()
+                tables = self._tables
+        return tables
+
+    def invalidate(self):
+        """Корпус рецептов перезагружен: при следующем обращении таблица проверяется заново"""
+        with self._lock:
+            self._compiled = None
+            self._tables = None
+
+    def reload_if_changed(self) -> bool:
+        """Перечитывает правки администратора, если файл изменился"""
+        if self._tables is None or self._get_overrides_mtime() == self._tables.overrides_mtime:
+            return False
+        with self._lock:
+            self._tables = self._build()
+        logger.info("Declension overrides reloaded")
+        return True
+
+    def set_override(self, case: str, phrase: str, form: str):
+        """Правка администратора: сохраняется в файл и сразу применяется"""
+        if case not in CASES:
+            raise ValueError(f"Unknown case: {case}")
+        with self._lock:
+            overrides = self._read_overrides()
+            overrides.setdefault(case, {})[phrase] = form
+            tmp_path = f"{self.overrides_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(overrides, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.overrides_path)
+            if self._compiled is not None:
+                self._tables = self._build()
+
+    def decline(self, case: str, phrase: str) -> str:
+        form = self._current().forms[case].get(phrase)
+        return form if form is not None else CASES[case](phrase)
+
+    def accusative(self, phrase: str) -> str:
+        return self.decline("accusative", phrase)
+
+    def instrumental(self, phrase: str) -> str:
+        return self.decline("instrumental", phrase)
+
+
+# Глобальная таблица
+declension_table = DeclensionTable()
+recipes_loader.add_reload_listener(declension_table.invalidate)
+
+
+if __name__ == "__main__":
+    # Шаг сборки таблицы и время склонения: таблица против правил
+    import time
+
+    phrases = collect_phrases()
+    build_declension_table(phrases)
+    sample = sorted(phrases) * 50
+    print(f"Фраз: {len(phrases)}, файл: {DECLENSIONS_FILE}")
+
+    for name, decline in (("правила", accusative_by_rules), ("таблица", declension_table.accusative)):
+        decline(sample[0])
+        start = time.perf_counter()
+        for phrase in sample:
+            decline(phrase)
+        print(f"{name}: {(time.perf_counter() - start) * 1e9 / len(sample):6.0f} нс/фраза")
@@ -3,8 +3,10 @@
 Исключает рецепты с запрещенными продуктами
 """
 
+import random
 from recipes_loader import recipes_loader
-from typing import List, Dict, Set
+from text_matcher import get_matcher
+from typing import List, Dict, Set, Tuple
 
 
 class FoodFilter:
@@ -58,8 +60,94 @@ class FoodFilter:
         'nuts': NUT_PRODUCTS,
     }
 
+    # Битовые флаги категорий (рецепт помечается один раз при загрузке)
+    LACTOSE = 1 << 0
+    GLUTEN = 1 << 1
+    MEAT = 1 << 2
+    FISH = 1 << 3
+    EGGS = 1 << 4
+    NUTS = 1 << 5
+
+    CATEGORY_PRODUCTS = {
+        LACTOSE: LACTOSE_PRODUCTS,
+        GLUTEN: GLUTEN_PRODUCTS,
+        MEAT: MEAT_PRODUCTS,
+        FISH: FISH_PRODUCTS,
+        EGGS: EGG_PRODUCTS,
+        NUTS: NUT_PRODUCTS,
+    }
+
+    CATEGORY_BITS = {
+        'лактоза': LACTOSE,
+        'lactose': LACTOSE,
+        'глютен': GLUTEN,
+        'gluten': GLUTEN,
+        'мясо': MEAT,
+        'meat': MEAT,
+        'рыба': FISH,
+        'fish': FISH,
+        'яйца': EGGS,
+        'eggs': EGGS,
+        'орехи': NUTS,
+        'nuts': NUTS,
+    }
+
+    DIET_MASKS = {
+        'vegetarian': MEAT | FISH,
+        'вегетарианство': MEAT | FISH,
+        'vegan': MEAT | FISH | EGGS | LACTOSE,
+        'веганство': MEAT | FISH | EGGS | LACTOSE,
+        'pescatarian': MEAT,
+        'пескетарианство': MEAT,
+    }
+
     def __init__(self):
         self.recipes_loader = recipes_loader
+        self._category_matchers = {
+            bit: get_matcher(products)
+            for bit, products in self.CATEGORY_PRODUCTS.items()
+        }
+        # (содержимое загрузчика, маски) - заменяется целиком
+        self._mask_state = (None, {})
+        self.get_masks(recipes_loader.current_content())
+        recipes_loader.add_reload_listener(
+            lambda: self.get_masks(recipes_loader.current_content())
+        )
+
+    def _recipe_mask(self, search_text: str) -> int:
+        mask = 0
+        for bit, matcher in self._category_matchers.items():
+            if matcher.search(search_text):
+                mask |= bit
+        return mask
+
+    def get_masks(self, content) -> Dict[Tuple[str, str], Tuple[int, ...]]:
+        """Маски категорий для всех рецептов, согласованные с содержимым загрузчика"""
+        cached_content, masks = self._mask_state
+        if cached_content is not content:
+            masks = {
+                (goal, meal_type): tuple(self._recipe_mask(r.search_text) for r in records)
+                for goal, meals in content.records.items()
+                for meal_type, records in meals.items()
+            }
+            self._mask_state = (content, masks)
+        return masks
+
+    def forbidden_mask(self, allergies: List[str] = None, diet_type: str = None) -> int:
+        """Битовая маска запрещённых категорий по аллергиям и типу диеты"""
+        mask = 0
+        if allergies:
+            for allergy in allergies:
+                mask |= self.CATEGORY_BITS.get(allergy.lower(), 0)
+        if diet_type:
+            mask |= self.DIET_MASKS.get(diet_type, 0)
+        return mask
+
+    def forbidden_matcher(self, allergies: List[str] = None, diet_type: str = None):
+        """Матчер продуктов запрещённых категорий (для продуктов вне рецептов, по названию)"""
+        forbidden = self.forbidden_mask(allergies, diet_type)
+        return get_matcher(word for bit, products in self.CATEGORY_PRODUCTS.items()
+                           if forbidden & bit for word in products)
 
     def filter_recipes(self, goal: str, meal_type: str,
                       allergies: List[str] = None,
@@ -81,52 +169,42 @@ class FoodFilter:
             Список отфильтрованных рецептов
         """
 
-        # Получаем все рецепты
-        all_recipes = self.recipes_loader.recipes.get(meal_type, [])
-
-        if not all_recipes:
-            return []
-
-        # Собираем все запрещенные продукты
-        forbidden = set()
+        content = self.recipes_loader.current_content()
+        key = self.recipes_loader._resolve_keys(goal, meal_type)
+        records = content.records.get(key[0], {}).get(key[1], ())
+        allowed = self.allowed_ids(goal, meal_type, allergies, excluded_foods, diet_type, content)
 
-        # Добавляем из аллергий
-        if allergies:
-            for allergy in allergies:
-                allergy_lower = allergy.lower()
-                if allergy_lower in self.CATEGORY_MAP:
-                    forbidden.update(self.CATEGORY_MAP[allergy_lower])
+        # Возвращаем случайные из отфильтрованных
+        if allowed:
+            return [records[i].to_dict() for i in random.sample(allowed, min(count, len(allowed)))]
 
-        # Добавляем исключенные продукты
-        if excluded_foods:
-            forbidden.update([food.lower() for food in excluded_foods])
+        return []
 
-        # Добавляем по типу диеты
-        if diet_type:
-            if diet_type in ['vegetarian', 'вегетарианство']:
-                forbidden.update(self.MEAT_PRODUCTS)
-                forbidden.update(self.FISH_PRODUCTS)
-            elif diet_type in ['vegan', 'веганство']:
-                forbidden.update(self.MEAT_PRODUCTS)
-                forbidden.update(self.FISH_PRODUCTS)
-                forbidden.update(self.EGG_PRODUCTS)
-                forbidden.update(self.LACTOSE_PRODUCTS)
-            elif diet_type in ['pescatarian', 'пескетарианство']:
-                forbidden.update(self.MEAT_PRODUCTS)
-
-        # Фильтруем рецепты
-        filtered = []
-
-        for recipe in all_recipes:
-            if self._is_recipe_allowed(recipe, forbidden):
-                filtered.append(recipe)
+    def allowed_ids(self, goal: str, meal_type: str,
+                    allergies: List[str] = None,
+                    excluded_foods: List[str] = None,
+                    diet_type: str = None,
+                    content=None) -> List[int]:
+        """Номера подходящих рецептов раздела (в порядке загрузчика)"""
+        # Рецепты цели и приёма пищи (структура загрузчика: цель -> приём -> рецепты)
+        content = content or self.recipes_loader.current_content()
+        key = self.recipes_loader._resolve_keys(goal, meal_type)
+        records = content.records.get(key[0], {}).get(key[1], ())
+
+        if not records:
+            return []
 
-        # Возвращаем случайные из отфильтрованных
-        if filtered:
-            import random
-            return random.sample(filtered, min(count, len(filtered)))
+        # Аллергии и диета - одно побитовое И с заранее посчитанной маской рецепта
+        forbidden = self.forbidden_mask(allergies, diet_type)
+        masks = self.get_masks(content).get(key, ())
+        allowed = [i for i, mask in enumerate(masks) if not mask & forbidden]
 
-        return []
+        # Произвольные исключённые продукты - одним скомпилированным матчером
+        if excluded_foods:
+            matcher = get_matcher(excluded_foods)
+            if matcher:
+                allowed = [i for i in allowed if not matcher.search(records[i].search_text)]
+        return allowed
 
     def _is_recipe_allowed(self, recipe: Dict, forbidden: Set[str]) -> bool:
         """Проверить, можно ли использовать рецепт"""
@@ -134,18 +212,8 @@ class FoodFilter:
         if not forbidden:
             return True
 
-        # Проверяем ингредиенты
-        ingredients = recipe.get('Ингредиенты', [])
-
-        for ingredient in ingredients:
-            ingredient_lower = ingredient.lower()
-
-            # Проверяем каждый запрещенный продукт
-            for forbidden_food in forbidden:
-                if forbidden_food in ingredient_lower:
-                    return False
-
-        return True
+        text = "\n".join(recipe.get('Ингредиенты', [])).lower()
+        return not get_matcher(forbidden).search(text)
 
     def get_filtered_recipe(self, goal: str, meal_type: str,
                            allergies: List[str] = None,
@@ -202,16 +270,14 @@ class FoodFilter:
             forbidden.update([food.lower() for food in excluded_foods])
 
         ingredients = recipe.get('Ингредиенты', [])
+        matcher = get_matcher(forbidden)
 
         for ingredient in ingredients:
-            ingredient_lower = ingredient.lower()
-
-            for forbidden_food in forbidden:
-                if forbidden_food in ingredient_lower:
-                    result['compatible'] = False
-                    result['issues'].append(
-                        f"Содержит '{forbidden_food}' в ингредиенте: {ingredient}"
-                    )
+            for forbidden_food in matcher.find_all(ingredient.lower()):
+                result['compatible'] = False
+                result['issues'].append(
+                    f"Содержит '{forbidden_food}' в ингредиенте: {ingredient}"
+                )
 
         return result
 
@@ -283,3 +349,58 @@ if __name__ == "__main__":
         print(f"Проблемы: {compat['issues']}")
 
     print("\n[OK] Фильтр работает!")
+
+    # Бенчмарк: прежний перебор подстрок против масок и скомпилированного выражения
+    import time
+    from bench_corpus import load_synthetic_corpus
+
+    if not any(r for meals in recipes_loader.recipes.values() for r in meals.values()):
+        load_synthetic_corpus(recipes_loader)
+
+    def is_allowed_scan(recipe, forbidden):
+        for ingredient in recipe.get('Ингредиенты', []):
+            ingredient_lower = ingredient.lower()
+            for forbidden_food in forbidden:
+                if forbidden_food in ingredient_lower:
+                    return False
+        return True
+
+    def old_filter(goal, meal_type, allergies, excluded_foods, diet_type):
+        eng_goal, eng_type = recipes_loader._resolve_keys(goal, meal_type)
+        forbidden = set()
+        for allergy in allergies or []:
+            forbidden.update(FoodFilter.CATEGORY_MAP.get(allergy.lower(), []))
+        forbidden.update(food.lower() for food in excluded_foods or [])
+        if diet_type in ('vegan', 'веганство'):
+            forbidden.update(FoodFilter.MEAT_PRODUCTS + FoodFilter.FISH_PRODUCTS +
+                             FoodFilter.EGG_PRODUCTS + FoodFilter.LACTOSE_PRODUCTS)
+        return [i for i, r in enumerate(recipes_loader.recipes[eng_goal][eng_type]) if is_allowed_scan(r, forbidden)]
+
+    def new_filter(goal, meal_type, allergies, excluded_foods, diet_type):
+        return food_filter.allowed_ids(goal, meal_type, allergies, excluded_foods, diet_type)
+
+    cases = [
+        (['лактоза'], None, None),
+        (['глютен', 'орехи'], ['свинина', 'грибы'], None),
+        (None, None, 'vegan'),
+        (['яйца'], ['лук', 'фасоль'], None),
+    ]
+    n = 20
+    total = sum(len(r) for meals in recipes_loader.recipes.values() for r in meals.values())
+    print(f"\nБенчмарк на {total} рецептах")
+    # Сравниваются одни и те же результаты - номера допустимых рецептов раздела
+    for goal in ('lose_weight', 'gain_weight', 'maintain'):
+        for meal in ('breakfast', 'lunch', 'dinner'):
+            for allergies, excluded, diet in cases:
+                assert old_filter(goal, meal, allergies, excluded, diet) == \
+                    new_filter(goal, meal, allergies, excluded, diet), (goal, meal, allergies, excluded, diet)
+    print("Результаты совпадают")
+    for name, fn in (("Перебор", old_filter), ("Маски", new_filter)):
+        start = time.perf_counter()
+        for _ in range(n):
+            for goal in ('lose_weight', 'gain_weight', 'maintain'):
+                for meal in ('breakfast', 'lunch', 'dinner'):
+                    for allergies, excluded, diet in cases:
+                        fn(goal, meal, allergies, excluded, diet)
+        elapsed = time.perf_counter() - start
+        print(f"{name}: {elapsed * 1e3 / (n * 9 * len(cases)):.3f} мс/запрос")
@@ -0,0 +1,200 @@
+"""
+ПУЛ ГЕНЕРАЦИИ
+Построение планов в отдельных процессах: цикл событий бота не блокируется,
+несколько планов строятся параллельно на разных ядрах
+"""
+
+import os
+import asyncio
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Число процессов (0 - генерация в потоке бота, без пула) и время ожидания одного плана
+GENERATION_WORKERS = int(os.getenv("GENERATION_WORKERS", str(os.cpu_count() or 1)))
+GENERATION_TIMEOUT = float(os.getenv("GENERATION_TIMEOUT", "60"))
+
+
+def _preload():
+    """Загружает базу знаний, рецепты и упражнения вместе с матрицами подбора"""
+    from knowledge_base import NutritionDatabase, ExerciseDatabase
+    from recipes_loader import recipes_loader
+    from menu_optimizer import day_menu_optimizer
+    from workouts_loader_v4 import workouts_loader_v4
+
+    NutritionDatabase.get_all_products()
+    ExerciseDatabase.get_all_exercises()
+    day_menu_optimizer._matrices(recipes_loader.current_content())
+    workouts_loader_v4.reload_if_changed()  # дерево упражнений - актуальное на момент fork
+
+
+def _init_worker():
+    """Подготовка процесса пула: своё соединение с БД, данные и их горячая перезагрузка"""
+    from database import db
+    from recipes_loader import recipes_loader
+    from workouts_loader_v4 import workouts_loader_v4
+    from content_snapshot import content_watcher
+    from declensions import declension_table
+
+    db.conn = None  # соединение SQLite родителя нельзя использовать после fork
+    _preload()
+    content_watcher.watch(recipes_loader.reload_if_changed)
+    content_watcher.watch(workouts_loader_v4.reload_if_changed)
+    content_watcher.watch(declension_table.reload_if_changed)
+    content_watcher.start()
+
+
+class GenerationPool:
+    """
+    Тёплый пул процессов для генерации планов
+
+    Процессы создаются один раз (start) и сразу загружают данные; на
+    Linux они порождаются через fork после загрузки в родителе, так что
+    страницы с базой знаний и рецептами общие. Обработчики отправляют
+    задачу через run и ждут результат, не блокируя цикл событий.
+    Перезагрузку book/ каждый процесс отслеживает сам.
+
+    Задачи не должны читать или писать состояние родителя (JSON-база
+    бота): в процессе пула это копия на момент fork. Всё нужное
+    передаётся аргументами, результат сохраняет обработчик.
+    """
+
+    def __init__(self, workers: int = GENERATION_WORKERS, timeout: float = GENERATION_TIMEOUT):
+        self.workers = workers
+        self.timeout = timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> Optional[ProcessPoolExecutor]:
+        """
+        Запускает процессы и ждёт их готовности (повторный вызов ничего не делает)
+
+        Вызывать до запуска фоновых потоков бота - fork процесса с потоками
+        небезопасен. Без процессов (workers=0) возвращает None.
+        """
+        if self._executor is not None or self.workers <= 0:
+            return self._executor
+        with self._lock:
+            if self._executor is None:
+                _preload()
+                executor = ProcessPoolExecutor(self.workers, mp_context=self._context(),
+                                               initializer=_init_worker)
+                # Прогрев: процессы создаются сейчас, а не на первых запросах пользователей
+                for future in [executor.submit(os.getpid) for _ in range(self.workers)]:
+                    future.result()
+                self._executor = executor
+                logger.info(f"Generation pool started: {self.workers} workers")
+        return self._executor
+
+    @staticmethod
+    def _context():
+        """
+        fork - только пока в процессе один поток (первый start до запуска
+        бота); замену умершего пула, когда потоки уже работают, порождаем
+        через spawn - процессы заново импортируют модули и загружают данные
+        """
+        methods = multiprocessing.get_all_start_methods()
+        if "fork" in methods and threading.active_count() == 1:
+            return multiprocessing.get_context("fork")
+        return multiprocessing.get_context("spawn")
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _restart(self, broken: ProcessPoolExecutor):
+        """Сбрасывает пул, в котором умер процесс; новый (spawn) запускается при следующем run"""
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, func: Callable[..., Any], *args, timeout: float = None, **kwargs) -> Any:
+        """
+        Выполняет func(*args, **kwargs) в процессе пула и возвращает результат
+
+        func и аргументы передаются через pickle: функции и методы классов
+        уровня модуля, обычные словари и строки. По истечении timeout -
+        asyncio.TimeoutError; уже начатая задача дорабатывает в процессе,
+        но её результат отбрасывается.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self.start()
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(executor, partial(func, *args, **kwargs)),
+                timeout or self.timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Generation {getattr(func, '__qualname__', func)} timed out "
+                           f"after {timeout or self.timeout:.0f}s")
+            raise
+        except BrokenProcessPool:
+            logger.error("Generation worker died, restarting pool")
+            self._restart(executor)
+            raise
+
+
+# Глобальный пул
+generation_pool = GenerationPool()
+
+
+if __name__ == "__main__":
+    # Нагрузочный тест: планов в секунду и задержка цикла событий при разном числе процессов
+    import random
+    import time
+    from intelligent_generator import IntelligentMealPlanner
+
+    planner = IntelligentMealPlanner()
+    profile = {'age': 30, 'weight': 80, 'height': 180, 'gender': 'male',
+               'goal': 'lose_weight', 'activity_level': 'moderate'}
+
+    def build_plans(seed: int) -> int:
+        """Задача теста: пять планов питания (в процессе пула - через fork)"""
+        rng = random.Random(seed)
+        for _ in range(5):
+            plan = planner.build_meal_plan(profile, {}, rng=rng)
+        return len(plan.text)
+
+    async def load_test(pool: Optional[GenerationPool], jobs: int):
+        lags = []
+
+        async def ticker():
+            # Насколько опаздывает цикл событий (обработка других пользователей)
+            while True:
+                start = time.perf_counter()
+                await asyncio.sleep(0.01)
+                lags.append(time.perf_counter() - start - 0.01)
+
+        ticking = asyncio.create_task(ticker())
+        await asyncio.sleep(0.05)
+        start = time.perf_counter()
+        if pool is None:
+            for seed in range(jobs):
+                build_plans(seed)  # как раньше: прямо в обработчике
+                await asyncio.sleep(0)
+        else:
+            await asyncio.gather(*(pool.run(build_plans, seed) for seed in range(jobs)))
+        elapsed = time.perf_counter() - start
+        ticking.cancel()
+        return jobs / elapsed, max(lags) * 1e3
+
+    jobs = 48
+    cores = os.cpu_count() or 1
+    rate, lag = asyncio.run(load_test(None, jobs))
+    print(f"ядер: {cores}, задач: {jobs}")
+    print(f"в цикле событий: {rate:6.1f} задач/с, задержка цикла до {lag:7.1f} мс")
+    for workers in sorted({1, 2, 4, cores}):
+        pool = GenerationPool(workers)
+        pool.start()
+        rate, lag = asyncio.run(load_test(pool, jobs))
+        pool.shutdown()
+        print(f"пул {workers:2d} проц.:   {rate:6.1f} задач/с, задержка цикла до {lag:7.1f} мс")
@@ -3,9 +3,22 @@
 Работает БЕЗ нейросетей - только логика и базы данных
 """
 
-from typing import Dict, List, Optional
+from functools import partial
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
 from knowledge_base import NutritionDatabase, RecipeDatabase, ExerciseDatabase
+from recipe_query import recipe_query_engine
+from food_filter import food_filter
+from menu_optimizer import day_menu_optimizer, target_vector, MEALS
+from portion_solver import solve_portions
+from recipe_neighbours import recipe_neighbour_index
+from recipes_loader import recipes_loader
+from meal_plan import MealPlan, meal_plan_store
+from plan_cache import plan_cache, plan_key
+from plan_random import plan_rng, MEAL_PLAN, MEAL_REPLACE, WEEK_PLAN, WORKOUT_PLAN
+from variety_store import VarietyHistory, variety_store
+from declensions import declension_table
 import random
+import numpy as np
 
 
 def translate_with_ai(text: str, target_language: str, max_retries: int = 2) -> str:
@@ -74,231 +87,79 @@ def translate_with_ai(text: str, target_language: str, max_retries: int = 2) ->
         return text
 
 
+# Разделитель секций при переводе плана одним запросом (см. _render_sections)
+SECTION_SEPARATOR = "\n\n⸻⸻⸻\n\n"
+
+# Ширина корзины калорий при пакетной генерации: приёмы пищи с близкой целью делят кандидатов
+CALORIE_BUCKET = 50
+
+
+class MealPlanRequest(NamedTuple):
+    """Заявка на план питания для пакетной генерации (build_meal_plans)"""
+    user_id: Optional[int]
+    profile: dict
+    preferences: dict
+    language: str = "ru"
+    history: Optional[VarietyHistory] = None
+    rng: Optional[random.Random] = None
+
+
+def _as_key(value) -> Tuple[str, ...]:
+    """Список или строка из предпочтений - ключом словаря"""
+    if isinstance(value, str):
+        return (value,) if value else ()
+    return tuple(sorted(value or ()))
+
+
+class _MealBatch:
+    """
+    Общие кандидаты пачки планов питания
+
+    Продукты - по (аллергии, исключения), рецепты - по (цель, приём пищи,
+    корзина калорий, исключения, продукты пользователя): поиск по
+    индексам выполняется один раз на группу. Блюда из рецептов тоже
+    собираются один раз (в план идёт копия верхнего уровня).
+    """
+
+    def __init__(self, calorie_step: int = CALORIE_BUCKET):
+        self.calorie_step = calorie_step
+        self.products: Dict[tuple, list] = {}
+        self.matches: Dict[tuple, list] = {}
+        self.meals: Dict[tuple, dict] = {}
+
+
 class IntelligentMealPlanner:
     """
     Интеллектуальная система планирования питания
     НЕ использует нейросети - только логику и базы данных
+
+    История разнообразия (недавние продукты) у каждого пользователя своя
+    (VarietyHistory) и передаётся в генерацию явно - один планировщик
+    безопасно обслуживает всех пользователей, в том числе параллельно.
     """
 
     def __init__(self):
         self.nutrition_db = NutritionDatabase()
         self.recipe_db = RecipeDatabase()
         self.language_templates = self._load_templates()
-        self.used_products_history = []
-        self.used_combinations = []
-        self.generation_count = 0
         self.quality_score = 100
         self._cache = {}  # Кэш для ускорения генерации
+        self.plan_cache = plan_cache  # Готовые планы по профилю (None - всегда генерировать)
 
     def _to_accusative_case(self, phrase: str) -> str:
         """
         Склоняет фразу в винительный падеж (для 'что' в шагах приготовления)
         """
-
-        exceptions = {
-            "Греческий йогурт": "греческого йогурта",
-            "Цельнозерновой хлеб": "цельнозерновой хлеб",
-            "Рис белый (варёный)": "белый варёный рис",
-            "Рис бурый варёный": "бурый варёный рис",
-            "Куриная грудка": "куриную грудку",
-            "Филе индейки": "филе индейки",
-            "Треска": "треску",
-            "Морковь": "морковь",
-            "Овсянка": "овсянку",
-            "Творог обезжиренный": "обезжиренного творога",
-            "Банан": "банан",
-            "Яблоко": "яблоко",
-            "Огурцы": "огурцы",
-            "Брокколи": "брокколи",
-            "Болгарский перец": "болгарский перец",
-            "Гречка варёная": "варёную гречку",
-            "Яйца": "яйца",
-            "Лосось": "лосося",
-            "Тунец консервированный": "консервированного тунца",
-            "Креветки": "креветки",
-            "Тофу": "тофу",
-            "Протеиновый порошок": "протеинового порошка",
-            "Кускус": "кускус",
-            "Чечевица": "чечевицу",
-            "Нут": "нут",
-            "Фасоль": "фасоль",
-            "Киноа": "киноа",
-            "Цветная капуста": "цветную капусту",
-            "Баклажан": "баклажан",
-            "Стручковая фасоль": "стручковую фасоль",
-            "Тыква": "тыкву",
-            "Шпинат": "шпинат",
-            "Киви": "киви",
-            "Манго": "манго",
-            "Грейпфрут": "грейпфрут",
-            "Ананас": "ананас",
-            "Ягоды": "ягоды",
-            "Авокадо": "авокадо",
-            "Миндаль": "миндаль",
-            "Грецкие орехи": "грецкие орехи",
-            "Семена чиа": "семена чиа",
-            "Льняное семя": "льняное семя",
-            "Кешью": "кешью",
-            "Фундук": "фундук",
-            "Арахисовая паста": "арахисовой пасты",
-            "Оливковое масло": "оливкового масла"
-        }
-
-        if phrase in exceptions:
-            return exceptions[phrase]
-
-        # Базовые правила для винительного падежа
-        words = phrase.split()
-
-        if len(words) >= 2:
-            adj = words[0]
-            noun = ' '.join(words[1:])
-
-            # Склоняем прилагательное
-            if adj.endswith('ый'):
-                adj = adj[:-2] + 'ый'  # не меняется для муж. рода неодуш.
-            elif adj.endswith('ой'):
-                adj = adj[:-2] + 'ой'
-            elif adj.endswith('ий'):
-                adj = adj[:-2] + 'ий'
-            elif adj.endswith('ая'):
-                adj = adj[:-2] + 'ую'
-            elif adj.endswith('яя'):
-                adj = adj[:-2] + 'юю'
-
-            # Склоняем существительное
-            if noun.endswith('а'):
-                noun = noun[:-1] + 'у'
-            elif noun.endswith('я'):
-                noun = noun[:-1] + 'ю'
-            elif noun.endswith('ка'):
-                noun = noun[:-1] + 'у'
-            # Остальные не меняются
-
-            return f"{adj.lower()} {noun}"
-        else:
-            word = phrase
-
-            # Одно слово
-            if word.endswith('а'):
-                return word[:-1] + 'у'
-            elif word.endswith('я'):
-                return word[:-1] + 'ю'
-            elif word.endswith('ка'):
-                return word[:-1] + 'у'
-            else:
-                return word.lower()
+        return declension_table.accusative(phrase)
 
     def _to_instrumental_case(self, phrase: str) -> str:
         """
         Склоняет фразу в творительный падеж (для 'с чем')
-        Работает с простыми правилами русского языка
         """
+        return declension_table.instrumental(phrase)
 
-        # Словарь исключений для сложных случаев
-        exceptions = {
-            "Греческий йогурт": "греческим йогуртом",
-            "Цельнозерновой хлеб": "цельнозерновым хлебом",
-            "Рис белый (варёный)": "белым варёным рисом",
-            "Рис бурый варёный": "бурым варёным рисом",
-            "Куриная грудка": "куриной грудкой",
-            "Филе индейки": "филе индейки",
-            "Треска": "треской",
-            "Морковь": "морковью",
-            "Овсянка": "овсянкой",
-            "Творог обезжиренный": "обезжиренным творогом",
-            "Банан": "бананом",
-            "Яблоко": "яблоком",
-            "Огурцы": "огурцами",
-            "Брокколи": "брокколи",
-            "Болгарский перец": "болгарским перцем",
-            "Гречка варёная": "варёной гречкой",
-            "Яйца": "яйцами",
-            "Лосось": "лососем",
-            "Тунец консервированный": "консервированным тунцом",
-            "Креветки": "креветками",
-            "Тофу": "тофу",
-            "Протеиновый порошок": "протеиновым порошком",
-            "Кускус": "кускусом",
-            "Чечевица": "чечевицей",
-            "Нут": "нутом",
-            "Фасоль": "фасолью",
-            "Киноа": "киноа",
-            "Цветная капуста": "цветной капустой",
-            "Баклажан": "баклажаном",
-            "Стручковая фасоль": "стручковой фасолью",
-            "Тыква": "тыквой",
-            "Шпинат": "шпинатом",
-            "Киви": "киви",
-            "Манго": "манго",
-            "Грейпфрут": "грейпфрутом",
-            "Ананас": "ананасом",
-            "Ягоды": "ягодами",
-            "Авокадо": "авокадо",
-            "Миндаль": "миндалём",
-            "Грецкие орехи": "грецкими орехами",
-            "Семена чиа": "семенами чиа",
-            "Льняное семя": "льняным семенем",
-            "Кешью": "кешью",
-            "Фундук": "фундуком",
-            "Арахисовая паста": "арахисовой пастой",
-            "Оливковое масло": "оливковым маслом"
-        }
-
-        # Проверяем словарь исключений
-        if phrase in exceptions:
-            return exceptions[phrase]
-
-        # Базовые правила склонения
-        words = phrase.split()
-
-        if len(words) >= 2:
-            # Склоняем прилагательное и существительное
-            adj = words[0]
-            noun = ' '.join(words[1:])
-
-            # Склоняем прилагательное
-            if adj.endswith('ый'):
-                adj = adj[:-2] + 'ым'
-            elif adj.endswith('ой'):
-                adj = adj[:-2] + 'ым'
-            elif adj.endswith('ий'):
-                adj = adj[:-2] + 'им'
-            elif adj.endswith('ая'):
-                adj = adj[:-2] + 'ой'
-            elif adj.endswith('яя'):
-                adj = adj[:-2] + 'ей'
-
-            # Склоняем существительное
-            if noun.endswith('а'):
-                noun = noun[:-1] + 'ой'
-            elif noun.endswith('я'):
-                noun = noun[:-1] + 'ей'
-            elif noun.endswith('ь'):
-                noun = noun[:-1] + 'ью'
-            elif noun.endswith('ка'):
-                noun = noun[:-1] + 'ой'
-            else:
-                # Мужской род на согласную
-                noun = noun + 'ом'
-
-            return f"{adj.lower()} {noun}"
-        else:
-            # Одно слово
-            word = phrase
-
-            if word.endswith('а'):
-                return word[:-1] + 'ой'
-            elif word.endswith('я'):
-                return word[:-1] + 'ей'
-            elif word.endswith('ь'):
-                return word[:-1] + 'ью'
-            elif word.endswith('ка'):
-                return word[:-1] + 'ой'
-            else:
-                return word + 'ом'
-
-    def generate_meal_plan(self, profile: dict, preferences: dict, language: str = "ru") -> str:
+    def generate_meal_plan(self, profile: dict, preferences: dict, language: str = "ru", user_id: int = None,
+                           rng: random.Random = None, seed: int = None) -> str:
         """
         Генерирует идеальный план питания с защитой от ошибок
 
@@ -306,10 +167,69 @@ class IntelligentMealPlanner:
             profile: {age, weight, height, gender, goal, activity_level}
             preferences: {available_products, exclude, allergies, favorites, cooking_time}
             language: ru/en/uz
+            user_id: Если указан, структурированный план сохраняется для replace_meal,
+                а выбор продуктов учитывает и обновляет историю пользователя
+            rng, seed: Генератор случайных чисел или его зерно; по умолчанию
+                зерно выводится из (user_id, дата, вид запроса) - см. plan_random
+
+        Частые профили отдаются из кэша готовых планов (plan_cache): вариант
+        для того же ключа, который пользователь недавно не получал, подгоняется
+        под его норму (_personalized); при промахе план генерируется и
+        становится вариантом ключа. Новые варианты ключа строятся в фоне
+        (_key_variant), поэтому с кэшем одинаковый результат не гарантирован -
+        для точного воспроизведения plan_cache = None.
 
         Returns:
             Полный план питания в виде форматированного текста
         """
+        if not profile or not isinstance(profile, dict):
+            profile = {}
+        if not preferences or not isinstance(preferences, dict):
+            preferences = {}
+
+        rng = rng or plan_rng(user_id, MEAL_PLAN, seed=seed)
+        cache = self.plan_cache
+        with variety_store.session(user_id) as history:
+            cached = key = None
+            if cache is not None:
+                goal = profile.get('goal', 'maintain')
+                metabolism = self._safe_metabolism(profile)
+                allergies = _as_key(self._allergies(preferences))
+                excluded = _as_key(self._excluded_products(preferences))
+                diet_type = preferences.get('diet_type')
+                products = self._parse_user_products(preferences)
+                structure = self._meal_structure(preferences)
+                key = plan_key(goal, language, metabolism['target_calories'], [*allergies, *excluded],
+                               structure, products, diet_type)
+                recent = set(history.combinations)
+                cached = cache.get(key, lambda variant: self._served_recently(variant, recent))
+
+            if cached is not None:
+                plan = self._personalized(cached, metabolism, preferences)
+                self._remember_combinations(plan.meals, history)
+            else:
+                plan = self.build_meal_plan(profile, preferences, language, history, rng=rng)
+                if cache is not None:
+                    cache.put(key, plan, partial(self._key_variant, goal, language, key[2], allergies, excluded,
+                                                 diet_type, products, structure))
+        if user_id:
+            meal_plan_store.save(user_id, plan)
+        return plan.text
+
+    def build_meal_plan(self, profile: dict, preferences: dict, language: str = "ru",
+                        history: VarietyHistory = None, batch: _MealBatch = None,
+                        rng: random.Random = None, metabolism: dict = None) -> MealPlan:
+        """
+        Полная генерация плана питания в структурированном виде (см. generate_meal_plan)
+
+        history - история разнообразия пользователя, дополняется выбранными
+        продуктами; без неё план строится без учёта прошлых. batch - общие
+        кандидаты пакетной генерации (см. build_meal_plans). rng - источник
+        случайности (без него - модуль random). metabolism - готовый расчёт
+        вместо расчёта по профилю (см. _key_variant)
+        """
+        if history is None:
+            history = VarietyHistory()
 
         # Валидация входных данных
         if not profile or not isinstance(profile, dict):
@@ -318,26 +238,24 @@ class IntelligentMealPlanner:
             preferences = {}
 
         # ШАГ 1: Расчёт метаболизма
-        try:
-            metabolism = self._calculate_metabolism(profile)
-        except Exception:
-            metabolism = {'bmr': 1500, 'tdee': 2000, 'target_calories': 2000}
+        if metabolism is None:
+            metabolism = self._safe_metabolism(profile)
 
         # ШАГ 2: Распределение калорий по приёмам пищи
-        # Проверяем, нужны ли перекусы (по умолчанию НЕТ)
-        include_snacks = preferences.get('include_snacks', False)
-        if include_snacks:
-            meal_structure = 'breakfast,snack,lunch,snack,dinner'
-        else:
-            meal_structure = 'breakfast,lunch,dinner'
-
         meal_distribution = self._distribute_calories(
             total_calories=metabolism['target_calories'],
-            meal_structure=meal_structure
+            meal_structure=self._meal_structure(preferences)
         )
 
         # ШАГ 3: Подбор продуктов на основе предпочтений
-        available_products = self._filter_products(preferences)
+        if batch is None:
+            available_products = self._filter_products(preferences)
+        else:
+            key = (_as_key(self._allergies(preferences)), _as_key(self._excluded_products(preferences)),
+                   preferences.get('diet_type'))
+            available_products = batch.products.get(key)
+            if available_products is None:
+                available_products = batch.products[key] = self._filter_products(preferences)
 
         # ШАГ 4: Генерация каждого приёма пищи
         meals = []
@@ -348,43 +266,357 @@ class IntelligentMealPlanner:
                 available_products=available_products,
                 preferences=preferences,
                 language=language,
-                goal=profile.get('goal', 'maintain')  # ПЕРЕДАЁМ ЦЕЛЬ ПОЛЬЗОВАТЕЛЯ
+                goal=profile.get('goal', 'maintain'),  # ПЕРЕДАЁМ ЦЕЛЬ ПОЛЬЗОВАТЕЛЯ
+                history=history,
+                batch=batch,
+                rng=rng
             )
             meals.append(meal)
 
-        # ШАГ 5: Проверка и корректировка
-        meals = self._adjust_to_target(meals, metabolism['target_calories'])
+        # ШАГ 5: Порции под целевую калорийность
+        portions = self._rebalance_portions(meals, [1.0] * len(meals), metabolism['target_calories'])
 
-        # ШАГ 6: Форматирование вывода
-        formatted_plan = self._format_plan(
-            meals=meals,
+        # ШАГ 6: Форматирование вывода по секциям (ШАГ 7, перевод, - тоже по секциям)
+        plan = MealPlan(
+            goal=profile.get('goal', 'maintain'),
+            language=language,
             metabolism=metabolism,
-            language=language
+            preferences=preferences,
+            meals=meals,
+            portions=portions,
+            header=self._format_plan_header(language),
+            goal_advice=self._get_goal_advice(metabolism.get('goal', 'maintain'), language, rng)
         )
+        plan.sections = self._render_sections(list(zip(meals, portions)), language)
+        plan.summary = self._render_summary(plan)
 
-        # Увеличиваем счётчик генераций
-        self.generation_count += 1
-
-        # Оценка разнообразия
-        unique_products = len(set(self.used_products_history[-15:]))
-        diversity_score = min(100, unique_products * 7)
+        self._remember_combinations(meals, history)
+        return plan
 
-        # Запоминаем успешные комбинации продуктов
-        meal_combinations = []
+    def _safe_metabolism(self, profile: dict) -> dict:
+        try:
+            return self._calculate_metabolism(profile)
+        except Exception:
+            return {'bmr': 1500, 'tdee': 2000, 'target_calories': 2000}
+
+    @staticmethod
+    def _meal_structure(preferences: dict) -> str:
+        """Приёмы пищи дня: перекусы только по желанию пользователя (по умолчанию НЕТ)"""
+        if preferences.get('include_snacks', False):
+            return 'breakfast,snack,lunch,snack,dinner'
+        return 'breakfast,lunch,dinner'
+
+    @staticmethod
+    def _remember_combinations(meals: list, history: VarietyHistory):
+        """Запоминаем успешные комбинации продуктов (буфер ограничен, старые вытесняются)"""
         for meal in meals:
             products_in_meal = list(meal.get('ingredients', {}).keys())
             if len(products_in_meal) >= 2:
-                combo = tuple(sorted(products_in_meal[:3]))  # Топ-3 продукта
-                meal_combinations.append(combo)
-        self.used_combinations.extend(meal_combinations)
+                history.combinations.append(tuple(sorted(products_in_meal[:3])))  # Топ-3 продукта
+
+    def _key_variant(self, goal: str, language: str, target_calories: int, allergies: Tuple[str, ...],
+                     excluded: Tuple[str, ...], diet_type: Optional[str], products: List[str],
+                     meal_structure: str, rng: random.Random) -> MealPlan:
+        """
+        Новый вариант ключа кэша для фонового пополнения
+
+        Строится только из того, что входит в ключ: цель, язык, норма ключа,
+        аллергии, исключения, диета, продукты и структура дня - без профиля и
+        истории пользователя, чей запрос положил ключ. Метаболизм в варианте
+        условный, при выдаче его заменяет _personalized.
+        """
+        metabolism = {'bmr': target_calories, 'tdee': target_calories, 'target_calories': target_calories,
+                      'water_ml': 0, 'goal': goal}
+        preferences = {'allergies': list(allergies), 'exclude': list(excluded), 'diet_type': diet_type,
+                       'available_products': ' '.join(products),
+                       'include_snacks': meal_structure != self._meal_structure({})}
+        return self.build_meal_plan({'goal': goal}, preferences, language, rng=rng, metabolism=metabolism)
+
+    @staticmethod
+    def _served_recently(plan: MealPlan, recent: Set[Tuple[str, ...]]) -> bool:
+        """Все комбинации продуктов плана есть в недавней истории пользователя"""
+        combinations = [tuple(sorted(list(meal.get('ingredients', {}).keys())[:3])) for meal in plan.meals
+                        if len(meal.get('ingredients', {})) >= 2]
+        return bool(combinations) and all(combo in recent for combo in combinations)
+
+    def _personalized(self, cached: MealPlan, metabolism: dict, preferences: dict) -> MealPlan:
+        """
+        Копия плана из кэша под пользователя
+
+        Норма в ключе округлена до 50 ккал: порции подгоняются под точную
+        норму, заново отрисовываются только секции с изменившейся порцией
+        и итог (в нём метаболизм пользователя).
+        """
+        plan = cached.copy()
+        plan.metabolism = metabolism
+        plan.preferences = preferences
+        plan.portions = self._rebalance_portions(plan.meals, plan.portions, metabolism['target_calories'])
+        changed = [i for i, portion in enumerate(plan.portions) if portion != cached.portions[i]]
+        sections = self._render_sections([(plan.meals[i], plan.portions[i]) for i in changed], plan.language)
+        for i, section in zip(changed, sections):
+            plan.sections[i] = section
+        plan.summary = self._render_summary(plan)
+        return plan
+
+    def build_meal_plans(self, requests: Iterable[MealPlanRequest],
+                         calorie_step: int = CALORIE_BUCKET) -> Iterator[Tuple[MealPlanRequest, MealPlan]]:
+        """
+        Пакетная генерация планов питания (например, ночной пересчёт)
+
+        Приёмы пищи группируются по (цель, приём пищи, корзина калорий
+        шириной calorie_step, исключения, продукты пользователя): поиск
+        рецептов выполняется один раз на группу с целью по середине
+        корзины, а случайный выбор среди лучших, история и порции - свои
+        у каждого плана. Порции затем подгоняются под точную норму.
+
+        Заявки читаются и планы отдаются по одному - результат можно сразу
+        сохранять, не держа всю пачку в памяти. История заявки (history)
+        дополняется так же, как в build_meal_plan, rng заявки - её источник
+        случайности.
+        """
+        batch = _MealBatch(calorie_step)
+        for request in requests:
+            plan = self.build_meal_plan(request.profile, request.preferences, request.language,
+                                        request.history, batch, request.rng)
+            yield request, plan
+
+    def replace_meal(self, user_id: int, meal_index: int, rng: random.Random = None,
+                     seed: int = None) -> Optional[MealPlan]:
+        """
+        Заменяет одно блюдо в сохранённом плане пользователя
+
+        Метаболизм, распределение и остальные блюда не пересчитываются:
+        новое блюдо берётся из индекса похожих рецептов (или генерируется
+        только этот приём пищи), затем пересчитываются порции и заново
+        отрисовываются только изменившиеся секции и итог.
+
+        Случайность по умолчанию - от (user_id, дата, приём пищи и заменяемое
+        блюдо): повторная замена уже нового блюда даёт другой вариант.
+
+        Работает с планами generate_meal_plan. Бот (l.py) пока строит план
+        через AIGenerator и эту замену не вызывает.
+
+        Returns:
+            Обновлённый план или None, если плана нет или замена не найдена
+        """
+        plan = meal_plan_store.load(user_id)
+        if plan is None or not 0 <= meal_index < len(plan.meals):
+            return None
+
+        if rng is None:
+            kind = f"{MEAL_REPLACE}:{meal_index}:{plan.meals[meal_index].get('name', '')}"
+            rng = plan_rng(user_id, kind, seed=seed)
+        with variety_store.session(user_id) as history:
+            new_meal = self._alternative_meal(plan, meal_index, history, rng)
+        if new_meal is None:
+            return None
+
+        old_portions = list(plan.portions)
+        plan.meals[meal_index] = new_meal
+        plan.portions[meal_index] = 1.0
+        plan.portions = self._rebalance_portions(plan.meals, plan.portions,
+                                                 plan.metabolism['target_calories'], changed=meal_index)
+
+        for i, (meal, portion) in enumerate(zip(plan.meals, plan.portions)):
+            if i == meal_index or portion != old_portions[i]:
+                plan.sections[i] = self._render_section(meal, portion, plan.language)
+        plan.summary = self._render_summary(plan)
+
+        meal_plan_store.save(user_id, plan)
+        return plan
+
+    def _alternative_meal(self, plan: MealPlan, meal_index: int, history: VarietyHistory,
+                          rng: random.Random = None) -> Optional[dict]:
+        """Новое блюдо для одного приёма пищи плана"""
+        rng = rng or random
+        meal = plan.meals[meal_index]
+        portion = plan.portions[meal_index]
+        source = meal.get('source')
+
+        record = self._source_record(source)
+        if record is not None:
+            # Чего не хватает дню без заменяемого блюда
+            wanted = [plan.metabolism['target_calories'], 0, 0, 0]
+            for i, other in enumerate(plan.meals):
+                if i != meal_index:
+                    nutrition = self._scaled_meal(other, plan.portions[i])['nutrition']
+                    wanted[0] -= nutrition['calories']
+            wanted = [max(wanted[0], 0)] + [meal['nutrition'][key] * portion for key in ('protein', 'fat', 'carbs')]
+
+            used = [self._source_record(other.get('source')) for other in plan.meals]
+            found = recipe_neighbour_index.alternatives(
+                source['goal'], source['meal_type'], record, k=3, wanted=wanted,
+                allergies=self._allergies(plan.preferences),
+                diet_type=plan.preferences.get('diet_type'),
+                excluded=self._excluded_products(plan.preferences),
+                skip_recipes=[r for r in used if r is not None]
+            )
+            if found:
+                chosen = rng.choice(found)
+                return self._recipe_to_meal(chosen.recipe_id, chosen.record, source['goal'],
+                                            source['meal_type'], meal.get('meal_type', 'breakfast'),
+                                            plan.language)
+
+        # Блюдо собрано из продуктов (или рецепта уже нет в базе) - генерируем только этот приём пищи
+        return self._generate_meal(
+            meal_type=meal.get('meal_type', 'breakfast'),
+            target_calories=round(meal['nutrition']['calories'] * portion),
+            available_products=self._filter_products(plan.preferences),
+            preferences=plan.preferences,
+            language=plan.language,
+            goal=plan.goal,
+            history=history,
+            rng=rng
+        )
+
+    def _source_record(self, source: Optional[dict]):
+        """Запись рецепта, из которого сделано блюдо (None, если её больше нет)"""
+        if not source:
+            return None
+        records = recipes_loader._records_for(source['goal'], source['meal_type'])
+        recipe_id = source.get('recipe_id', -1)
+        if 0 <= recipe_id < len(records) and records[recipe_id].name == source['name']:
+            return records[recipe_id]
+        # Рецепты перезагружались - ищем по названию
+        return next((r for r in records if r.name == source['name']), None)
+
+    def _rebalance_portions(self, meals: list, portions: list, target_calories: int, changed: int = None) -> list:
+        """
+        Подбирает порции так, чтобы сумма калорий была близка к цели
 
-        # Очистка старых данных
-        if len(self.used_combinations) > 50:
-            self.used_combinations = self.used_combinations[-30:]
-        if len(self.used_products_history) > 30:
-            self.used_products_history = self.used_products_history[-20:]
+        Сначала разницу забирает изменённое блюдо (changed), остаток делится
+        пропорционально между остальными - так при замене одного блюда
+        остальные секции обычно не меняются.
+        """
+        portions = list(portions)
+        calories = [meal['nutrition']['calories'] for meal in meals]
+
+        def total():
+            return sum(c * p for c, p in zip(calories, portions))
+
+        if abs(target_calories - total()) < 150:
+            return portions
+
+        if changed is not None and calories[changed]:
+            others = total() - calories[changed] * portions[changed]
+            portions[changed] = self._clip_portion((target_calories - others) / calories[changed])
+
+        diff = target_calories - total()
+        rest = [i for i in range(len(meals)) if i != changed and calories[i]]
+        rest_total = sum(calories[i] * portions[i] for i in rest)
+        if abs(diff) >= 150 and rest_total:
+            factor = 1 + diff / rest_total
+            for i in rest:
+                portions[i] = self._clip_portion(portions[i] * factor)
+        return portions
+
+    @staticmethod
+    def _clip_portion(portion: float) -> float:
+        """Порция от 0.5 до 1.5, шаг 0.05"""
+        return round(min(max(portion, 0.5), 1.5) * 20) / 20
+
+    @staticmethod
+    def _scaled_meal(meal: dict, portion: float) -> dict:
+        """Блюдо с пищевой ценностью и граммовкой для заданной порции"""
+        if portion == 1.0:
+            return meal
+        scaled = dict(meal, portion=portion)
+        scaled['nutrition'] = {key: round(value * portion) for key, value in meal['nutrition'].items()}
+        # У рецептов из book/ граммовка - часть строки ингредиента, её показывает строка порции
+        scaled['ingredients'] = {
+            key: dict(data, grams=round(data['grams'] * portion)) if isinstance(data['grams'], (int, float)) else data
+            for key, data in meal['ingredients'].items()
+        }
+        return scaled
+
+    def _render_sections(self, items: List[Tuple[dict, float]], language: str) -> List[str]:
+        """
+        Секции нескольких приёмов пищи: перевод - одним запросом на все
+
+        Секции склеиваются через SECTION_SEPARATOR и разрезаются после
+        перевода; если переводчик испортил разделитель, каждая секция
+        переводится отдельно.
+        """
+        sections = [self._format_meal_section(self._scaled_meal(meal, portion), language) for meal, portion in items]
+        if language == "ru" or len(sections) < 2:
+            return [translate_with_ai(section, language) for section in sections]
+        translated = translate_with_ai(SECTION_SEPARATOR.join(sections), language).split(SECTION_SEPARATOR.strip())
+        if len(translated) == len(sections):
+            # Переводчик не сохраняет переводы строк по краям - возвращаем их как в исходных секциях
+            return [self._with_edges(part.strip("\n"), section) for part, section in zip(translated, sections)]
+        return [translate_with_ai(section, language) for section in sections]
+
+    @staticmethod
+    def _with_edges(text: str, like: str) -> str:
+        lead = len(like) - len(like.lstrip("\n"))
+        trail = len(like) - len(like.rstrip("\n"))
+        return "\n" * lead + text + "\n" * trail
+
+    def _render_section(self, meal: dict, portion: float, language: str) -> str:
+        """Секция одного приёма пищи (переводится отдельно, чтобы замена не трогала остальные)"""
+        section = self._format_meal_section(self._scaled_meal(meal, portion), language)
+        if language != "ru":
+            section = translate_with_ai(section, language)
+        return section
+
+    def _render_summary(self, plan: MealPlan) -> str:
+        meals = [self._scaled_meal(meal, portion) for meal, portion in zip(plan.meals, plan.portions)]
+        return self._format_plan_summary(meals, plan.metabolism, plan.language, plan.goal_advice)
+
+    def generate_week_plan(self, profile: dict, preferences: dict, language: str = "ru", days: int = 7,
+                           user_id: int = None, seed: int = None) -> str:
+        """
+        План питания на несколько дней одним вызовом
+
+        Дни подбираются вместе (menu_optimizer.plan_week): без повторов блюд
+        и с разными ингредиентами у соседних дней, вместо days отдельных
+        генераций.
+
+        Args:
+            profile, preferences: Как в generate_meal_plan
+            language: ru/en/uz
+            days: Число дней
+            user_id, seed: Зерно случайности - явное или из (user_id, дата, вид запроса)
+
+        Returns:
+            Все дни подряд в виде форматированного текста
+        """
+        if not profile or not isinstance(profile, dict):
+            profile = {}
+        if not preferences or not isinstance(preferences, dict):
+            preferences = {}
+
+        try:
+            metabolism = self._calculate_metabolism(profile)
+        except Exception:
+            metabolism = {'bmr': 1500, 'tdee': 2000, 'target_calories': 2000}
+
+        rng = plan_rng(user_id, WEEK_PLAN, seed=seed)
+        macros = self._calculate_meal_macros(metabolism['target_calories'], 'day')
+        target = target_vector(metabolism['target_calories'], macros['protein'], macros['fat'], macros['carbs'])
+
+        week = day_menu_optimizer.plan_week(
+            profile.get('goal', 'maintain'), target, days=days,
+            ingredients=self._parse_user_products(preferences),
+            excluded=self._excluded_products(preferences),
+            rng=np.random.default_rng(rng.getrandbits(64))
+        )
+        if not week:
+            return self.generate_fallback_plan(profile, language)
+
+        day_titles = {'ru': 'ДЕНЬ', 'en': 'DAY', 'uz': 'KUN'}
+        day_title = day_titles.get(language, day_titles['ru'])
+        sections = []
+        for number, day in enumerate(week, 1):
+            meals = []
+            for meal_type, record in zip(MEALS, day):
+                recipe = record.to_dict()
+                recipe['meal_type'] = meal_type
+                meals.append(self._convert_recipe_to_meal(recipe, language))
+            sections.append(f"📅 {day_title} {number}\n\n" + self._format_plan(meals, metabolism, language, rng))
+
+        formatted_plan = "\n\n".join(sections)
 
-        # ШАГ 7: AI-перевод на выбранный язык
         if language != "ru":
             formatted_plan = translate_with_ai(formatted_plan, language)
 
@@ -456,28 +688,52 @@ class IntelligentMealPlanner:
             return {f'meal_{i}': per_meal for i in range(meals_count)}
 
     def _filter_products(self, preferences: dict) -> list:
-        """Фильтрует продукты по предпочтениям"""
+        """Фильтрует продукты по предпочтениям (общие неизменяемые записи базы)"""
 
-        available = NutritionDatabase.get_all_products()
+        available = list(NutritionDatabase.get_all_products())
 
-        # Исключаем аллергены
-        allergies = preferences.get('allergies', [])
-        if isinstance(allergies, str):
-            allergies = [allergies] if allergies else []
+        # Исключаем аллергены: сами продукты и целые категории (лактоза, глютен...), как в FoodFilter
+        allergies = self._allergies(preferences)
         if allergies:
-            available = [p for p in available if p['key'] not in allergies]
+            allergy_keys = self._resolve_product_keys(allergies)
+            available = [p for p in available if p['key'] not in allergy_keys]
+        forbidden = food_filter.forbidden_matcher(allergies, preferences.get('diet_type'))
+        if forbidden:
+            available = [p for p in available if not forbidden.search(p.get('name_ru', '').lower())]
 
         # Исключаем нежелательные продукты
-        exclude = preferences.get('exclude', [])
-        if isinstance(exclude, str):
-            exclude = [exclude] if exclude else []
+        exclude = self._excluded_products(preferences)
         if exclude:
-            available = [p for p in available if p['key'] not in exclude]
+            exclude_keys = self._resolve_product_keys(exclude)
+            available = [p for p in available if p['key'] not in exclude_keys]
 
         return available
 
+    def _resolve_product_keys(self, names: list) -> set:
+        """
+        Ключи продуктов по вводу пользователя: ключ, точное название на любом
+        языке или название с опечаткой (только очень близкое)
+        """
+        keys = set()
+        for name in names:
+            name = name.strip()
+            if not name:
+                continue
+            keys.add(name)
+            for lang in ('ru', 'en', 'uz'):
+                product = NutritionDatabase.get_product_by_name(name, lang)
+                if product is None:
+                    found = NutritionDatabase.find_products(name, lang, limit=1, min_score=0.7)
+                    product = found[0][0] if found else None
+                if product is not None:
+                    keys.add(product['key'])
+                    break
+        return keys
+
     def _generate_meal(self, meal_type: str, target_calories: int,
-                      available_products: list, preferences: dict, language: str, goal: str = 'maintain') -> dict:
+                      available_products: list, preferences: dict, language: str, goal: str = 'maintain',
+                      history: VarietyHistory = None, batch: _MealBatch = None,
+                      rng: random.Random = None) -> dict:
         """
         Генерирует один приём пищи из ГОТОВЫХ РЕЦЕПТОВ
         Использует базу MEGA_RECIPES (636 рецептов)
@@ -491,7 +747,9 @@ class IntelligentMealPlanner:
             available_products=available_products,
             preferences=preferences,
             language=language,
-            goal=goal
+            goal=goal,
+            batch=batch,
+            rng=rng
         )
 
         if recipe:
@@ -504,79 +762,103 @@ class IntelligentMealPlanner:
             available_products=available_products,
             preferences=preferences,
             language=language,
-            goal=goal
+            goal=goal,
+            history=history,
+            rng=rng
         )
 
     def _find_suitable_recipe(self, meal_type: str, target_calories: int,
-                             available_products: list, preferences: dict, language: str, goal: str = 'maintain') -> dict:
+                             available_products: list, preferences: dict, language: str, goal: str = 'maintain',
+                             batch: _MealBatch = None, rng: random.Random = None) -> dict:
         """
-        Находит подходящий ГОТОВЫЙ РЕЦЕПТ из базы MEGA_RECIPES
+        Находит подходящий ГОТОВЫЙ РЕЦЕПТ во всём корпусе рецептов
         Фильтрует по:
         - Типу приёма пищи (breakfast/lunch/dinner/snack)
         - Доступным продуктам пользователя (по названиям ингредиентов)
         - Целевым калориям (±30%)
         """
 
-        # Получаем все рецепты нужного типа с учетом цели
-        all_recipes = self.recipe_db.search_by_meal_type(meal_type, goal)
+        user_products_list = self._parse_user_products(preferences)
+        excluded = self._excluded_products(preferences)
+        allergies = self._allergies(preferences)
+        diet_type = preferences.get('diet_type')
+
+        # В пачке цель округляется до корзины, и поиск делается один раз на группу
+        key = None
+        if batch is not None:
+            target_calories = round(target_calories / batch.calorie_step) * batch.calorie_step
+            key = (goal, meal_type, target_calories, _as_key(excluded), _as_key(allergies), diet_type,
+                   tuple(user_products_list))
+            matches = batch.matches.get(key)
+        if key is None or matches is None:
+            # Ищем по всему корпусу через индексы (калории ±30%, исключения, продукты)
+            matches = recipe_query_engine.query(
+                goal, meal_type,
+                target_calories=target_calories,
+                calorie_tolerance=0.3,
+                allergies=allergies,
+                diet_type=diet_type,
+                excluded=excluded,
+                ingredients=user_products_list,
+                limit=10
+            )
+            if key is not None:
+                batch.matches[key] = matches
 
-        if not all_recipes:
+        if not matches:
             return None
 
-        # Парсим доступные продукты от пользователя
+        # Среди лучших по числу совпадений выбираем случайный для разнообразия
+        best_score = matches[0].score
+        top_recipes = [m for m in matches if m.score == best_score]
+        chosen = (rng or random).choice(top_recipes)
+
+        recipe_meal_type = recipe_query_engine.MEAL_ALIASES.get(meal_type, meal_type)
+        if batch is None:
+            return self._recipe_to_meal(chosen.recipe_id, chosen.record, goal, recipe_meal_type,
+                                        meal_type, language)
+        meal_key = (goal, recipe_meal_type, chosen.recipe_id, meal_type, language)
+        meal = batch.meals.get(meal_key)
+        if meal is None:
+            meal = batch.meals[meal_key] = self._recipe_to_meal(chosen.recipe_id, chosen.record, goal,
+                                                                recipe_meal_type, meal_type, language)
+        return dict(meal)
+
+    def _recipe_to_meal(self, recipe_id: int, record, goal: str, recipe_meal_type: str,
+                        meal_type: str, language: str) -> dict:
+        """Блюдо из записи рецепта со ссылкой на источник (для замены в replace_meal)"""
+        recipe = record.to_dict()
+        recipe['meal_type'] = meal_type
+        meal = self._convert_recipe_to_meal(recipe, language)
+        meal['source'] = {'goal': goal, 'meal_type': recipe_meal_type, 'recipe_id': recipe_id, 'name': record.name}
+        return meal
+
+    def _parse_user_products(self, preferences: dict) -> list:
+        """Список продуктов из ввода пользователя (без союзов и предлогов)"""
         user_input_products = preferences.get('available_products', '')
-        excluded = set(preferences.get('exclude', []))
-
-        # Фильтруем рецепты
-        suitable = []
-        for recipe_data in all_recipes:
-            recipe_ingredients = recipe_data.get('ingredients', {}).keys()
-
-            # Проверяем калории (±30% от цели)
-            recipe_calories = recipe_data.get('calories', 0)
-            calories_ok = target_calories * 0.7 <= recipe_calories <= target_calories * 1.3
-
-            if not calories_ok:
-                continue
-
-            # Проверяем исключения
-            has_excluded = any(excl in str(recipe_ingredients).lower() for excl in excluded if excl)
-            if has_excluded:
-                continue
-
-            # Если пользователь указал продукты - проверяем совпадения
-            if user_input_products and user_input_products.strip() and user_input_products not in ['-', 'нет', 'все']:
-                # Разбиваем ввод пользователя на отдельные продукты
-                # Удаляем союзы и предлоги
-                ignore_words = ['и', 'с', 'или', 'на', 'в', 'из', 'от', 'для', 'по', 'к', 'у',
-                               'and', 'with', 'or', 'on', 'in', 'from', 'for', 'to', 'at']
-                user_products_list = [p.strip().lower() for p in user_input_products.replace(',', ' ').split()
-                                     if p.strip() and p.strip().lower() not in ignore_words]
-
-                # Проверяем, содержит ли рецепт хотя бы один из продуктов пользователя
-                recipe_ingredients_str = ' '.join(recipe_ingredients).lower()
-                match_count = sum(1 for user_prod in user_products_list
-                                 if any(user_prod in ing.lower() for ing in recipe_ingredients))
-
-                # Если нашлось хотя бы одно совпадение - рецепт подходит
-                if match_count > 0:
-                    suitable.append((recipe_data, match_count))
-            else:
-                # Если продукты не указаны - берем любой рецепт
-                suitable.append((recipe_data, 0))
-
-        if not suitable:
-            return None
-
-        # Сортируем по количеству совпадений (больше совпадений = лучше)
-        suitable.sort(key=lambda x: x[1], reverse=True)
-
-        # Берем топ-3 лучших совпадения и выбираем случайный из них
-        top_recipes = suitable[:min(3, len(suitable))]
-        chosen_recipe, _ = random.choice(top_recipes)
+        if not user_input_products or not user_input_products.strip() or user_input_products in ['-', 'нет', 'все']:
+            return []
+        # Разбиваем ввод пользователя на отдельные продукты
+        # Удаляем союзы и предлоги
+        ignore_words = ['и', 'с', 'или', 'на', 'в', 'из', 'от', 'для', 'по', 'к', 'у',
+                       'and', 'with', 'or', 'on', 'in', 'from', 'for', 'to', 'at']
+        return [p.strip().lower() for p in user_input_products.replace(',', ' ').split()
+                if p.strip() and p.strip().lower() not in ignore_words]
+
+    @staticmethod
+    def _allergies(preferences: dict) -> list:
+        """Аллергии списком (в preferences может быть строка)"""
+        allergies = preferences.get('allergies', [])
+        if isinstance(allergies, str):
+            allergies = [allergies] if allergies else []
+        return allergies
 
-        # Конвертируем рецепт в нужный формат
-        return self._convert_recipe_to_meal(chosen_recipe, language)
+    def _excluded_products(self, preferences: dict) -> list:
+        """Исключённые продукты списком (в preferences может быть строка)"""
+        exclude = preferences.get('exclude', [])
+        if isinstance(exclude, str):
+            exclude = [exclude] if exclude else []
+        return exclude
 
     def _convert_recipe_to_meal(self, recipe: dict, language: str) -> dict:
         """Конвертирует рецепт из MEGA_RECIPES в формат meal"""
@@ -747,7 +1029,8 @@ class IntelligentMealPlanner:
             return lang_tips['balanced']
 
     def _generate_meal_from_products(self, meal_type: str, target_calories: int,
-                      available_products: list, preferences: dict, language: str, goal: str = 'maintain') -> dict:
+                      available_products: list, preferences: dict, language: str, goal: str = 'maintain',
+                      history: VarietyHistory = None, rng: random.Random = None) -> dict:
         """
         СТАРАЯ ЛОГИКА - генерирует блюдо из отдельных продуктов
         Используется только если не найден готовый рецепт
@@ -764,7 +1047,9 @@ class IntelligentMealPlanner:
             meal_type=meal_type,
             preferences=preferences,
             goal=goal,
-            language=language
+            language=language,
+            history=history,
+            rng=rng
         )
 
         # Рассчитываем точные порции
@@ -777,11 +1062,12 @@ class IntelligentMealPlanner:
         # Генерируем шаги приготовления
         cooking_steps = self._generate_cooking_steps(
             portions=portions,
-            language=language
+            language=language,
+            rng=rng
         )
 
         # Генерируем полезный совет
-        tip = self._generate_tip(portions, language)
+        tip = self._generate_tip(portions, language, rng)
 
         # Рассчитываем итоговую питательность
         total_nutrition = self._calculate_total_nutrition(portions)
@@ -791,7 +1077,7 @@ class IntelligentMealPlanner:
         difficulty = 'easy' if len(portions) <= 3 else 'medium' if len(portions) <= 5 else 'hard'
 
         return {
-            'name': self._generate_dish_name(portions, meal_type, language),
+            'name': self._generate_dish_name(portions, meal_type, language, rng),
             'ingredients': portions,
             'steps': cooking_steps,
             'nutrition': total_nutrition,
@@ -818,17 +1104,22 @@ class IntelligentMealPlanner:
 
     def _select_products_intelligent(self, available_products: list,
                                     target_calories: int, target_macros: dict,
-                                    meal_type: str, preferences: dict, goal: str = 'maintain', language: str = 'ru') -> list:
+                                    meal_type: str, preferences: dict, goal: str = 'maintain', language: str = 'ru',
+                                    history: VarietyHistory = None, rng: random.Random = None) -> list:
         """
         ИНТЕЛЛЕКТУАЛЬНЫЙ подбор продуктов с РАЗНООБРАЗИЕМ и УЧЁТОМ ЦЕЛИ
-        Учитывает: тип приёма пищи, предпочтения, макросы, калории, историю выбора, ЦЕЛЬ ПОЛЬЗОВАТЕЛЯ
+        Учитывает: тип приёма пищи, предпочтения, макросы, калории, историю выбора пользователя
+        (history, дополняется выбранными продуктами), ЦЕЛЬ ПОЛЬЗОВАТЕЛЯ
         """
 
+        if history is None:
+            history = VarietyHistory()
+        rng = rng or random
         selected = []
 
         # Фильтруем продукты, которые уже использовались
-        fresh_products = [p for p in available_products
-                         if p['key'] not in self.used_products_history[-10:]]  # Последние 10
+        recent = history.recent_products(10)  # Последние 10
+        fresh_products = [p for p in available_products if p['key'] not in recent]
 
         # Если слишком много отфильтровали, берем все
         if len(fresh_products) < 5:
@@ -849,7 +1140,7 @@ class IntelligentMealPlanner:
             if carb_products:
                 base = self._choose_best_product(carb_products, preferences, priority='energy', goal=goal)
                 selected.append(base)
-                self.used_products_history.append(base['key'])
+                history.products.append(base['key'])
 
             # БЕЛОК - яйца, творог, йогурт (подходит для завтрака)
             if language == 'en':
@@ -864,22 +1155,22 @@ class IntelligentMealPlanner:
             if protein_products:
                 protein = self._choose_best_product(protein_products, preferences, priority='quick_cook', goal=goal)
                 selected.append(protein)
-                self.used_products_history.append(protein['key'])
+                history.products.append(protein['key'])
 
             # ФРУКТЫ - обязательно на завтрак
             fruit_products = [p for p in fresh_products if p['category'] == 'fruits']
             if fruit_products:
                 fruit = self._choose_best_product(fruit_products, preferences, goal=goal)
                 selected.append(fruit)
-                self.used_products_history.append(fruit['key'])
+                history.products.append(fruit['key'])
 
             # Иногда добавляем орехи/семена
-            if random.random() > 0.5:
+            if rng.random() > 0.5:
                 nuts = [p for p in fresh_products if p['category'] == 'nuts']
                 if nuts:
                     nut = self._choose_best_product(nuts, preferences, goal=goal)
                     selected.append(nut)
-                    self.used_products_history.append(nut['key'])
+                    history.products.append(nut['key'])
 
         # Для обеда - полноценное блюдо: мясо/рыба + гарнир + овощи
         elif meal_type == 'lunch':
@@ -895,7 +1186,7 @@ class IntelligentMealPlanner:
             if protein_products:
                 main_protein = self._choose_best_product(protein_products, preferences, priority='satiety', goal=goal)
                 selected.append(main_protein)
-                self.used_products_history.append(main_protein['key'])
+                history.products.append(main_protein['key'])
 
             # УГЛЕВОДНЫЙ ГАРНИР - рис, гречка, макароны, картофель
             if language == 'en':
@@ -909,14 +1200,14 @@ class IntelligentMealPlanner:
             if carb_products:
                 garnish = self._choose_best_product(carb_products, preferences, goal=goal)
                 selected.append(garnish)
-                self.used_products_history.append(garnish['key'])
+                history.products.append(garnish['key'])
 
             # ОВОЩИ - разнообразные
             veggie_products = [p for p in fresh_products if p['category'] == 'vegetables']
             if veggie_products:
                 veggies = self._choose_best_product(veggie_products, preferences, goal=goal)
                 selected.append(veggies)
-                self.used_products_history.append(veggies['key'])
+                history.products.append(veggies['key'])
 
         # Для ужина - легкий белок + овощи (меньше углеводов)
         elif meal_type == 'dinner':
@@ -932,7 +1223,7 @@ class IntelligentMealPlanner:
             if protein_products:
                 protein = self._choose_best_product(protein_products, preferences, priority='light', goal=goal)
                 selected.append(protein)
-                self.used_products_history.append(protein['key'])
+                history.products.append(protein['key'])
 
             # ОВОЩИ - 2-3 вида
             veggie_products = [p for p in fresh_products if p['category'] == 'vegetables']
@@ -940,7 +1231,7 @@ class IntelligentMealPlanner:
                 if veggie_products:
                     veggie = self._choose_best_product(veggie_products, preferences)
                     selected.append(veggie)
-                    self.used_products_history.append(veggie['key'])
+                    history.products.append(veggie['key'])
                     # Удаляем выбранный продукт из списка
                     veggie_products = [v for v in veggie_products if v['key'] != veggie['key']]
 
@@ -949,26 +1240,26 @@ class IntelligentMealPlanner:
                 light_carbs = ['батат', 'чечевица']
                 carb_products = [p for p in fresh_products
                                if p['category'] == 'carbs' and p['key'] in light_carbs]
-                if carb_products and random.random() > 0.6:
+                if carb_products and rng.random() > 0.6:
                     carb = self._choose_best_product(carb_products, preferences)
                     selected.append(carb)
-                    self.used_products_history.append(carb['key'])
+                    history.products.append(carb['key'])
 
         # Для перекусов - легкие продукты для быстрого перекуса
         elif meal_type in ['snack', 'snack1', 'snack2']:
             # ФРУКТЫ - идеально для перекуса
             fruit_products = [p for p in fresh_products if p['category'] == 'fruits']
-            if fruit_products and random.random() > 0.3:
+            if fruit_products and rng.random() > 0.3:
                 fruit = self._choose_best_product(fruit_products, preferences, goal=goal)
                 selected.append(fruit)
-                self.used_products_history.append(fruit['key'])
+                history.products.append(fruit['key'])
 
             # ОРЕХИ или СЕМЕНА - энергия и полезные жиры
             nuts = [p for p in fresh_products if p['category'] == 'nuts']
-            if nuts and random.random() > 0.4:
+            if nuts and rng.random() > 0.4:
                 nut = self._choose_best_product(nuts, preferences, goal=goal)
                 selected.append(nut)
-                self.used_products_history.append(nut['key'])
+                history.products.append(nut['key'])
 
             # МОЛОЧНЫЕ - йогурт, творог, сыр
             if language == 'en':
@@ -979,16 +1270,16 @@ class IntelligentMealPlanner:
                 snack_dairy = ['греческий_йогурт', 'творог', 'сыр', 'кефир']
             dairy_products = [p for p in fresh_products
                             if p['category'] == 'dairy' and p['key'] in snack_dairy]
-            if dairy_products and random.random() > 0.5:
+            if dairy_products and rng.random() > 0.5:
                 dairy = self._choose_best_product(dairy_products, preferences, priority='quick_cook', goal=goal)
                 selected.append(dairy)
-                self.used_products_history.append(dairy['key'])
+                history.products.append(dairy['key'])
 
         # Если не удалось подобрать - берем случайные
         if not selected:
-            selected = random.sample(fresh_products, min(3, len(fresh_products)))
+            selected = rng.sample(fresh_products, min(3, len(fresh_products)))
             for p in selected:
-                self.used_products_history.append(p['key'])
+                history.products.append(p['key'])
 
         return selected
 
@@ -1090,19 +1381,54 @@ class IntelligentMealPlanner:
     def _calculate_portions_precise(self, products: list, target_calories: int, target_macros: dict) -> dict:
         """
         ТОЧНЫЙ расчёт порций для достижения целевых калорий
-        Использует математическую оптимизацию
+        Жадная раскладка по продуктам - стартовая точка, затем граммовки
+        под калории и БЖУ сразу подбирает solve_portions (ограниченный МНК
+        с починкой округления до кулинарных шагов)
         """
 
+        unique = {}
+        for product in products:
+            if product:
+                unique.setdefault(product['key'], product)
+        products = list(unique.values())
+        if not products:
+            return {}
+
+        practical = [self._practical_step(product) for product in products]
+        grams_list = solve_portions(
+            product_keys=[product['key'] for product in products],
+            target=target_vector(target_calories, target_macros['protein'],
+                                 target_macros['fat'], target_macros['carbs']),
+            prior_grams=self._greedy_grams(products, target_calories, target_macros),
+            steps=[step for step, _ in practical],
+            minimums=[minimum for _, minimum in practical]
+        )
+
         portions = {}
+        for product, grams in zip(products, grams_list):
+            nutrition = NutritionDatabase.calculate_nutrition(product['key'], grams)
+            # Используем product напрямую, а не только name_ru
+            portions[product['key']] = {
+                'name': product,  # Сохраняем весь объект продукта
+                'grams': grams,
+                'calories': nutrition['calories'],
+                'protein': nutrition['protein'],
+                'fat': nutrition['fat'],
+                'carbs': nutrition['carbs'],
+                'product_key': product['key']
+            }
+        return portions
+
+    def _greedy_grams(self, products: list, target_calories: int, target_macros: dict) -> list:
+        """Жадная раскладка: продукт за продуктом покрывает оставшиеся белки, углеводы или калории"""
+
+        grams_list = []
         remaining_calories = target_calories
         remaining_protein = target_macros['protein']
         remaining_carbs = target_macros['carbs']
         remaining_fat = target_macros['fat']
 
         for i, product in enumerate(products):
-            if not product:
-                continue
-
             # Определяем приоритет для продукта
             if product['category'] == 'protein':
                 # Белковый продукт - стремимся покрыть норму белка
@@ -1141,18 +1467,7 @@ class IntelligentMealPlanner:
                 product_key=product['key'],
                 grams=int(grams)
             )
-
-            # Сохраняем порцию
-            # Используем product напрямую, а не только name_ru
-            portions[product['key']] = {
-                'name': product,  # Сохраняем весь объект продукта
-                'grams': int(grams),
-                'calories': nutrition['calories'],
-                'protein': nutrition['protein'],
-                'fat': nutrition['fat'],
-                'carbs': nutrition['carbs'],
-                'product_key': product['key']
-            }
+            grams_list.append(int(grams))
 
             # Вычитаем из оставшихся
             remaining_calories -= nutrition['calories']
@@ -1160,69 +1475,34 @@ class IntelligentMealPlanner:
             remaining_carbs -= nutrition['carbs']
             remaining_fat -= nutrition['fat']
 
-        # Финальная корректировка если нужно
-        if abs(remaining_calories) > 100 and portions:
-            portions = self._fine_tune_portions(portions, target_calories)
+        return grams_list
 
-        return portions
-
-    def _round_to_practical(self, grams: float, product: dict) -> int:
-        """Округляет до практичных кулинарных значений"""
+    @staticmethod
+    def _practical_step(product: dict) -> tuple:
+        """Шаг округления и минимальная порция продукта, граммы"""
 
         if 'яйц' in product['name_ru'].lower():
             # Яйца считаются штуками (1 яйцо ≈ 50г)
-            eggs_count = max(1, round(grams / 50))
-            return eggs_count * 50
+            return 50, 50
         elif 'рис' in product['name_ru'].lower() or 'гречка' in product['name_ru'].lower():
             # Крупы в 25г шагами
-            return max(25, round(grams / 25) * 25)
+            return 25, 25
         elif product['category'] == 'protein':
             # Мясо/рыба в 50г шагами
-            return max(50, round(grams / 50) * 50)
+            return 50, 50
         elif product['category'] in ['nuts', 'sweeteners']:
             # Орехи и сладости в 5г шагами
-            return max(5, round(grams / 5) * 5)
+            return 5, 5
         else:
             # Остальное в 10г шагами
-            return max(10, round(grams / 10) * 10)
-
-    def _fine_tune_portions(self, portions: dict, target_calories: int) -> dict:
-        """Финальная корректировка порций для точного попадания в калорийность"""
-
-        current_calories = sum(p['calories'] for p in portions.values())
-        diff = target_calories - current_calories
+            return 10, 10
 
-        if abs(diff) < 50:
-            return portions
-
-        # Находим продукт с максимальной калорийностью для корректировки
-        max_cal_product = max(portions.items(), key=lambda x: x[1]['calories'])
-        product_name = max_cal_product[0]
-        product_data = max_cal_product[1]
-
-        # Рассчитываем новый вес
-        product_key = product_data['product_key']
-        product_info = NutritionDatabase.get_product(product_key)
-
-        if product_info and product_info['calories_per_100g'] > 0:
-            new_calories = product_data['calories'] + diff
-            new_grams = (new_calories / product_info['calories_per_100g']) * 100
-            new_grams = max(10, int(new_grams))
-
-            # Пересчитываем порцию
-            new_nutrition = NutritionDatabase.calculate_nutrition(product_key, new_grams)
-            portions[product_name] = {
-                'grams': new_grams,
-                'calories': new_nutrition['calories'],
-                'protein': new_nutrition['protein'],
-                'fat': new_nutrition['fat'],
-                'carbs': new_nutrition['carbs'],
-                'product_key': product_key
-            }
-
-        return portions
+    def _round_to_practical(self, grams: float, product: dict) -> int:
+        """Округляет до практичных кулинарных значений"""
+        step, minimum = self._practical_step(product)
+        return max(minimum, round(grams / step) * step)
 
-    def _generate_cooking_steps(self, portions: dict, language: str) -> list:
+    def _generate_cooking_steps(self, portions: dict, language: str, rng: random.Random = None) -> list:
         """Генерирует шаги приготовления"""
 
         steps = []
@@ -1233,11 +1513,11 @@ class IntelligentMealPlanner:
             steps.append(prep_step)
 
         # Шаг 2-N: Готовка
-        cooking_steps = self._generate_cooking_sequence(portions, language)
+        cooking_steps = self._generate_cooking_sequence(portions, language, rng)
         steps.extend(cooking_steps)
 
         # Последний шаг: Подача
-        serving_step = self._generate_serving_step(language)
+        serving_step = self._generate_serving_step(language, rng)
         if serving_step:
             steps.append(serving_step)
 
@@ -1252,11 +1532,11 @@ class IntelligentMealPlanner:
         }
         return templates.get(language, templates['ru'])
 
-    def _generate_cooking_sequence(self, portions: dict, language: str) -> list:
+    def _generate_cooking_sequence(self, portions: dict, language: str, rng: random.Random = None) -> list:
         """Генерирует последовательность готовки с деталями"""
         steps = []
 
-        import random
+        rng = rng or random
 
         templates = {
             'ru': {
@@ -1358,31 +1638,30 @@ class IntelligentMealPlanner:
             # Определяем метод приготовления и выбираем случайный вариант
             if product_info['category'] == 'protein':
                 if 'яйц' in product_info.get('name_ru', '').lower():
-                    template = random.choice(lang_templates['fry'])
+                    template = rng.choice(lang_templates['fry'])
                 elif 'raw' in product_info.get('cooking_methods', []):
-                    template = random.choice(lang_templates['raw'])
+                    template = rng.choice(lang_templates['raw'])
                 else:
-                    template = random.choice(lang_templates['cook_meat'])
+                    template = rng.choice(lang_templates['cook_meat'])
             elif product_info['category'] == 'carbs':
                 if 'хлеб' in product_info.get('name_ru', '').lower():
-                    template = random.choice(lang_templates['raw'])
+                    template = rng.choice(lang_templates['raw'])
                 else:
-                    template = random.choice(lang_templates['boil_grain'])
+                    template = rng.choice(lang_templates['boil_grain'])
             elif product_info['category'] == 'vegetables':
-                template = random.choice(lang_templates['steam_veg'])
+                template = rng.choice(lang_templates['steam_veg'])
             elif product_info['category'] in ['dairy', 'fruits', 'nuts', 'sweeteners', 'fats']:
-                template = random.choice(lang_templates['raw'])
+                template = rng.choice(lang_templates['raw'])
             else:
-                template = random.choice(lang_templates['raw'])
+                template = rng.choice(lang_templates['raw'])
 
             step = template.format(product=product_name_declined, grams=data['grams'])
             steps.append(step)
 
         return steps
 
-    def _generate_serving_step(self, language: str) -> str:
+    def _generate_serving_step(self, language: str, rng: random.Random = None) -> str:
         """Генерирует шаг подачи"""
-        import random
         templates = {
             'ru': [
                 "Красиво разложите на тарелке и подавайте теплым",
@@ -1397,7 +1676,7 @@ class IntelligentMealPlanner:
             'en': ["Arrange nicely and serve warm", "Garnish and serve immediately"],
             'uz': ["Likopchaga joylashtiring va bering", "Darhol dasturxonga torting"]
         }
-        return random.choice(templates.get(language, templates['ru']))
+        return (rng or random).choice(templates.get(language, templates['ru']))
 
     def _get_default_step(self, language: str) -> str:
         """Возвращает дефолтный шаг если ничего не сгенерировано"""
@@ -1408,9 +1687,8 @@ class IntelligentMealPlanner:
         }
         return templates.get(language, templates['ru'])
 
-    def _generate_tip(self, portions: dict, language: str) -> str:
+    def _generate_tip(self, portions: dict, language: str, rng: random.Random = None) -> str:
         """Генерирует полезный совет о блюде"""
-        import random
 
         tips_database = {
             'ru': {
@@ -1471,7 +1749,7 @@ class IntelligentMealPlanner:
             tip_key = 'balanced'
 
         tips = tips_database.get(language, tips_database['ru'])[tip_key]
-        return random.choice(tips)
+        return (rng or random).choice(tips)
 
     def _calculate_total_nutrition(self, portions: dict) -> dict:
         """Рассчитывает общую питательность блюда"""
@@ -1482,9 +1760,9 @@ class IntelligentMealPlanner:
             'carbs': round(sum(p['carbs'] for p in portions.values()), 1)
         }
 
-    def _generate_dish_name(self, portions: dict, meal_type: str, language: str) -> str:
+    def _generate_dish_name(self, portions: dict, meal_type: str, language: str, rng: random.Random = None) -> str:
         """Генерирует разнообразное название блюда"""
-        import random
+        rng = rng or random
 
         if not portions:
             return {"ru": "Полезное блюдо", "en": "Healthy dish", "uz": "Foydali taom"}.get(language, "Healthy dish")
@@ -1504,48 +1782,34 @@ class IntelligentMealPlanner:
             prefixes = ["", "Аппетитное ", "Сытное ", "Лёгкое ", "Питательное ", "Вкусное ", "Ароматное ", "Полезное ", "Свежее ", "Домашнее ", "Изысканное ", "Нежное ", "Пикантное ", "Сочное ", "Классическое "]
             second = self._to_instrumental_case(ingredient_names[1])
             name = f"{ingredient_names[0]} с {second}"
-            return random.choice(prefixes) + name.lower().capitalize()
+            return rng.choice(prefixes) + name.lower().capitalize()
         elif language == 'en':
             prefixes = ["", "Delicious ", "Hearty ", "Light ", "Nutritious ", "Tasty ", "Aromatic ", "Healthy ", "Fresh ", "Homemade ", "Refined ", "Tender ", "Spicy ", "Juicy ", "Classic "]
             name = f"{ingredient_names[0]} with {ingredient_names[1].lower()}"
-            return random.choice(prefixes) + name
+            return rng.choice(prefixes) + name
         else:
             return f"{ingredient_names[0]} {ingredient_names[1].lower()} bilan"
 
-    def _adjust_to_target(self, meals: list, target_calories: int) -> list:
-        """Корректирует приёмы пищи для достижения целевой калорийности"""
-
-        total_current = sum(m['nutrition']['calories'] for m in meals)
-        diff = target_calories - total_current
-
-        if abs(diff) < 150:
-            return meals
-
-        # Распределяем разницу пропорционально между всеми приёмами
-        for meal in meals:
-            proportion = meal['nutrition']['calories'] / total_current
-            adjustment = int(diff * proportion)
-            meal['nutrition']['calories'] += adjustment
-            # Корректируем макросы пропорционально
-            meal['nutrition']['protein'] = int(meal['nutrition']['protein'] * (1 + adjustment / meal['nutrition']['calories']))
-            meal['nutrition']['carbs'] = int(meal['nutrition']['carbs'] * (1 + adjustment / meal['nutrition']['calories']))
-
-        return meals
-
-    def _format_plan(self, meals: list, metabolism: dict, language: str) -> str:
+    def _format_plan(self, meals: list, metabolism: dict, language: str, rng: random.Random = None) -> str:
         """
         Форматирует финальный план питания
         СТРОГО по шаблону, БЕЗ смешивания языков
         """
+        goal_advice = self._get_goal_advice(metabolism.get('goal', 'maintain'), language, rng)
+        sections = [self._format_plan_header(language)]
+        sections.extend(self._format_meal_section(meal, language) for meal in meals)
+        sections.append(self._format_plan_summary(meals, metabolism, language, goal_advice))
+        return "\n".join(sections)
 
+    def _format_plan_header(self, language: str) -> str:
         templates = self.language_templates[language]
-        output = []
+        return "\n".join([templates['title'], ""])
 
-        # Заголовок
-        output.append(templates['title'])
-        output.append("")
+    def _format_meal_section(self, meal: dict, language: str) -> str:
+        """Секция одного приёма пищи"""
+        templates = self.language_templates[language]
+        output = []
 
-        # Каждый приём пищи
         meal_types = {
             'breakfast': templates['breakfast'],
             'snack': templates['snack'],
@@ -1554,45 +1818,51 @@ class IntelligentMealPlanner:
             'lunch': templates['lunch'],
             'dinner': templates['dinner']
         }
+        meal_type_key = meal.get('meal_type', 'breakfast')
 
-        for meal in meals:
-            meal_type_key = meal.get('meal_type', 'breakfast')
+        # Заголовок приёма пищи
+        output.append(meal_types.get(meal_type_key, templates['breakfast']))
+        output.append(f"🍳 {meal['name']}")
+        if meal.get('portion', 1.0) != 1.0:
+            output.append(f"⚖️ {templates['portion']}: ×{meal['portion']:g}")
+        output.append("")
 
-            # Заголовок приёма пищи
-            output.append(meal_types.get(meal_type_key, templates['breakfast']))
-            output.append(f"🍳 {meal['name']}")
-            output.append("")
+        # Ингредиенты
+        output.append(templates['ingredients'])
+        for product_key, data in meal['ingredients'].items():
+            product_info = data.get('name')
+            if product_info:
+                ingredient_name = product_info.get(f'name_{language}', product_info.get('name_ru', ''))
+                output.append(f"🔸 {ingredient_name} {data['grams']}{templates['grams']}")
+        output.append("")
 
-            # Ингредиенты
-            output.append(templates['ingredients'])
-            for product_key, data in meal['ingredients'].items():
-                product_info = data.get('name')
-                if product_info:
-                    ingredient_name = product_info.get(f'name_{language}', product_info.get('name_ru', ''))
-                    output.append(f"🔸 {ingredient_name} {data['grams']}{templates['grams']}")
-            output.append("")
+        # Приготовление
+        output.append(templates['preparation'])
+        for j, step in enumerate(meal['steps'], 1):
+            # Добавляем эмодзи для каждого шага
+            output.append(f"🥘 {step}")
+        output.append("")
 
-            # Приготовление
-            output.append(templates['preparation'])
-            for j, step in enumerate(meal['steps'], 1):
-                # Добавляем эмодзи для каждого шага
-                output.append(f"🥘 {step}")
-            output.append("")
+        # Пищевая ценность
+        output.append(templates['nutrition'])
+        output.append(f"➡️ {templates['calories']}: {meal['nutrition']['calories']}{templates['kcal']}")
+        output.append(f"➡️ {templates['protein']}: {meal['nutrition']['protein']}{templates['g']}")
+        output.append(f"➡️ {templates['fat']}: {meal['nutrition']['fat']}{templates['g']}")
+        output.append(f"➡️ {templates['carbs']}: {meal['nutrition']['carbs']}{templates['g']}")
+        output.append("")
 
-            # Пищевая ценность
-            output.append(templates['nutrition'])
-            output.append(f"➡️ {templates['calories']}: {meal['nutrition']['calories']}{templates['kcal']}")
-            output.append(f"➡️ {templates['protein']}: {meal['nutrition']['protein']}{templates['g']}")
-            output.append(f"➡️ {templates['fat']}: {meal['nutrition']['fat']}{templates['g']}")
-            output.append(f"➡️ {templates['carbs']}: {meal['nutrition']['carbs']}{templates['g']}")
-            output.append("")
+        # Совет
+        output.append(templates['tip'])
+        output.append(meal['tip'])
+        output.append("")
 
-            # Совет
-            output.append(templates['tip'])
-            output.append(meal['tip'])
-            output.append("")
+        return "\n".join(output)
+
+    def _format_plan_summary(self, meals: list, metabolism: dict, language: str, goal_advice: str) -> str:
+        """Итог дня: калории, метаболизм, совет"""
+        templates = self.language_templates[language]
+        output = []
 
-        # Итоговая информация
         total_calories = sum(m['nutrition']['calories'] for m in meals)
         output.append(f"📊 {templates['total']}: ~{total_calories} {templates['kcal']}")
         output.append("")
@@ -1613,8 +1883,6 @@ class IntelligentMealPlanner:
         output.append("")
 
         # Персональный совет на основе цели
-        goal = metabolism.get('goal', 'maintain')
-        goal_advice = self._get_goal_advice(goal, language)
         if goal_advice:
             output.append(f"🎯 {goal_advice}")
             output.append("")
@@ -1625,7 +1893,7 @@ class IntelligentMealPlanner:
 
         return "\n".join(output)
 
-    def _get_goal_advice(self, goal: str, language: str) -> str:
+    def _get_goal_advice(self, goal: str, language: str, rng: random.Random = None) -> str:
         """Даёт персональный совет на основе цели с вариациями"""
         advice = {
             'ru': {
@@ -1708,7 +1976,7 @@ class IntelligentMealPlanner:
             }
         }
         goal_advice = advice.get(language, advice['ru']).get(goal, [])
-        return random.choice(goal_advice) if goal_advice else ''
+        return (rng or random).choice(goal_advice) if goal_advice else ''
 
     def _load_templates(self) -> dict:
         """Загружает языковые шаблоны"""
@@ -1738,7 +2006,8 @@ class IntelligentMealPlanner:
                 'grams': 'г',
                 'recognized': 'Распознано в плане',
                 'water': 'Вода',
-                'per_day': 'в день'
+                'per_day': 'в день',
+                'portion': 'Порция'
             },
             'en': {
                 'title': '🍽 YOUR PERSONAL NUTRITION PLAN',
@@ -1765,7 +2034,8 @@ class IntelligentMealPlanner:
                 'grams': 'g',
                 'recognized': 'Recognized in plan',
                 'water': 'Water',
-                'per_day': 'per day'
+                'per_day': 'per day',
+                'portion': 'Portion'
             },
             'uz': {
                 'title': '🍽 SIZNING SHAXSIY OVQATLANISH REJANGIZ',
@@ -1792,7 +2062,8 @@ class IntelligentMealPlanner:
                 'grams': 'g',
                 'recognized': 'Rejada aniqlangan',
                 'water': 'Suv',
-                'per_day': 'kuniga'
+                'per_day': 'kuniga',
+                'portion': 'Porsiya'
             }
         }
 
@@ -1915,7 +2186,8 @@ class IntelligentWorkoutPlanner:
         self.exercise_db = ExerciseDatabase()
         self.language_templates = self._load_templates()
 
-    def generate_workout_plan(self, profile: dict, workout_info: dict, language: str = "ru") -> str:
+    def generate_workout_plan(self, profile: dict, workout_info: dict, language: str = "ru",
+                              user_id: int = None, rng: random.Random = None, seed: int = None) -> str:
         """
         Генерирует план тренировки
 
@@ -1923,7 +2195,10 @@ class IntelligentWorkoutPlanner:
             profile: {age, weight, height, gender, goal, activity_level}
             workout_info: {workout_type, equipment, duration, focus_areas}
             language: ru/en/uz
+            user_id, rng, seed: Источник случайности - rng, зерно seed или по
+                умолчанию зерно из (user_id, дата, вид запроса), см. plan_random
         """
+        rng = rng or plan_rng(user_id, WORKOUT_PLAN, seed=seed)
 
         # Определяем уровень опыта
         level = profile.get('activity_level', 'intermediate')
@@ -1936,7 +2211,8 @@ class IntelligentWorkoutPlanner:
             workout_type=workout_type,
             equipment=workout_info.get('equipment', 'none'),
             level=level,
-            focus_areas=workout_info.get('focus_areas', [])
+            focus_areas=workout_info.get('focus_areas', []),
+            rng=rng
         )
 
         # Создаём структуру тренировки
@@ -1956,66 +2232,48 @@ class IntelligentWorkoutPlanner:
 
         return formatted_plan
 
-    def _select_exercises(self, workout_type: str, equipment: str, level: str, focus_areas: list) -> list:
+    def _select_exercises(self, workout_type: str, equipment: str, level: str, focus_areas: list,
+                          rng: random.Random = None) -> list:
         """Подбирает упражнения для тренировки БЕЗ ПОВТОРОВ"""
+        rng = rng or random
 
-        all_exercises = ExerciseDatabase.get_all_exercises()
-
-        # Фильтруем по оборудованию
-        if equipment != 'all':
-            all_exercises = [e for e in all_exercises if e['equipment'] in [equipment, 'none']]
+        # Битовые множества номеров упражнений: выбор - операции над битами, без копий списков
+        allowed_equipment = None if equipment == 'all' else (equipment, 'none')
 
         selected = []
-        used_keys = set()  # Отслеживаем использованные упражнения
+        used = 0  # Использованные упражнения (биты номеров)
 
-        if workout_type == 'full_body':
-            # Полная тренировка тела - разные группы мышц
-            muscle_groups = ['chest', 'back', 'legs', 'shoulders', 'abs']
-            for group in muscle_groups:
-                group_exercises = [e for e in all_exercises
-                                 if group in e['muscle_groups'] and e['key'] not in used_keys]
-                if group_exercises:
-                    exercise = random.choice(group_exercises)  # РАЗНООБРАЗИЕ!
-                    selected.append(exercise)
-                    used_keys.add(exercise['key'])
-
-        elif workout_type == 'upper_body':
-            muscle_groups = ['chest', 'back', 'shoulders', 'biceps', 'triceps']
+        if workout_type in ('full_body', 'upper_body'):
+            # Полная тренировка тела / верх - по упражнению на разные группы мышц
+            if workout_type == 'full_body':
+                muscle_groups = ['chest', 'back', 'legs', 'shoulders', 'abs']
+            else:
+                muscle_groups = ['chest', 'back', 'shoulders', 'biceps', 'triceps']
             for group in muscle_groups:
-                group_exercises = [e for e in all_exercises
-                                 if group in e['muscle_groups'] and e['key'] not in used_keys]
-                if group_exercises:
-                    exercise = random.choice(group_exercises)  # РАЗНООБРАЗИЕ!
-                    selected.append(exercise)
-                    used_keys.add(exercise['key'])
+                group_ids = ExerciseDatabase.query((group,), allowed_equipment, exclude=used)
+                if group_ids:
+                    exercise_id = rng.choice(group_ids)  # РАЗНООБРАЗИЕ!
+                    selected.append(ExerciseDatabase.get_exercise_by_id(exercise_id))
+                    used |= 1 << exercise_id
 
         elif workout_type == 'lower_body':
             # Для ног выбираем больше упражнений - 4-5 штук
-            leg_exercises = [e for e in all_exercises
-                           if ('legs' in e['muscle_groups'] or 'glutes' in e['muscle_groups'])
-                           and e['key'] not in used_keys]
-            if leg_exercises:
-                random.shuffle(leg_exercises)
-                # Выбираем 4-5 упражнений для полноценной тренировки ног
-                for ex in leg_exercises[:5]:
-                    if ex['key'] not in used_keys:
-                        selected.append(ex)
-                        used_keys.add(ex['key'])
+            leg_ids = ExerciseDatabase.query(('legs', 'glutes'), allowed_equipment, exclude=used)
+            rng.shuffle(leg_ids)
+            selected = [ExerciseDatabase.get_exercise_by_id(i) for i in leg_ids[:5]]
 
         elif workout_type == 'cardio':
-            cardio_exercises = [e for e in all_exercises if 'cardio' in e['muscle_groups']]
-            random.shuffle(cardio_exercises)  # РАЗНООБРАЗИЕ!
-            selected = cardio_exercises[:3] if len(cardio_exercises) >= 3 else cardio_exercises
+            cardio_ids = ExerciseDatabase.query(('cardio',), allowed_equipment)
+            rng.shuffle(cardio_ids)  # РАЗНООБРАЗИЕ!
+            selected = [ExerciseDatabase.get_exercise_by_id(i) for i in cardio_ids[:3]]
 
         else:
             # Фокус на конкретных областях
             for area in focus_areas:
-                area_exercises = [e for e in all_exercises
-                                if area in e['muscle_groups'] and e['key'] not in used_keys]
-                if area_exercises:
-                    exercise = area_exercises[0]
-                    selected.append(exercise)
-                    used_keys.add(exercise['key'])
+                area_ids = ExerciseDatabase.query((area,), allowed_equipment, exclude=used)
+                if area_ids:
+                    selected.append(ExerciseDatabase.get_exercise_by_id(area_ids[0]))
+                    used |= 1 << area_ids[0]
 
         # Перемещаем планку в конец списка (если она есть)
         if selected:
@@ -2032,7 +2290,10 @@ class IntelligentWorkoutPlanner:
             # Планка всегда в конце
             selected = other_exercises + plank_exercises
 
-        return selected if selected else all_exercises[:5]
+        if not selected:
+            fallback_ids = ExerciseDatabase.query(equipment=allowed_equipment)[:5]
+            selected = [ExerciseDatabase.get_exercise_by_id(i) for i in fallback_ids]
+        return selected
 
     def _build_workout_structure(self, exercises: list, level: str, language: str) -> list:
         """Строит структуру тренировки с подходами и повторениями"""
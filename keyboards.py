@@ -0,0 +1,329 @@
+"""
+РЕЕСТР КЛАВИАТУР
+Заранее собранные неизменяемые InlineKeyboardMarkup для каждого (меню, язык)
+"""
+
+import logging
+from typing import Dict, List, Tuple, Callable
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+
+from translations_catalog import translations_catalog, TranslationsCatalog
+
+logger = logging.getLogger(__name__)
+
+# Ряд клавиатуры: список пар (текст, callback_data)
+Row = List[Tuple[str, str]]
+Layout = Callable[[Callable[[str], str], str], List[Row]]
+
+
+def _main_layout(tr, lang):
+    stats_text = {
+        'ru': '📊 Статистика тренировок',
+        'en': '📊 Workout Statistics',
+        'uz': '📊 Mashg\'ulot statistikasi'
+    }
+    chat_text = {
+        'ru': '🤖 Говорить с нейросетью',
+        'en': '🤖 Chat with AI',
+        'uz': '🤖 Sun\'iy intellekt bilan suhbat'
+    }
+    return [
+        [(tr('profile'), "profile"), (tr('results'), "results")],
+        [(tr('daily_program'), "daily_program")],
+        [(stats_text.get(lang, stats_text['ru']), "workout_stats")],
+        [(chat_text.get(lang, chat_text['ru']), "ai_chat"), (tr('water_tracking'), "water_tracking")],
+        [(tr('achievements'), "achievements")],
+        [(tr('referrals'), "referrals")],
+        [(tr('instructions'), "instructions"), (tr('contacts'), "contacts")],
+    ]
+
+
+def _admin_layout(tr, lang):
+    return [
+        [(tr('view_stats'), "admin_stats")],
+        [(tr('broadcast'), "admin_broadcast")],
+        [(tr('user_management'), "admin_users")],
+        [("⚙️ Settings", "admin_settings")],
+        [(tr('admin_knowledge_base'), "admin_knowledge")],
+        [(tr('admin_ai_training'), "admin_ai_training")],
+        [(tr('back'), "main_menu")],
+    ]
+
+
+def _admin_settings_layout(tr, lang):
+    # Админ-панель всегда на русском
+    def ru(key):
+        return translations_catalog.get(key, "ru")
+
+    return [
+        [(ru("settings_target_cals"), "edit_target_cals")],
+        [(ru("settings_activity"), "edit_activity")],
+        [(ru("settings_prices"), "edit_prices")],
+        [(ru("settings_prompt_nutrition"), "edit_prompt_nutrition")],
+        [(ru("settings_prompt_workout"), "edit_prompt_workout")],
+        [(ru("settings_prompt_tips"), "edit_prompt_tips")],
+        [(ru("settings_save"), "admin_save_settings")],
+        [(ru("btn_back_menu"), "admin_menu")],
+    ]
+
+
+def _language_layout(tr, lang):
+    return [
+        [("🇷🇺 Русский", "lang_ru")],
+        [("🇬🇧 English", "lang_en")],
+        [("🇺🇿 O'zbekcha", "lang_uz")],
+    ]
+
+
+def _set_language_layout(tr, lang):
+    return [
+        [("🇷🇺 Русский", "set_lang_ru")],
+        [("🇬🇧 English", "set_lang_en")],
+        [("🇺🇿 O'zbekcha", "set_lang_uz")],
+        [(tr('back'), "edit_profile")],
+    ]
+
+
+def _gender_layout(prefix):
+    def layout(tr, lang):
+        return [
+            [(tr("male"), f"{prefix}male")],
+            [(tr("female"), f"{prefix}female")],
+        ]
+    return layout
+
+
+def _goal_layout(prefix, suffixes):
+    def layout(tr, lang):
+        return [
+            [(tr("goal_lose"), f"{prefix}{suffixes[0]}")],
+            [(tr("goal_gain"), f"{prefix}{suffixes[1]}")],
+            [(tr("goal_maintain"), f"{prefix}{suffixes[2]}")],
+        ]
+    return layout
+
+
+def _level_layout(prefix):
+    def layout(tr, lang):
+        return [
+            [(tr("level_beginner"), f"{prefix}beginner")],
+            [(tr("level_intermediate"), f"{prefix}intermediate")],
+            [(tr("level_advanced"), f"{prefix}advanced")],
+        ]
+    return layout
+
+
+def _profile_layout(tr, lang):
+    return [
+        [(tr("edit_profile"), "edit_profile")],
+        [(tr("return_menu"), "main_menu")],
+    ]
+
+
+def _edit_profile_layout(tr, lang):
+    fields = ['name', 'age', 'gender', 'height', 'weight', 'goal', 'level', 'limitations', 'language']
+    rows = [[(tr(field), f"edit_prof_{field}")] for field in fields]
+    rows.append([(tr('back'), "profile")])
+    return rows
+
+
+def _single_button_layout(text_key, callback_data, prefix=""):
+    def layout(tr, lang):
+        return [[(prefix + tr(text_key), callback_data)]]
+    return layout
+
+
+def _daily_program_layout(tr, lang):
+    return [
+        [(tr("btn_nutrition_plan"), "nutrition_plan")],
+        [(tr("btn_workout_plan"), "workout_plan")],
+        [(tr("btn_back_menu"), "main_menu")],
+    ]
+
+
+def _workout_stats_layout(tr, lang):
+    forecast = {
+        'ru': "Прогноз результатов",
+        'en': "Results forecast",
+        'uz': "Natijalar prognozi"
+    }
+    return [
+        [("📈 " + forecast.get(lang, forecast['uz']), "workout_forecast")],
+        [(tr("btn_return_menu"), "main_menu")],
+    ]
+
+
+def _muscle_groups_layout(tr, lang):
+    return [
+        [(tr("chest"), "muscle_chest")],
+        [(tr("back_muscles"), "muscle_back")],
+        [(tr("legs"), "muscle_legs")],
+        [(tr("full_body"), "muscle_full_body")],
+        [(tr("cardio"), "muscle_cardio")],
+    ]
+
+
+def _water_layout(tr, lang):
+    return [
+        [(tr("water_add_250"), "water_add_250")],
+        [(tr("water_add_500"), "water_add_500")],
+        [(tr("water_add_1000"), "water_add_1000")],
+        [(tr("water_reset"), "water_reset")],
+        [(tr("back"), "main_menu")],
+    ]
+
+
+# Тексты оценки тренировки (используются и в заголовке сообщения)
+WORKOUT_DIFFICULTY_TEXTS = {
+    'ru': {
+        'title': "🎯 Как прошла тренировка?\n\nОцените сложность для корректировки следующего плана:",
+        'hard': "😰 Слишком сложно",
+        'perfect': "💪 В самый раз",
+        'easy': "😊 Слишком легко"
+    },
+    'en': {
+        'title': "🎯 How was the workout?\n\nRate the difficulty to adjust your next plan:",
+        'hard': "😰 Too hard",
+        'perfect': "💪 Just right",
+        'easy': "😊 Too easy"
+    },
+    'uz': {
+        'title': "🎯 Mashg'ulot qanday o'tdi?\n\nKeyingi rejani sozlash uchun qiyinlikni baholang:",
+        'hard': "😰 Juda qiyin",
+        'perfect': "💪 Aynan kerakli",
+        'easy': "😊 Juda oson"
+    }
+}
+
+
+def _workout_difficulty_layout(tr, lang):
+    texts = WORKOUT_DIFFICULTY_TEXTS.get(lang, WORKOUT_DIFFICULTY_TEXTS['ru'])
+    return [
+        [(texts['hard'], "difficulty_hard")],
+        [(texts['perfect'], "difficulty_perfect")],
+        [(texts['easy'], "difficulty_easy")],
+    ]
+
+
+def _cooking_layout(tr, lang):
+    return [
+        [(tr("cook_full"), "cook_full")],
+        [(tr("cook_min"), "cook_min")],
+        [(tr("cook_none"), "cook_none")],
+    ]
+
+
+def _energy_layout(tr, lang):
+    return [
+        [(tr("energy_high"), "energy_high")],
+        [(tr("energy_medium"), "energy_medium")],
+        [(tr("energy_low"), "energy_low")],
+        [(tr("energy_recovery"), "energy_recovery")],
+    ]
+
+
+def _workout_time_layout(tr, lang):
+    return [
+        [(tr("time_30"), "time_30")],
+        [(tr("time_60"), "time_60")],
+        [(tr("time_90"), "time_90")],
+    ]
+
+
+def _tip_layout(text_key):
+    def layout(tr, lang):
+        return [
+            [(tr(text_key), "buy_tip")],
+            [(tr("back"), "main_menu")],
+        ]
+    return layout
+
+
+def _nutrition_ready_layout(tr, lang):
+    return [
+        [(tr("regenerate_button"), "regenerate_nutrition")],
+        [(tr("back_button"), "main_menu")],
+    ]
+
+
+# Макеты всех статических клавиатур: menu_id -> функция (tr, lang) -> ряды кнопок
+MENU_LAYOUTS: Dict[str, Layout] = {
+    "main": _main_layout,
+    "admin": _admin_layout,
+    "admin_settings": _admin_settings_layout,
+    "language": _language_layout,
+    "set_language": _set_language_layout,
+    "gender": _gender_layout("gender_"),
+    "goal": _goal_layout("goal_", ("lose_weight", "gain_muscle", "maintain")),
+    "level": _level_layout("level_"),
+    "set_gender": _gender_layout("set_prof_gender_"),
+    "set_goal": _goal_layout("set_prof_goal_", ("lose", "gain", "maintain")),
+    "set_level": _level_layout("set_prof_level_"),
+    "profile": _profile_layout,
+    "edit_profile": _edit_profile_layout,
+    "back_to_main": _single_button_layout("back", "main_menu"),
+    "return_to_main": _single_button_layout("btn_return_menu", "main_menu"),
+    "back_to_profile": _single_button_layout("back", "profile"),
+    "to_profile": _single_button_layout("to_profile", "profile"),
+    "back_to_workout_stats": _single_button_layout("back", "workout_stats"),
+    "end_ai_chat": _single_button_layout("back", "end_ai_chat", prefix="🚪 "),
+    "payment": _single_button_layout("payment", "payment"),
+    "daily_program": _daily_program_layout,
+    "workout_stats": _workout_stats_layout,
+    "muscle_groups": _muscle_groups_layout,
+    "water": _water_layout,
+    "workout_difficulty": _workout_difficulty_layout,
+    "cooking": _cooking_layout,
+    "energy": _energy_layout,
+    "workout_time": _workout_time_layout,
+    "tip_refresh": _tip_layout("tip_refresh_for_stars"),
+    "tip_wait": _tip_layout("tip_get_for_stars"),
+    "nutrition_ready": _nutrition_ready_layout,
+}
+
+
+class KeyboardRegistry:
+    """
+    Реестр заранее собранных клавиатур
+
+    Все клавиатуры собираются один раз при старте и пересобираются после
+    перезагрузки переводов. Объекты InlineKeyboardMarkup неизменяемы,
+    поэтому одна и та же клавиатура безопасно отдаётся всем пользователям.
+    """
+
+    DEFAULT_LANG = "ru"
+
+    def __init__(self, catalog: TranslationsCatalog, layouts: Dict[str, Layout]):
+        self.catalog = catalog
+        self.layouts = layouts
+        self._markups: Dict[Tuple[str, str], InlineKeyboardMarkup] = self._build()
+        catalog.add_reload_listener(self.rebuild)
+
+    def _build(self) -> Dict[Tuple[str, str], InlineKeyboardMarkup]:
+        markups = {}
+        for lang in self.catalog.languages or (self.DEFAULT_LANG,):
+            tr = lambda key, lang=lang: self.catalog.get(key, lang)
+            for menu_id, layout in self.layouts.items():
+                rows = layout(tr, lang)
+                markups[(menu_id, lang)] = InlineKeyboardMarkup(
+                    [[InlineKeyboardButton(text, callback_data=data) for text, data in row] for row in rows]
+                )
+        return markups
+
+    def rebuild(self):
+        """Пересобрать все клавиатуры (вызывается после перезагрузки переводов)"""
+        # Атомарная подмена словаря целиком
+        self._markups = self._build()
+        logger.info(f"Keyboards rebuilt: {len(self._markups)} markups")
+
+    def get(self, menu_id: str, lang: str = "ru") -> InlineKeyboardMarkup:
+        """Получить готовую клавиатуру"""
+        markups = self._markups
+        markup = markups.get((menu_id, lang))
+        if markup is None:
+            markup = markups[(menu_id, self.DEFAULT_LANG)]
+        return markup
+
+
+# Глобальный реестр
+keyboards = KeyboardRegistry(translations_catalog, MENU_LAYOUTS)
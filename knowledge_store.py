@@ -0,0 +1,156 @@
+"""
+ХРАНИЛИЩЕ БАЗЫ ЗНАНИЙ
+Продукты и упражнения из файла данных: загрузка при первом обращении,
+по желанию - чтение отдельных записей из отображённого в память файла
+"""
+
+import os
+import re
+import json
+import mmap
+import logging
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+KNOWLEDGE_FILE = os.getenv(
+    "KNOWLEDGE_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "knowledge_base.jsonl"),
+)
+
+# KNOWLEDGE_MMAP=1 - отдельные записи читаются через mmap, пока не понадобились все
+USE_MMAP = os.getenv("KNOWLEDGE_MMAP", "0") == "1"
+
+# Начало строки: ["раздел", "ключ", ...
+_LINE_PREFIX = re.compile(rb'\["([a-z_]+)", ("(?:[^"\\]|\\.)*"), ')
+
+
+class KnowledgeStore:
+    """
+    Данные базы знаний в файле JSON Lines
+
+    Каждая строка - ["раздел", "ключ", {запись}]. Файл не читается при
+    импорте: раздел целиком разбирается при первом обращении (section).
+    В режиме mmap отдельная запись (record) до этого момента берётся
+    из отображённого в память файла по смещению её строки, остальные
+    строки не разбираются. Страницы отображения - страницы файла в
+    кэше ОС, общие для всех процессов бота.
+    """
+
+    def __init__(self, path: str = KNOWLEDGE_FILE, use_mmap: bool = USE_MMAP):
+        self.path = path
+        self.use_mmap = use_mmap
+        self._lock = threading.Lock()
+        self._sections: Optional[Dict[str, Dict[str, dict]]] = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._offsets: Optional[Dict[Tuple[str, str], Tuple[int, int]]] = None
+
+    def _read_sections(self) -> Dict[str, Dict[str, dict]]:
+        """Разбирает весь файл: раздел -> ключ -> запись (порядок строк сохраняется)"""
+        if not os.path.exists(self.path):
+            logger.error(f"Knowledge base file not found: {self.path}")
+            return {}
+        sections: Dict[str, Dict[str, dict]] = {}
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    section, key, record = json.loads(line)
+                    sections.setdefault(section, {})[key] = record
+        return sections
+
+    def _line_offsets(self) -> Optional[Dict[Tuple[str, str], Tuple[int, int]]]:
+        """(раздел, ключ) -> (начало, конец) строки в отображённом файле"""
+        if self._offsets is not None:
+            return self._offsets
+        with self._lock:
+            if self._offsets is not None:
+                return self._offsets
+            try:
+                with open(self.path, 'rb') as f:
+                    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Cannot mmap {self.path}, falling back to full load: {e}")
+                self.use_mmap = False
+                return None
+
+            offsets = {}
+            start, size = 0, len(mapped)
+            while start < size:
+                end = mapped.find(b"\n", start)
+                if end == -1:
+                    end = size
+                match = _LINE_PREFIX.match(mapped, start, end)
+                if match:
+                    key = json.loads(match.group(2).decode('utf-8'))
+                    offsets[(match.group(1).decode('ascii'), key)] = (start, end)
+                start = end + 1
+            self._mmap = mapped
+            self._offsets = offsets
+            return offsets
+
+    def section(self, name: str) -> Dict[str, dict]:
+        """Все записи раздела (файл разбирается один раз на процесс)"""
+        if self._sections is None:
+            with self._lock:
+                if self._sections is None:
+                    self._sections = self._read_sections()
+        return self._sections.get(name, {})
+
+    def record(self, section: str, key: str) -> Optional[dict]:
+        """Одна запись; в режиме mmap - без разбора остального файла"""
+        if self._sections is None and self.use_mmap:
+            offsets = self._line_offsets()
+            if offsets is not None:
+                span = offsets.get((section, key))
+                if span is None:
+                    return None
+                return json.loads(self._mmap[span[0]:span[1]])[2]
+        return self.section(section).get(key)
+
+
+def write_knowledge_file(path: str, sections: Dict[str, Dict[str, dict]],
+                         order: Iterable[str] = ("products", "exercises")):
+    """Записывает разделы в формате KnowledgeStore (одна запись - одна строка)"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for section in order:
+            for key, record in sections.get(section, {}).items():
+                f.write(json.dumps([section, key, record], ensure_ascii=False) + "\n")
+    os.replace(tmp_path, path)
+
+
+# Глобальное хранилище
+knowledge_store = KnowledgeStore()
+
+
+if __name__ == "__main__":
+    # Время импорта knowledge_base и прирост RSS в новом процессе
+    import subprocess
+    import sys
+
+    probe = (
+        "import time, numpy, recipes_loader  # numpy общий с menu_optimizer\n"
+        "def rss():\n"
+        "    for line in open('/proc/self/status'):\n"
+        "        if line.startswith('VmRSS'):\n"
+        "            return int(line.split()[1])\n"
+        "base = rss(); start = time.perf_counter()\n"
+        "from knowledge_base import NutritionDatabase, ExerciseDatabase\n"
+        "imported = time.perf_counter() - start; after_import = rss()\n"
+        "start = time.perf_counter()\n"
+        "{access}\n"
+        "print(f'импорт {{imported * 1e3:5.1f}} мс, +{{after_import - base:5d}} КиБ; '\n"
+        "      f'первое обращение {{(time.perf_counter() - start) * 1e3:5.1f}} мс, итого +{{rss() - base:5d}} КиБ')\n"
+    )
+    accesses = {
+        "одна запись": "NutritionDatabase.get_product('куриная_грудка'); ExerciseDatabase.get_exercise('отжимания')",
+        "все записи": "NutritionDatabase.get_all_products(); ExerciseDatabase.get_all_exercises()",
+    }
+    here = os.path.dirname(os.path.abspath(__file__))
+    for use_mmap in ("0", "1"):
+        for name, access in accesses.items():
+            env = dict(os.environ, KNOWLEDGE_MMAP=use_mmap, PYTHONPATH=here)
+            result = subprocess.run([sys.executable, "-c", probe.format(access=access)],
+                                    env=env, capture_output=True, text=True)
+            print(f"mmap={use_mmap}, {name:11s}: {result.stdout.strip() or result.stderr.strip()}")
@@ -28,27 +28,32 @@ from image_manager import image_manager
 from intelligent_generator import IntelligentMealPlanner, IntelligentWorkoutPlanner, translate_with_ai
 from quality_checker import QualityChecker
 from recipes_loader import recipes_loader
+from menu_optimizer import day_menu_optimizer, target_vector
 from yookassa_handler import YooKassaHandler, store_pending_payment, get_pending_payment, remove_pending_payment
 
 # Импорт новых систем (НОВАЯ СТРУКТУРА: 3015 упражнений по уровням!)
 from workouts_loader_v4 import workouts_loader_v4 as workouts_loader
 from database import db
+from variety_store import variety_store
+from plan_random import plan_rng, NUTRITION_PLAN, WORKOUT_PLAN
+from generation_pool import generation_pool
+from declensions import declension_table
 from food_filter import food_filter
 from calories_calculator import calories_calculator
 from gamification import gamification, statistics
 
-# Загрузка переводов
-def load_translations():
-    if os.path.exists("translations.json"):
-        with open("translations.json", 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return {}
-
-translations = load_translations()
+# Каталог переводов (плоские таблицы, горячая перезагрузка по mtime)
+from translations_catalog import translations_catalog
+from content_snapshot import content_watcher
+from keyboards import keyboards, WORKOUT_DIFFICULTY_TEXTS
 
 def t(key: str, lang: str = "ru") -> str:
     """Получить перевод по ключу"""
-    return translations.get(lang, {}).get(key, translations.get("ru", {}).get(key, key))
+    return translations_catalog.get(key, lang)
+
+def tf(key: str, lang: str = "ru", **kwargs) -> str:
+    """Получить перевод и подставить значения в шаблон"""
+    return translations_catalog.format(key, lang, **kwargs)
 
 # Глобальная переменная для отслеживания языка в логах
 _current_log_lang = "ru"
@@ -412,7 +417,7 @@ def check_and_award_achievements(user_id: int, action_type: str = None):
 
     # Возвращаем сообщение о новом достижении
     if new_achievement:
-        return t("achievement_unlocked", lang).format(achievement=t(new_achievement, lang))
+        return tf("achievement_unlocked", lang, achievement=t(new_achievement, lang))
 
     return None
 
@@ -917,13 +922,19 @@ class AIGenerator:
         return five
 
     @staticmethod
-    def generate_nutrition_plan(profile: Dict, preferences: Dict, lang: str = "ru", user_id: int = None):
-        """Генерирует план питания из базы рецептов (book/)"""
+    def generate_nutrition_plan(profile: Dict, preferences: Dict, lang: str = "ru", user_id: int = None,
+                                attempt: int = 0):
+        """
+        Генерирует план питания из базы рецептов (book/)
 
-        if user_id:
-            user = db.get_user(user_id)
-            if user:
-                lang = user.get("language", "ru")
+        Выполняется в пуле генерации: JSON-базу бота не читает и не пишет
+        (см. make_nutrition_plan). Возвращает (текст плана, путь к HTML,
+        HTML); без HTML-версии - (текст, None, None).
+
+        attempt - номер генерации пользователя (см. _next_attempt): входит в
+        зерно, так что повтор и перегенерация дают другой план.
+        """
+        html_path = html = None
 
         logger.info("Создание плана питания...")
 
@@ -955,26 +966,25 @@ class AIGenerator:
             else:
                 user_ingredients = []
 
-            # Получаем рецепты для каждого приема пищи
-            if user_ingredients:
-                breakfast_list = recipes_loader.search_by_ingredients(goal, "завтрак", user_ingredients)
-                lunch_list = recipes_loader.search_by_ingredients(goal, "обед", user_ingredients)
-                dinner_list = recipes_loader.search_by_ingredients(goal, "ужин", user_ingredients)
+            # Подбираем завтрак, обед и ужин вместе - так, чтобы итог дня был ближе к норме
+            calories_info = calculate_calories(profile)
+            target = target_vector(calories_info['daily_calories'], calories_info['protein_g'],
+                                   calories_info['fats_g'], calories_info['carbs_g'])
+            # Выбор воспроизводим: та же попытка пользователя в тот же день - тот же день меню
+            rng = plan_rng(user_id, f"{NUTRITION_PLAN}:{attempt}")
+            day = day_menu_optimizer.pick_day(goal, target, user_ingredients, rng=rng)
+            if day:
+                breakfast, lunch, dinner = (record.to_dict() for record in day)
             else:
-                # Получаем больше рецептов для разнообразия
-                breakfast_list = recipes_loader.get_recipes(goal, "завтрак", 10)
-                lunch_list = recipes_loader.get_recipes(goal, "обед", 10)
-                dinner_list = recipes_loader.get_recipes(goal, "ужин", 10)
-
-            # Выбираем СЛУЧАЙНЫЕ рецепты для разнообразия
-            breakfast = random.choice(breakfast_list) if breakfast_list else recipes_loader.get_recipe("maintain", "завтрак")
-            lunch = random.choice(lunch_list) if lunch_list else recipes_loader.get_recipe("maintain", "обед")
-            dinner = random.choice(dinner_list) if dinner_list else recipes_loader.get_recipe("maintain", "ужин")
+                # Раздел цели пуст - берём рецепты поддержания
+                breakfast = recipes_loader.get_recipe("maintain", "завтрак", rng)
+                lunch = recipes_loader.get_recipe("maintain", "обед", rng)
+                dinner = recipes_loader.get_recipe("maintain", "ужин", rng)
 
             # Проверяем что рецепты найдены
             if not breakfast or not lunch or not dinner:
                 logger.error(f"Рецепты не найдены: breakfast={breakfast is not None}, lunch={lunch is not None}, dinner={dinner is not None}")
-                return "❌ Ошибка: не удалось найти рецепты. Попробуйте указать другие продукты."
+                return "❌ Ошибка: не удалось найти рецепты. Попробуйте указать другие продукты.", None, None
 
             # Получаем БЖУ напрямую из рецепта
             breakfast_bju = {
@@ -1043,8 +1053,7 @@ class AIGenerator:
             total_fat = breakfast_bju['fat'] + lunch_bju['fat'] + dinner_bju['fat']
             total_carbs = breakfast_bju['carbs'] + lunch_bju['carbs'] + dinner_bju['carbs']
 
-            # Рассчитываем целевые калории
-            calories_info = calculate_calories(profile)
+            # Целевые калории
             target_cals = calories_info['daily_calories']
 
             plan += "═══════════════════════════\n"
@@ -1107,13 +1116,8 @@ class AIGenerator:
                 with open(filepath, 'w', encoding='utf-8') as f:
                     f.write(html)
 
-                # Сохраняем путь к HTML
-                if user_id:
-                    user = db.get_user(user_id)
-                    if user:
-                        user['last_plan_html'] = filepath
-                        user['last_plan_content'] = html  # Сохраняем контент для inline отправки
-                        db.update_user(user_id, user)
+                # Путь и контент (для inline отправки) сохранит обработчик
+                html_path = filepath
 
                 logger.info(f"HTML план сохранен: {filepath}")
 
@@ -1187,31 +1191,29 @@ class AIGenerator:
                 plan = translate_with_ai(plan, lang)
 
             logger.info("План питания создан")
-            return plan
+            return plan, html_path, html
 
         except Exception as e:
             logger.error(f"Ошибка генерации: {e}")
             import traceback
             traceback.print_exc()
-            return "❌ Ошибка создания плана питания. Попробуйте ещё раз."
+            return "❌ Ошибка создания плана питания. Попробуйте ещё раз.", None, None
 
     @staticmethod
-    def generate_workout_plan(profile: Dict, workout_info: Dict, user_id: int = None):
+    def generate_workout_plan(profile: Dict, workout_info: Dict, user_id: int = None, lang: str = "ru",
+                              attempt: int = 0):
         """
         УЛУЧШЕННАЯ генерация плана тренировки
         - Адаптация под место (дома БЕЗ инвентаря)
         - Точный расчет упражнений по времени
         - Учет уровня усталости
         - Прогрессия по уровню подготовки
-        """
 
-        # Определяем язык пользователя
-        lang = "ru"
-        if user_id:
-            user = db.get_user(user_id)
-            if user:
-                lang = user.get("language", "ru")
-                set_log_lang(lang)
+        Выполняется в пуле генерации: язык пользователя передаёт обработчик
+        (см. make_workout_plan), JSON-база бота здесь не читается. attempt -
+        номер генерации, как в generate_nutrition_plan.
+        """
+        set_log_lang(lang)
 
         logger.info("🧠 Генерация УЛУЧШЕННОГО плана тренировки...")
 
@@ -1285,18 +1287,21 @@ class AIGenerator:
                 base_exercises = min(7, base_exercises + 1)
             # При низкой энергии оставляем базовое количество
 
-            # 5. ГЕНЕРИРУЕМ ПЛАН через улучшенный загрузчик
-            workout_plan = workouts_loader.get_enhanced_workout_plan(
-                goal=goal,
-                location=location,
-                workout_type=workout_type,
-                duration_minutes=duration,
-                level=level,
-                muscle_group=muscle_group,
-                equipment_type=equipment_type,
-                energy_level=energy,
-                exercise_count=base_exercises
-            )
+            # 5. ГЕНЕРИРУЕМ ПЛАН через улучшенный загрузчик (с учётом недавних упражнений пользователя)
+            with variety_store.session(user_id) as history:
+                workout_plan = workouts_loader.get_enhanced_workout_plan(
+                    goal=goal,
+                    location=location,
+                    workout_type=workout_type,
+                    duration_minutes=duration,
+                    level=level,
+                    muscle_group=muscle_group,
+                    equipment_type=equipment_type,
+                    energy_level=energy,
+                    exercise_count=base_exercises,
+                    history=history,
+                    rng=plan_rng(user_id, f"{WORKOUT_PLAN}:{attempt}")
+                )
 
             # 6. СОЗДАЕМ ДЕТАЛЬНЫЙ ТЕКСТ ПЛАНА
             exercises = workout_plan['exercises']
@@ -1498,6 +1503,51 @@ class AIGenerator:
         tips = tips_database.get(lang, tips_database['ru'])
         return random.choice(tips)
 
+def _user_language(user_id: Optional[int], default: str = "ru") -> str:
+    user = db.get_user(user_id) if user_id else None
+    return (user.get("language") if user else None) or default
+
+
+def _next_attempt(context: ContextTypes.DEFAULT_TYPE, kind: str) -> int:
+    """
+    Номер очередной генерации плана вида kind у пользователя
+
+    Первая за день генерация (0) воспроизводима; повтор после проверки
+    качества, "Попробовать снова" и перегенерация получают следующие
+    номера и, значит, другие зёрна. Счётчики сбрасываются с новым днём -
+    вместе с днём в зерне.
+    """
+    today = datetime.now().date().isoformat()
+    attempts = context.user_data.get("plan_attempts")
+    if not attempts or attempts.get("day") != today:
+        attempts = context.user_data["plan_attempts"] = {"day": today}
+    attempts[kind] = attempts.get(kind, -1) + 1
+    return attempts[kind]
+
+
+async def make_nutrition_plan(profile: Dict, preferences: Dict, user_id: int = None, lang: str = "ru",
+                              attempt: int = 0) -> str:
+    """
+    План питания в пуле генерации
+
+    Язык читается, а ссылка на HTML-версию (last_plan_html,
+    last_plan_content) сохраняется здесь, в процессе бота: в процессе пула
+    JSON-база - устаревшая копия.
+    """
+    plan, html_path, html = await generation_pool.run(
+        AIGenerator.generate_nutrition_plan, profile, preferences, _user_language(user_id, lang), user_id, attempt
+    )
+    if user_id and html_path and db.get_user(user_id):
+        db.update_user(user_id, {"last_plan_html": html_path, "last_plan_content": html})
+    return plan
+
+
+async def make_workout_plan(profile: Dict, workout_info: Dict, user_id: int = None, attempt: int = 0) -> str:
+    """План тренировки в пуле генерации (язык - из JSON-базы процесса бота)"""
+    return await generation_pool.run(AIGenerator.generate_workout_plan, profile, workout_info,
+                                     user_id, _user_language(user_id), attempt)
+
+
 async def quick_test_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Быстрая команда /p для тестирования (только для админов)"""
     user_id = update.effective_user.id
@@ -1553,7 +1603,7 @@ async def quick_test_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
     try:
         # План питания
-        nutrition_plan = AIGenerator.generate_nutrition_plan(profile, nutrition_prefs)
+        nutrition_plan = await make_nutrition_plan(profile, nutrition_prefs)
         calories = calculate_calories(profile)
 
         # Парсинг калорий из плана
@@ -1564,7 +1614,7 @@ async def quick_test_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
         await update.message.reply_text(t("generating_workout_plan", lang))
 
         # План тренировки
-        workout_plan = AIGenerator.generate_workout_plan(profile, workout_prefs)
+        workout_plan = await make_workout_plan(profile, workout_prefs)
 
         # Парсинг сожженных калорий
         workout_cals = parse_workout_calories(workout_plan)
@@ -1576,58 +1626,16 @@ async def quick_test_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
     except Exception as e:
         logger.error(f"Quick test error: {e}")
-        await update.message.reply_text(t("error_occurred", lang).format(error=str(e)))
+        await update.message.reply_text(tf("error_occurred", lang, error=str(e)))
 
 def get_main_menu(lang="ru"):
-    # Текст для кнопки статистики
-    stats_text = {
-        'ru': '📊 Статистика тренировок',
-        'en': '📊 Workout Statistics',
-        'uz': '📊 Mashg\'ulot statistikasi'
-    }
-
-    # Текст для кнопки чата с нейросетью
-    chat_text = {
-        'ru': '🤖 Говорить с нейросетью',
-        'en': '🤖 Chat with AI',
-        'uz': '🤖 Sun\'iy intellekt bilan suhbat'
-    }
-
-    return InlineKeyboardMarkup([
-        [InlineKeyboardButton(t('profile', lang), callback_data="profile"),
-         InlineKeyboardButton(t('results', lang), callback_data="results")],
-        [InlineKeyboardButton(t('daily_program', lang), callback_data="daily_program")],
-        [InlineKeyboardButton(stats_text.get(lang, stats_text['ru']), callback_data="workout_stats")],
-        [InlineKeyboardButton(chat_text.get(lang, chat_text['ru']), callback_data="ai_chat"),
-         InlineKeyboardButton(t('water_tracking', lang), callback_data="water_tracking")],
-        [InlineKeyboardButton(t('achievements', lang), callback_data="achievements")],
-        [InlineKeyboardButton(t('referrals', lang), callback_data="referrals")],
-        [InlineKeyboardButton(t('instructions', lang), callback_data="instructions"),
-         InlineKeyboardButton(t('contacts', lang), callback_data="contacts")]
-    ])
+    return keyboards.get("main", lang)
 
 def get_admin_menu(lang="ru"):
-    return InlineKeyboardMarkup([
-        [InlineKeyboardButton(t('view_stats', lang), callback_data="admin_stats")],
-        [InlineKeyboardButton(t('broadcast', lang), callback_data="admin_broadcast")],
-        [InlineKeyboardButton(t('user_management', lang), callback_data="admin_users")],
-        [InlineKeyboardButton("⚙️ Settings", callback_data="admin_settings")],
-        [InlineKeyboardButton(t('admin_knowledge_base', lang), callback_data="admin_knowledge")],
-        [InlineKeyboardButton(t('admin_ai_training', lang), callback_data="admin_ai_training")],
-        [InlineKeyboardButton(t('back', lang), callback_data="main_menu")]
-    ])
+    return keyboards.get("admin", lang)
 
 def get_admin_settings_menu():
-    return InlineKeyboardMarkup([
-        [InlineKeyboardButton(t("settings_target_cals", "ru"), callback_data="edit_target_cals")],
-        [InlineKeyboardButton(t("settings_activity", "ru"), callback_data="edit_activity")],
-        [InlineKeyboardButton(t("settings_prices", "ru"), callback_data="edit_prices")],
-        [InlineKeyboardButton(t("settings_prompt_nutrition", "ru"), callback_data="edit_prompt_nutrition")],
-        [InlineKeyboardButton(t("settings_prompt_workout", "ru"), callback_data="edit_prompt_workout")],
-        [InlineKeyboardButton(t("settings_prompt_tips", "ru"), callback_data="edit_prompt_tips")],
-        [InlineKeyboardButton(t("settings_save", "ru"), callback_data="admin_save_settings")],
-        [InlineKeyboardButton(t("btn_back_menu", "ru"), callback_data="admin_menu")]
-    ])
+    return keyboards.get("admin_settings", "ru")
 
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_id = update.effective_user.id
@@ -1651,14 +1659,9 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     # ВСЕГДА спрашиваем язык первым делом, если не выбран
     if not user.get("language"):
-        keyboard = [
-            [InlineKeyboardButton("🇷🇺 Русский", callback_data="lang_ru")],
-            [InlineKeyboardButton("🇬🇧 English", callback_data="lang_en")],
-            [InlineKeyboardButton("🇺🇿 O'zbekcha", callback_data="lang_uz")]
-        ]
         await update.message.reply_text(
             t("choose_language", "ru"),
-            reply_markup=InlineKeyboardMarkup(keyboard)
+            reply_markup=keyboards.get("language", "ru")
         )
         return LANGUAGE_SELECT
     
@@ -1732,12 +1735,10 @@ async def profile_age(update: Update, context: ContextTypes.DEFAULT_TYPE):
             return PROFILE_AGE
         context.user_data["age"] = age
         
-        keyboard = [[InlineKeyboardButton(t("male", lang), callback_data="gender_male")],
-                   [InlineKeyboardButton(t("female", lang), callback_data="gender_female")]]
-        await update.message.reply_text(t("ask_gender", lang), reply_markup=InlineKeyboardMarkup(keyboard))
+        await update.message.reply_text(t("ask_gender", lang), reply_markup=keyboards.get("gender", lang))
         return PROFILE_GENDER
     except ValueError:
-        await update.message.reply_text(t("enter_number_example", lang).format(example="25"))
+        await update.message.reply_text(tf("enter_number_example", lang, example="25"))
         return PROFILE_AGE
 
 async def profile_gender(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -1781,10 +1782,7 @@ async def profile_weight(update: Update, context: ContextTypes.DEFAULT_TYPE):
             return PROFILE_WEIGHT
         context.user_data["weight"] = weight
 
-        keyboard = [[InlineKeyboardButton(t("goal_lose", lang), callback_data="goal_lose_weight")],
-                   [InlineKeyboardButton(t("goal_gain", lang), callback_data="goal_gain_muscle")],
-                   [InlineKeyboardButton(t("goal_maintain", lang), callback_data="goal_maintain")]]
-        await update.message.reply_text(t("ask_goal", lang), reply_markup=InlineKeyboardMarkup(keyboard))
+        await update.message.reply_text(t("ask_goal", lang), reply_markup=keyboards.get("goal", lang))
         return PROFILE_GOAL
     except ValueError:
         await update.message.reply_text(f"{t('number_error', lang)} (70)")
@@ -1801,10 +1799,7 @@ async def profile_goal(update: Update, context: ContextTypes.DEFAULT_TYPE):
     goal_map = {"goal_lose_weight": "lose_weight", "goal_gain_muscle": "gain_muscle", "goal_maintain": "maintain"}
     context.user_data["goal"] = goal_map[query.data]
 
-    keyboard = [[InlineKeyboardButton(t("level_beginner", lang), callback_data="level_beginner")],
-               [InlineKeyboardButton(t("level_intermediate", lang), callback_data="level_intermediate")],
-               [InlineKeyboardButton(t("level_advanced", lang), callback_data="level_advanced")]]
-    await query.edit_message_text(t("ask_level", lang), reply_markup=InlineKeyboardMarkup(keyboard))
+    await query.edit_message_text(t("ask_level", lang), reply_markup=keyboards.get("level", lang))
     return PROFILE_LEVEL
 
 async def profile_level(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -1937,33 +1932,18 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 {t("subscription_status", lang)}: {t("active", lang) if db.has_active_subscription(user_id) else t("inactive", lang)}"""
 
-        keyboard = [[InlineKeyboardButton(t("edit_profile", lang), callback_data="edit_profile")],
-                   [InlineKeyboardButton(t("return_menu", lang), callback_data="main_menu")]]
-        await query.edit_message_text(profile_text, reply_markup=InlineKeyboardMarkup(keyboard))
+        await query.edit_message_text(profile_text, reply_markup=keyboards.get("profile", lang))
     
     elif data == "edit_profile":
         user = db.get_user(user_id)
         lang = user.get("language", "ru")
         
-        keyboard = [
-            [InlineKeyboardButton(t('name', lang), callback_data="edit_prof_name")],
-            [InlineKeyboardButton(t('age', lang), callback_data="edit_prof_age")],
-            [InlineKeyboardButton(t('gender', lang), callback_data="edit_prof_gender")],
-            [InlineKeyboardButton(t('height', lang), callback_data="edit_prof_height")],
-            [InlineKeyboardButton(t('weight', lang), callback_data="edit_prof_weight")],
-            [InlineKeyboardButton(t('goal', lang), callback_data="edit_prof_goal")],
-            [InlineKeyboardButton(t('level', lang), callback_data="edit_prof_level")],
-            [InlineKeyboardButton(t('limitations', lang), callback_data="edit_prof_limitations")],
-            [InlineKeyboardButton(t('language', lang), callback_data="edit_prof_language")],
-            [InlineKeyboardButton(t('back', lang), callback_data="profile")]
-        ]
-        
         edit_text = {
             "ru": "Выберите, что хотите изменить:",
             "en": "Select what you want to change:",
             "uz": "O'zgartirmoqchi bo'lgan narsani tanlang:"
         }
-        await query.edit_message_text(edit_text.get(lang, edit_text["ru"]), reply_markup=InlineKeyboardMarkup(keyboard))
+        await query.edit_message_text(edit_text.get(lang, edit_text["ru"]), reply_markup=keyboards.get("edit_profile", lang))
     
     elif data.startswith("edit_prof_"):
         edit_field = data.replace("edit_prof_", "")
@@ -1987,14 +1967,13 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
             await query.edit_message_text(prompts.get(lang, prompts["ru"]))
             context.user_data["editing_profile"] = "age"
         elif edit_field == "gender":
-            keyboard = [[InlineKeyboardButton(t("male", lang), callback_data="set_prof_gender_male")],
-                       [InlineKeyboardButton(t("female", lang), callback_data="set_prof_gender_female")]]
+            keyboard = keyboards.get("set_gender", lang)
             prompts = {
                 "ru": "⚧ Выберите пол:",
                 "en": "⚧ Select gender:",
                 "uz": "⚧ Jinsni tanlang:"
             }
-            await query.edit_message_text(prompts.get(lang, prompts["ru"]), reply_markup=InlineKeyboardMarkup(keyboard))
+            await query.edit_message_text(prompts.get(lang, prompts["ru"]), reply_markup=keyboard)
         elif edit_field == "height":
             prompts = {
                 "ru": "📏 Введите новый рост в см (от 120 до 250):",
@@ -2012,25 +1991,21 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
             await query.edit_message_text(prompts.get(lang, prompts["ru"]))
             context.user_data["editing_profile"] = "weight"
         elif edit_field == "goal":
-            keyboard = [[InlineKeyboardButton(t("goal_lose", lang), callback_data="set_prof_goal_lose")],
-                       [InlineKeyboardButton(t("goal_gain", lang), callback_data="set_prof_goal_gain")],
-                       [InlineKeyboardButton(t("goal_maintain", lang), callback_data="set_prof_goal_maintain")]]
+            keyboard = keyboards.get("set_goal", lang)
             prompts = {
                 "ru": "🎯 Выберите цель:",
                 "en": "🎯 Select goal:",
                 "uz": "🎯 Maqsadni tanlang:"
             }
-            await query.edit_message_text(prompts.get(lang, prompts["ru"]), reply_markup=InlineKeyboardMarkup(keyboard))
+            await query.edit_message_text(prompts.get(lang, prompts["ru"]), reply_markup=keyboard)
         elif edit_field == "level":
-            keyboard = [[InlineKeyboardButton(t("level_beginner", lang), callback_data="set_prof_level_beginner")],
-                       [InlineKeyboardButton(t("level_intermediate", lang), callback_data="set_prof_level_intermediate")],
-                       [InlineKeyboardButton(t("level_advanced", lang), callback_data="set_prof_level_advanced")]]
+            keyboard = keyboards.get("set_level", lang)
             prompts = {
                 "ru": "💪 Выберите уровень:",
                 "en": "💪 Select level:",
                 "uz": "💪 Darajani tanlang:"
             }
-            await query.edit_message_text(prompts.get(lang, prompts["ru"]), reply_markup=InlineKeyboardMarkup(keyboard))
+            await query.edit_message_text(prompts.get(lang, prompts["ru"]), reply_markup=keyboard)
         elif edit_field == "limitations":
             prompts = {
                 "ru": "🚫 Введите ограничения (или '-' если нет):",
@@ -2040,18 +2015,13 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
             await query.edit_message_text(prompts.get(lang, prompts["ru"]))
             context.user_data["editing_profile"] = "limitations"
         elif edit_field == "language":
-            keyboard = [
-                [InlineKeyboardButton("🇷🇺 Русский", callback_data="set_lang_ru")],
-                [InlineKeyboardButton("🇬🇧 English", callback_data="set_lang_en")],
-                [InlineKeyboardButton("🇺🇿 O'zbekcha", callback_data="set_lang_uz")],
-                [InlineKeyboardButton(t('back', lang), callback_data="edit_profile")]
-            ]
+            keyboard = keyboards.get("set_language", lang)
             prompts = {
                 "ru": "🌐 Выберите язык:",
                 "en": "🌐 Select language:",
                 "uz": "🌐 Tilni tanlang:"
             }
-            await query.edit_message_text(prompts.get(lang, prompts["ru"]), reply_markup=InlineKeyboardMarkup(keyboard))
+            await query.edit_message_text(prompts.get(lang, prompts["ru"]), reply_markup=keyboard)
     
     elif data.startswith("set_lang_"):
         new_lang = data.replace("set_lang_", "")
@@ -2071,7 +2041,7 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await query.answer(success_messages.get(new_lang, success_messages["ru"]))
         await query.edit_message_text(
             success_messages.get(new_lang, success_messages["ru"]), 
-            reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton(t('back', new_lang), callback_data="profile")]])
+            reply_markup=keyboards.get("back_to_profile", new_lang)
         )
     
     elif data.startswith("set_prof_gender_"):
@@ -2091,7 +2061,7 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await query.answer(success_messages.get(lang, success_messages["ru"]))
         await query.edit_message_text(
             success_messages.get(lang, success_messages["ru"]),
-            reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton(t('back', lang), callback_data="profile")]])
+            reply_markup=keyboards.get("back_to_profile", lang)
         )
     
     elif data.startswith("set_prof_goal_"):
@@ -2112,7 +2082,7 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await query.answer(success_messages.get(lang, success_messages["ru"]))
         await query.edit_message_text(
             success_messages.get(lang, success_messages["ru"]),
-            reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton(t("back", lang), callback_data="profile")]])
+            reply_markup=keyboards.get("back_to_profile", lang)
         )
     
     elif data.startswith("set_prof_level_"):
@@ -2133,7 +2103,7 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await query.answer(success_messages.get(lang, success_messages["ru"]))
         await query.edit_message_text(
             success_messages.get(lang, success_messages["ru"]),
-            reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton(t("back", lang), callback_data="profile")]])
+            reply_markup=keyboards.get("back_to_profile", lang)
         )
     
     elif data == "results":
@@ -2193,43 +2163,18 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
 - {t('fats_text', lang)}: {calories['fats_g']} г
 - {t('carbs_text', lang)}: {calories['carbs_g']} г{calories_stats}{progress_text}"""
         
-        keyboard = [[InlineKeyboardButton(t("btn_return_menu", lang), callback_data="main_menu")]]
-        await query.edit_message_text(results_text, reply_markup=InlineKeyboardMarkup(keyboard))
+        keyboard = keyboards.get("return_to_main", lang)
+        await query.edit_message_text(results_text, reply_markup=keyboard)
 
     elif data == "workout_complete":
         # Отметить тренировку как выполненную и собрать обратную связь
         user = db.get_user(user_id)
         lang = user.get("language", "ru") if user else "ru"
 
-        difficulty_texts = {
-            'ru': {
-                'title': "🎯 Как прошла тренировка?\n\nОцените сложность для корректировки следующего плана:",
-                'hard': "😰 Слишком сложно",
-                'perfect': "💪 В самый раз",
-                'easy': "😊 Слишком легко"
-            },
-            'en': {
-                'title': "🎯 How was the workout?\n\nRate the difficulty to adjust your next plan:",
-                'hard': "😰 Too hard",
-                'perfect': "💪 Just right",
-                'easy': "😊 Too easy"
-            },
-            'uz': {
-                'title': "🎯 Mashg'ulot qanday o'tdi?\n\nKeyingi rejani sozlash uchun qiyinlikni baholang:",
-                'hard': "😰 Juda qiyin",
-                'perfect': "💪 Aynan kerakli",
-                'easy': "😊 Juda oson"
-            }
-        }
+        texts = WORKOUT_DIFFICULTY_TEXTS.get(lang, WORKOUT_DIFFICULTY_TEXTS['ru'])
+        keyboard = keyboards.get("workout_difficulty", lang)
 
-        texts = difficulty_texts.get(lang, difficulty_texts['ru'])
-        keyboard = [
-            [InlineKeyboardButton(texts['hard'], callback_data="difficulty_hard")],
-            [InlineKeyboardButton(texts['perfect'], callback_data="difficulty_perfect")],
-            [InlineKeyboardButton(texts['easy'], callback_data="difficulty_easy")]
-        ]
-
-        await query.edit_message_text(texts['title'], reply_markup=InlineKeyboardMarkup(keyboard))
+        await query.edit_message_text(texts['title'], reply_markup=keyboard)
 
     elif data.startswith("difficulty_"):
         # Сохранить обратную связь о тренировке
@@ -2307,8 +2252,8 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 for rec in analysis['recommendations'][:3]:
                     response += f"   ✓ {rec}\n"
 
-        keyboard = [[InlineKeyboardButton(t("btn_return_menu", lang), callback_data="main_menu")]]
-        await query.edit_message_text(response, reply_markup=InlineKeyboardMarkup(keyboard))
+        keyboard = keyboards.get("return_to_main", lang)
+        await query.edit_message_text(response, reply_markup=keyboard)
 
     elif data == "workout_stats":
         # Показать детальную статистику тренировок
@@ -2382,12 +2327,9 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
             for area in analysis['improvement_areas'][:3]:
                 stats_text += f"⚡ {area}\n"
 
-        keyboard = [
-            [InlineKeyboardButton("📈 " + ("Прогноз результатов" if lang == 'ru' else "Results forecast" if lang == 'en' else "Natijalar prognozi"), callback_data="workout_forecast")],
-            [InlineKeyboardButton(t("btn_return_menu", lang), callback_data="main_menu")]
-        ]
+        keyboard = keyboards.get("workout_stats", lang)
 
-        await query.edit_message_text(stats_text, reply_markup=InlineKeyboardMarkup(keyboard))
+        await query.edit_message_text(stats_text, reply_markup=keyboard)
 
     elif data == "workout_forecast":
         # Прогноз будущих результатов
@@ -2426,8 +2368,8 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         for tip in forecast['tips']:
             forecast_text += f"✓ {tip}\n"
 
-        keyboard = [[InlineKeyboardButton(t("back", lang), callback_data="workout_stats")]]
-        await query.edit_message_text(forecast_text, reply_markup=InlineKeyboardMarkup(keyboard))
+        keyboard = keyboards.get("back_to_workout_stats", lang)
+        await query.edit_message_text(forecast_text, reply_markup=keyboard)
 
     elif data == "daily_program":
         user = db.get_user(user_id)
@@ -2435,12 +2377,10 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
         if not db.has_active_subscription(user_id):
             await query.edit_message_text(t("no_subscription", lang),
-                                         reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton(t("payment", lang), callback_data="payment")]]))
+                                         reply_markup=keyboards.get("payment", lang))
         else:
-            keyboard = [[InlineKeyboardButton(t("btn_nutrition_plan", lang), callback_data="nutrition_plan")],
-                       [InlineKeyboardButton(t("btn_workout_plan", lang), callback_data="workout_plan")],
-                       [InlineKeyboardButton(t("btn_back_menu", lang), callback_data="main_menu")]]
-            await query.edit_message_text(t("program_on_day", lang), reply_markup=InlineKeyboardMarkup(keyboard))
+            keyboard = keyboards.get("daily_program", lang)
+            await query.edit_message_text(t("program_on_day", lang), reply_markup=keyboard)
     
     elif data == "nutrition_plan" or data == "regenerate_nutrition":
         user = db.get_user(user_id)
@@ -2477,15 +2417,9 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 del context.user_data["current_plan"]
 
         # Спрашиваем какую группу мышц тренировать
-        keyboard = [
-            [InlineKeyboardButton(t("chest", lang), callback_data="muscle_chest")],
-            [InlineKeyboardButton(t("back_muscles", lang), callback_data="muscle_back")],
-            [InlineKeyboardButton(t("legs", lang), callback_data="muscle_legs")],
-            [InlineKeyboardButton(t("full_body", lang), callback_data="muscle_full_body")],
-            [InlineKeyboardButton(t("cardio", lang), callback_data="muscle_cardio")]
-        ]
+        keyboard = keyboards.get("muscle_groups", lang)
         await query.edit_message_text(t("workout_selection", lang),
-                                     reply_markup=InlineKeyboardMarkup(keyboard))
+                                     reply_markup=keyboard)
         context.user_data["workout_step"] = 0
         context.user_data["workout_data"] = {}
 
@@ -2528,18 +2462,15 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
             next_free_time = now + timedelta(hours=24)
             hours_left = 24
 
-            keyboard = [
-                [InlineKeyboardButton(t("tip_refresh_for_stars", lang), callback_data="buy_tip")],
-                [InlineKeyboardButton(t("back", lang), callback_data="main_menu")]
-            ]
+            keyboard = keyboards.get("tip_refresh", lang)
 
             # Для админа показываем сообщение без ограничений
             if is_admin:
                 tip_message = f"{t('tip_title', lang)}\n\n{tip}\n\n⭐ Безлимитные советы для админа!"
             else:
-                tip_message = f"{t('tip_title', lang)}\n\n{tip}\n\n{t('tip_next_free', lang).format(hours=hours_left)}"
+                tip_message = f"{t('tip_title', lang)}\n\n{tip}\n\n{tf('tip_next_free', lang, hours=hours_left)}"
 
-            await loading_msg.edit_text(tip_message, reply_markup=InlineKeyboardMarkup(keyboard))
+            await loading_msg.edit_text(tip_message, reply_markup=keyboard)
         else:
             # Считаем оставшееся время
             last_tip_time = datetime.fromisoformat(last_tip)
@@ -2548,13 +2479,10 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
             hours_left = int(time_left.total_seconds() / 3600)
             minutes_left = int((time_left.total_seconds() % 3600) / 60)
 
-            keyboard = [
-                [InlineKeyboardButton(t("tip_get_for_stars", lang), callback_data="buy_tip")],
-                [InlineKeyboardButton(t("back", lang), callback_data="main_menu")]
-            ]
+            keyboard = keyboards.get("tip_wait", lang)
 
-            wait_message = f"{t('tip_wait_title', lang)}\n\n{t('tip_wait_message', lang).format(hours=hours_left, minutes=minutes_left)}"
-            await query.edit_message_text(wait_message, reply_markup=InlineKeyboardMarkup(keyboard))
+            wait_message = f"{t('tip_wait_title', lang)}\n\n{tf('tip_wait_message', lang, hours=hours_left, minutes=minutes_left)}"
+            await query.edit_message_text(wait_message, reply_markup=keyboard)
     
     elif data == "buy_tip":
         # Проверяем, есть ли у пользователя последний совет
@@ -2603,15 +2531,9 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         message += f"💧 Выпито сегодня: {consumed} мл\n"
         message += f"📊 Это примерно {round(consumed / 1000, 1)} литров\n"
 
-        keyboard = [
-            [InlineKeyboardButton(t("water_add_250", lang), callback_data="water_add_250")],
-            [InlineKeyboardButton(t("water_add_500", lang), callback_data="water_add_500")],
-            [InlineKeyboardButton(t("water_add_1000", lang), callback_data="water_add_1000")],
-            [InlineKeyboardButton(t("water_reset", lang), callback_data="water_reset")],
-            [InlineKeyboardButton(t("back", lang), callback_data="main_menu")]
-        ]
+        keyboard = keyboards.get("water", lang)
 
-        await query.edit_message_text(message, reply_markup=InlineKeyboardMarkup(keyboard))
+        await query.edit_message_text(message, reply_markup=keyboard)
 
     elif data.startswith("water_add_"):
         user = db.get_user(user_id)
@@ -2637,15 +2559,9 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         message += f"💧 Выпито сегодня: {consumed} мл\n"
         message += f"📊 Это примерно {round(consumed / 1000, 1)} литров\n"
 
-        keyboard = [
-            [InlineKeyboardButton(t("water_add_250", lang), callback_data="water_add_250")],
-            [InlineKeyboardButton(t("water_add_500", lang), callback_data="water_add_500")],
-            [InlineKeyboardButton(t("water_add_1000", lang), callback_data="water_add_1000")],
-            [InlineKeyboardButton(t("water_reset", lang), callback_data="water_reset")],
-            [InlineKeyboardButton(t("back", lang), callback_data="main_menu")]
-        ]
+        keyboard = keyboards.get("water", lang)
 
-        await query.edit_message_text(message, reply_markup=InlineKeyboardMarkup(keyboard))
+        await query.edit_message_text(message, reply_markup=keyboard)
 
     elif data == "water_reset":
         user = db.get_user(user_id)
@@ -2663,15 +2579,9 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         message += f"💧 Выпито сегодня: 0 мл\n"
         message += f"📊 Это примерно 0.0 литров\n"
 
-        keyboard = [
-            [InlineKeyboardButton(t("water_add_250", lang), callback_data="water_add_250")],
-            [InlineKeyboardButton(t("water_add_500", lang), callback_data="water_add_500")],
-            [InlineKeyboardButton(t("water_add_1000", lang), callback_data="water_add_1000")],
-            [InlineKeyboardButton(t("water_reset", lang), callback_data="water_reset")],
-            [InlineKeyboardButton(t("back", lang), callback_data="main_menu")]
-        ]
+        keyboard = keyboards.get("water", lang)
 
-        await query.edit_message_text(message, reply_markup=InlineKeyboardMarkup(keyboard))
+        await query.edit_message_text(message, reply_markup=keyboard)
 
     elif data == "ai_chat":
         user = db.get_user(user_id)
@@ -2689,8 +2599,8 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
             "uz": "🤖 Sun'iy intellekt bilan suhbat rejimi faollashtirildi!\n\nEndi siz menga fitness, ovqatlanish, salomatlik haqida yoki shunchaki suhbatlashish uchun har qanday savol berishingiz mumkin!\n\n💬 Savolingizni yoki xabaringizni yozing..."
         }
 
-        keyboard = [[InlineKeyboardButton("🚪 " + t("back", lang), callback_data="end_ai_chat")]]
-        await query.edit_message_text(chat_welcome.get(lang, chat_welcome["ru"]), reply_markup=InlineKeyboardMarkup(keyboard))
+        keyboard = keyboards.get("end_ai_chat", lang)
+        await query.edit_message_text(chat_welcome.get(lang, chat_welcome["ru"]), reply_markup=keyboard)
 
     elif data == "end_ai_chat":
         user = db.get_user(user_id)
@@ -2710,15 +2620,9 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     elif data == "profile_edit":
 
-        keyboard = [
-            [InlineKeyboardButton(t("water_add_250", lang), callback_data="water_add_250")],
-            [InlineKeyboardButton(t("water_add_500", lang), callback_data="water_add_500")],
-            [InlineKeyboardButton(t("water_add_1000", lang), callback_data="water_add_1000")],
-            [InlineKeyboardButton(t("water_reset", lang), callback_data="water_reset")],
-            [InlineKeyboardButton(t("back", lang), callback_data="main_menu")]
-        ]
+        keyboard = keyboards.get("water", lang)
 
-        await query.edit_message_text(message, reply_markup=InlineKeyboardMarkup(keyboard))
+        await query.edit_message_text(message, reply_markup=keyboard)
 
     elif data == "achievements":
         user = db.get_user(user_id)
@@ -2758,8 +2662,8 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         else:
             message += t("no_achievements", lang)
 
-        keyboard = [[InlineKeyboardButton(t("back", lang), callback_data="main_menu")]]
-        await query.edit_message_text(message, reply_markup=InlineKeyboardMarkup(keyboard))
+        keyboard = keyboards.get("back_to_main", lang)
+        await query.edit_message_text(message, reply_markup=keyboard)
 
     elif data == "payment":
         user = db.get_user(user_id)
@@ -3070,8 +2974,8 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
 {t('friends_paid', lang)} {paid_referrals}
 {t('bonus_days', lang)} {user.get('bonus_days', 0)}"""
 
-        keyboard = [[InlineKeyboardButton(t("back", lang), callback_data="main_menu")]]
-        await query.edit_message_text(ref_text, reply_markup=InlineKeyboardMarkup(keyboard))
+        keyboard = keyboards.get("back_to_main", lang)
+        await query.edit_message_text(ref_text, reply_markup=keyboard)
     
     elif data == "instructions":
         user = db.get_user(user_id)
@@ -3092,15 +2996,15 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 {t('instructions_subscription', lang)}"""
 
-        keyboard = [[InlineKeyboardButton(t("back", lang), callback_data="main_menu")]]
-        await query.edit_message_text(instr_text, reply_markup=InlineKeyboardMarkup(keyboard))
+        keyboard = keyboards.get("back_to_main", lang)
+        await query.edit_message_text(instr_text, reply_markup=keyboard)
     
     elif data == "contacts":
         user = db.get_user(user_id)
         lang = user.get("language", "ru") if user else "ru"
         contacts_text = f"{t('contacts_title', lang)}\n\n{t('contacts_channel', lang)}\nhttps://t.me/ProSportRBK\n\n{t('contacts_support', lang)}"
         await query.edit_message_text(contacts_text,
-                                     reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton(t("back", lang), callback_data="main_menu")]]))
+                                     reply_markup=keyboards.get("back_to_main", lang))
     
     elif data == "admin_menu":
         if user_id not in ADMIN_IDS:
@@ -3269,7 +3173,7 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
             knowledge = []
 
         count = len(knowledge)
-        kb_text = t("knowledge_list_title", "ru").format(count=count) + "\n\n"
+        kb_text = tf("knowledge_list_title", "ru", count=count) + "\n\n"
         if knowledge:
             for i, item in enumerate(knowledge[:10], 1):  # Показываем первые 10
                 kb_text += f"{i}. [{item.get('category', 'общее')}] {item.get('text', '')[:50]}...\n"
@@ -3301,7 +3205,7 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
             training_data = []
 
         count = len(training_data)
-        training_text = t("training_data_title", "ru").format(count=count)
+        training_text = tf("training_data_title", "ru", count=count)
 
         keyboard = [
             [InlineKeyboardButton(t("train_on_examples", "ru"), callback_data="add_training")],
@@ -3356,12 +3260,8 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         user = db.get_user(user_id)
         lang = user.get("language", "ru") if user else "ru"
 
-        keyboard = [
-            [InlineKeyboardButton(t("cook_full", lang), callback_data="cook_full")],
-            [InlineKeyboardButton(t("cook_min", lang), callback_data="cook_min")],
-            [InlineKeyboardButton(t("cook_none", lang), callback_data="cook_none")]
-        ]
-        await query.edit_message_text(t("nutrition_q6", lang), reply_markup=InlineKeyboardMarkup(keyboard))
+        keyboard = keyboards.get("cooking", lang)
+        await query.edit_message_text(t("nutrition_q6", lang), reply_markup=keyboard)
     
     elif data.startswith("cook_"):
         time_map = {
@@ -3384,7 +3284,8 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         max_attempts = 10
         for attempt in range(max_attempts):
             try:
-                nutrition_plan = AIGenerator.generate_nutrition_plan(profile, context.user_data["nutrition_data"], user_id=user_id)
+                nutrition_plan = await make_nutrition_plan(profile, context.user_data["nutrition_data"], user_id,
+                                                           attempt=_next_attempt(context, NUTRITION_PLAN))
                 
                 # КРИТИЧЕСКАЯ ПРОВЕРКА КАЧЕСТВА
                 validation = validate_ai_response(nutrition_plan, "nutrition")
@@ -3435,10 +3336,7 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 # Применяем финальную очистку
                 safe_plan = final_clean_text(nutrition_plan)
 
-                keyboard = [
-                    [InlineKeyboardButton(t("regenerate_button", lang), callback_data="regenerate_nutrition")],
-                    [InlineKeyboardButton(t("back_button", lang), callback_data="main_menu")]
-                ]
+                keyboard = keyboards.get("nutrition_ready", lang)
                 
                 # Отправляем план
                 if len(safe_plan) > 3500:
@@ -3447,16 +3345,16 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
                     for part in parts[1:]:
                         await query.message.reply_text(part)
                     if achievement_msg:
-                        await query.message.reply_text(achievement_msg, reply_markup=InlineKeyboardMarkup(keyboard))
+                        await query.message.reply_text(achievement_msg, reply_markup=keyboard)
                     else:
-                        await query.message.reply_text("✅ План готов!", reply_markup=InlineKeyboardMarkup(keyboard))
+                        await query.message.reply_text("✅ План готов!", reply_markup=keyboard)
                 else:
                     final_message = safe_plan
                     if achievement_msg:
                         final_message += f"\n\n{achievement_msg}"
                     await loading_msg.edit_text(
                         final_message,
-                        reply_markup=InlineKeyboardMarkup(keyboard)
+                        reply_markup=keyboard
                     )
                 
                 # Удаляем временные данные
@@ -3469,7 +3367,8 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 
             except Exception as e:
                 logger.error(f"Ошибка генерации плана питания (попытка {attempt + 1}): {e}")
-                if attempt < max_attempts - 1:
+                # По таймауту не повторяем - пул и так перегружен
+                if attempt < max_attempts - 1 and not isinstance(e, asyncio.TimeoutError):
                     continue
                 else:
                     await loading_msg.edit_text(
@@ -3488,14 +3387,9 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         time_map = {"time_30": "30 минут", "time_60": "45-60 минут", "time_90": "1.5 часа"}
         context.user_data["workout_data"]["duration"] = time_map.get(data, "45-60 минут")
 
-        keyboard = [
-            [InlineKeyboardButton(t("energy_high", lang), callback_data="energy_high")],
-            [InlineKeyboardButton(t("energy_medium", lang), callback_data="energy_medium")],
-            [InlineKeyboardButton(t("energy_low", lang), callback_data="energy_low")],
-            [InlineKeyboardButton(t("energy_recovery", lang), callback_data="energy_recovery")]
-        ]
+        keyboard = keyboards.get("energy", lang)
         await query.edit_message_text(t("workout_q4", lang),
-                                     reply_markup=InlineKeyboardMarkup(keyboard))
+                                     reply_markup=keyboard)
     
     elif data.startswith("energy_"):
         energy_map = {
@@ -3520,7 +3414,8 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         max_attempts = 10
         for attempt in range(max_attempts):
             try:
-                workout_plan = AIGenerator.generate_workout_plan(profile, context.user_data["workout_data"], user_id=user_id)
+                workout_plan = await make_workout_plan(profile, context.user_data["workout_data"], user_id,
+                                                       attempt=_next_attempt(context, WORKOUT_PLAN))
                 
                 # КРИТИЧЕСКАЯ ПРОВЕРКА КАЧЕСТВА
                 validation = validate_ai_response(workout_plan, "workout")
@@ -3666,7 +3561,8 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 
             except Exception as e:
                 logger.error(f"Ошибка генерации тренировки (попытка {attempt + 1}): {e}")
-                if attempt < max_attempts - 1:
+                # По таймауту не повторяем - пул и так перегружен
+                if attempt < max_attempts - 1 and not isinstance(e, asyncio.TimeoutError):
                     continue
                 else:
                     await loading_msg.edit_text(
@@ -3700,15 +3596,9 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
             context.user_data["nutrition_data"] = {}
         else:
             # Повторно запрашиваем план тренировки С НУЛЯ
-            keyboard = [
-                [InlineKeyboardButton(t("chest", lang), callback_data="muscle_chest")],
-                [InlineKeyboardButton(t("back_muscles", lang), callback_data="muscle_back")],
-                [InlineKeyboardButton(t("legs", lang), callback_data="muscle_legs")],
-                [InlineKeyboardButton(t("full_body", lang), callback_data="muscle_full_body")],
-                [InlineKeyboardButton(t("cardio", lang), callback_data="muscle_cardio")]
-            ]
+            keyboard = keyboards.get("muscle_groups", lang)
             await query.edit_message_text(t("workout_selection", lang),
-                                         reply_markup=InlineKeyboardMarkup(keyboard))
+                                         reply_markup=keyboard)
             context.user_data["workout_step"] = 0
             context.user_data["workout_data"] = {}
     
@@ -3897,7 +3787,7 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 profile["name"] = text
                 db.update_user(user_id, {"profile": profile})
                 await update.message.reply_text(t("name_updated", lang),
-                                               reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton(t("to_profile", lang), callback_data="profile")]]))
+                                               reply_markup=keyboards.get("to_profile", lang))
             elif field == "age":
                 age = int(text)
                 if age < 16 or age > 100:
@@ -3906,7 +3796,7 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 profile["age"] = age
                 db.update_user(user_id, {"profile": profile})
                 await update.message.reply_text(t("age_updated", lang),
-                                               reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton(t("to_profile", lang), callback_data="profile")]]))
+                                               reply_markup=keyboards.get("to_profile", lang))
             elif field == "height":
                 height = int(text)
                 if height < 120 or height > 250:
@@ -3915,7 +3805,7 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 profile["height"] = height
                 db.update_user(user_id, {"profile": profile})
                 await update.message.reply_text(t("height_updated", lang),
-                                               reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton(t("to_profile", lang), callback_data="profile")]]))
+                                               reply_markup=keyboards.get("to_profile", lang))
             elif field == "weight":
                 weight = float(text)
                 if weight < 35 or weight > 250:
@@ -3924,13 +3814,13 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 profile["weight"] = weight
                 db.update_user(user_id, {"profile": profile})
                 await update.message.reply_text(t("weight_updated", lang),
-                                               reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton(t("to_profile", lang), callback_data="profile")]]))
+                                               reply_markup=keyboards.get("to_profile", lang))
             elif field == "limitations":
                 limitations = text if text != "-" else t("none_text", lang)
                 profile["limitations"] = limitations
                 db.update_user(user_id, {"profile": profile})
                 await update.message.reply_text(t("limitations_updated", lang),
-                                               reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton(t("to_profile", lang), callback_data="profile")]]))
+                                               reply_markup=keyboards.get("to_profile", lang))
 
             del context.user_data["editing_profile"]
         except ValueError:
@@ -4033,7 +3923,8 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
             loading_msg = await update.message.reply_text(t("generating_plan", lang))
             await animated_loading(loading_msg, lang)
 
-            plan = AIGenerator.generate_nutrition_plan(profile, nutrition_data, lang, user_id)
+            plan = await make_nutrition_plan(profile, nutrition_data, user_id, lang,
+                                             attempt=_next_attempt(context, NUTRITION_PLAN))
 
             safe_plan = final_clean_text(plan)
 
@@ -4090,13 +3981,9 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
         if step == 1:
             context.user_data["workout_data"]["location_equipment"] = text
-            keyboard = [
-                [InlineKeyboardButton(t("time_30", lang), callback_data="time_30")],
-                [InlineKeyboardButton(t("time_60", lang), callback_data="time_60")],
-                [InlineKeyboardButton(t("time_90", lang), callback_data="time_90")]
-            ]
+            keyboard = keyboards.get("workout_time", lang)
             await update.message.reply_text(t("workout_q3", lang),
-                                          reply_markup=InlineKeyboardMarkup(keyboard))
+                                          reply_markup=keyboard)
             context.user_data["workout_step"] = 2
         return
     
@@ -4272,6 +4159,9 @@ async def successful_payment_callback(update: Update, context: ContextTypes.DEFA
             reply_markup=get_main_menu())
 
 def main():
+    # Процессы генерации планов - до запуска фоновых потоков (fork)
+    generation_pool.start()
+
     # Запускаем веб-сервер для HTML-планов
     try:
         from web_server import web_server
@@ -4282,6 +4172,15 @@ def main():
     except Exception as e:
         logger.error(f"❌ Ошибка запуска веб-сервера: {e}")
 
+    # Следим за изменениями translations.json без перезапуска бота
+    translations_catalog.start_watcher()
+
+    # Горячая перезагрузка рецептов и упражнений из book/
+    content_watcher.watch(recipes_loader.reload_if_changed)
+    content_watcher.watch(workouts_loader.reload_if_changed)
+    content_watcher.watch(declension_table.reload_if_changed)  # правки склонений от администратора
+    content_watcher.start()
+
     application = Application.builder().token(BOT_TOKEN).build()
 
     profile_handler = ConversationHandler(
@@ -4313,6 +4212,7 @@ def main():
     
     logger.info("🚀 Бот запущен!")
     application.run_polling(allowed_updates=Update.ALL_TYPES)
+    generation_pool.shutdown()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
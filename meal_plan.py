@@ -0,0 +1,109 @@
+"""
+СТРУКТУРИРОВАННЫЙ ПЛАН ПИТАНИЯ
+Приёмы пищи, порции и готовые секции текста; хранится в БД для точечной замены блюд
+"""
+
+import json
+import logging
+from typing import List, Mapping, Optional
+
+from database import db, Database
+
+logger = logging.getLogger(__name__)
+
+
+def _plain(value):
+    """Записи базы знаний внутри блюд (MappingProxyType) сохраняются как обычные словари"""
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class MealPlan:
+    """
+    План питания на день
+
+    Каждое блюдо хранится с исходной пищевой ценностью (порция 1.0),
+    порции - отдельным списком. Текст собран из секций: заголовок,
+    по секции на приём пищи и итог. При замене одного блюда заново
+    отрисовываются только секции, у которых изменились блюдо или порция,
+    и итог.
+    """
+
+    VERSION = 1
+
+    def __init__(self, goal: str, language: str, metabolism: dict, preferences: dict,
+                 meals: List[dict], portions: List[float] = None,
+                 header: str = "", sections: List[str] = None,
+                 summary: str = "", goal_advice: str = ""):
+        self.goal = goal
+        self.language = language
+        self.metabolism = metabolism
+        self.preferences = preferences
+        self.meals = meals
+        self.portions = portions or [1.0] * len(meals)
+        self.header = header
+        self.sections = sections or [""] * len(meals)
+        self.summary = summary
+        self.goal_advice = goal_advice  # выбирается один раз, чтобы итог не менялся при заменах
+
+    @property
+    def text(self) -> str:
+        return "\n".join([self.header] + self.sections + [self.summary])
+
+    def copy(self) -> "MealPlan":
+        """Копия со своими списками блюд, порций и секций (сами блюда общие)"""
+        return MealPlan(self.goal, self.language, self.metabolism, self.preferences,
+                        list(self.meals), list(self.portions), self.header, list(self.sections),
+                        self.summary, self.goal_advice)
+
+    def to_dict(self) -> dict:
+        return {
+            "version": self.VERSION,
+            "goal": self.goal,
+            "language": self.language,
+            "metabolism": self.metabolism,
+            "preferences": self.preferences,
+            "meals": self.meals,
+            "portions": self.portions,
+            "header": self.header,
+            "sections": self.sections,
+            "summary": self.summary,
+            "goal_advice": self.goal_advice,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Optional["MealPlan"]:
+        if data.get("version") != cls.VERSION:
+            return None
+        return cls(data["goal"], data["language"], data["metabolism"], data["preferences"],
+                   data["meals"], data["portions"], data["header"], data["sections"],
+                   data["summary"], data["goal_advice"])
+
+
+class MealPlanStore:
+    """Последний план питания каждого пользователя (таблица meal_plans)"""
+
+    def __init__(self, database: Database):
+        self.db = database
+
+    def save(self, user_id: int, plan: MealPlan) -> bool:
+        try:
+            return self.db.save_meal_plan(user_id, json.dumps(plan.to_dict(), ensure_ascii=False, default=_plain))
+        except (TypeError, ValueError) as e:
+            logger.error(f"Cannot serialize meal plan for {user_id}: {e}")
+            return False
+
+    def load(self, user_id: int) -> Optional[MealPlan]:
+        plan_data = self.db.get_meal_plan(user_id)
+        if not plan_data:
+            return None
+        try:
+            return MealPlan.from_dict(json.loads(plan_data))
+        except (ValueError, KeyError) as e:
+            logger.warning(f"Stored meal plan for {user_id} is unreadable: {e}")
+            return None
+
+
+# Глобальное хранилище
+meal_plan_store = MealPlanStore(db)
@@ -0,0 +1,405 @@
+"""
+ПОДБОР ДНЕВНОГО МЕНЮ
+Векторная оценка сочетаний завтрак × обед × ужин по целевым калориям и БЖУ
+и планирование нескольких дней без повторов
+"""
+
+import random
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from recipes_loader import recipes_loader, RecipesLoader, RecipeRecord
+from text_matcher import get_matcher
+
+logger = logging.getLogger(__name__)
+
+MEALS = ("breakfast", "lunch", "dinner")
+
+# Столбцы матрицы: ккал, белки, жиры, углеводы
+NUTRIENTS = ("calories", "protein", "fats", "carbs")
+
+# Вес относительного отклонения каждого столбца в оценке дня
+NUTRIENT_WEIGHTS = np.array([1.0, 0.5, 0.25, 0.25])
+
+# Ориентировочная доля дневной нормы (только для предварительного отбора)
+MEAL_SHARES = {"breakfast": 0.3, "lunch": 0.4, "dinner": 0.3}
+
+# Штрафы плана на несколько дней, в единицах оценки дня
+# (0.002 - примерно как промах по калориям на 4,5%)
+SHARED_ALLOWED = 2            # сколько общих ингредиентов допустимо у блюд одного дня
+SHARED_DAY_PENALTY = 0.002    # за каждый общий ингредиент сверх допустимого
+NEIGHBOUR_PENALTY = 0.0005    # за каждый общий ингредиент одного приёма пищи в соседние дни
+
+
+def nutrient_matrix(records: Sequence[RecipeRecord]) -> np.ndarray:
+    """Матрица (n, 4) калорий и БЖУ рецептов"""
+    return np.array(
+        [(r.calories, r.protein, r.fats, r.carbs) for r in records],
+        dtype=np.float64
+    ).reshape(-1, 4)
+
+
+def target_vector(calories: float, protein: float, fats: float, carbs: float) -> np.ndarray:
+    # Нулевая или отрицательная цель (например, углеводы у крайних профилей) ломает нормировку
+    return np.maximum(np.array([calories, protein, fats, carbs], dtype=np.float64), 1.0)
+
+
+def prune_candidates(matrix: np.ndarray, ids: np.ndarray, share_target: np.ndarray, keep: int) -> np.ndarray:
+    """Оставляет keep рецептов, ближайших к своей доле дневной нормы"""
+    if len(ids) <= keep:
+        return ids
+    errors = ((((matrix[ids] - share_target) / share_target) ** 2) * NUTRIENT_WEIGHTS).sum(axis=1)
+    return ids[np.argpartition(errors, keep)[:keep]]
+
+
+def score_combinations(breakfast: np.ndarray, lunch: np.ndarray, dinner: np.ndarray,
+                       target: np.ndarray) -> np.ndarray:
+    """
+    Оценка всех сочетаний за один векторный проход
+
+    Возвращает массив (nb, nl, nd): взвешенная сумма квадратов
+    относительных отклонений итога дня от цели (меньше - лучше).
+    """
+    # Веса и нормировка переносятся на короткие векторы, цель - на ужин:
+    # на каждый столбец остаётся одно сложение, квадрат и накопление по всему кубу
+    scale = np.sqrt(NUTRIENT_WEIGHTS) / target
+    b = breakfast * scale
+    l = lunch * scale
+    d = dinner * scale - np.sqrt(NUTRIENT_WEIGHTS)
+
+    scores = np.zeros((len(breakfast), len(lunch), len(dinner)))
+    for j in range(4):
+        total = (b[:, None, j] + l[None, :, j])[:, :, None] + d[None, None, :, j]
+        np.square(total, out=total)
+        scores += total
+    return scores
+
+
+def best_combinations(candidates: Dict[str, Tuple[np.ndarray, np.ndarray]], target: np.ndarray,
+                      top: int = 5, prune: int = 64) -> List[Tuple[Tuple[int, int, int], float]]:
+    """
+    Лучшие разнообразные тройки рецептов
+
+    Args:
+        candidates: приём пищи -> (номера рецептов, матрица БЖУ всего раздела)
+        target: Дневная цель (ккал, белки, жиры, углеводы)
+        top: Сколько троек вернуть; тройки не делят между собой рецепты
+        prune: Сколько кандидатов на приём пищи оценивать полным перебором
+
+    Returns:
+        [((завтрак, обед, ужин), оценка)] по возрастанию оценки
+    """
+    pruned = []
+    for meal in MEALS:
+        ids, matrix = candidates[meal]
+        ids = prune_candidates(matrix, ids, target * MEAL_SHARES[meal], prune)
+        pruned.append((ids, matrix[ids]))
+
+    (b_ids, b), (l_ids, l), (d_ids, d) = pruned
+    scores = score_combinations(b, l, d, target).ravel()
+
+    # Берём с запасом, чтобы после отсева повторов осталось top троек
+    pool = min(len(scores), top * 50)
+    best = np.argpartition(scores, pool - 1)[:pool] if pool < len(scores) else np.arange(len(scores))
+    best = best[np.argsort(scores[best])]
+
+    chosen = []
+    used = [set(), set(), set()]
+    for flat in best:
+        ib, il, idn = np.unravel_index(flat, (len(b_ids), len(l_ids), len(d_ids)))
+        triple = (int(b_ids[ib]), int(l_ids[il]), int(d_ids[idn]))
+        if any(triple[k] in used[k] for k in range(3)):
+            continue
+        for k in range(3):
+            used[k].add(triple[k])
+        chosen.append((triple, float(scores[flat])))
+        if len(chosen) >= top:
+            break
+    return chosen
+
+
+def incidence_matrix(records: Sequence[RecipeRecord], vocab: Dict[str, int]) -> np.ndarray:
+    """Матрица (n, словарь): 1, если ингредиент есть в рецепте"""
+    matrix = np.zeros((len(records), len(vocab)), dtype=np.float32)
+    for row, record in enumerate(records):
+        matrix[row, [vocab[name] for name in set(record.ingredient_names)]] = 1.0
+    return matrix
+
+
+def optimize_days(nutrients: Sequence[np.ndarray], incidence: Sequence[np.ndarray], target: np.ndarray,
+                  days: int, kicks: int = 5, max_sweeps: int = 20,
+                  rng: Optional[np.random.Generator] = None) -> List[List[int]]:
+    """
+    Локальный поиск плана на несколько дней
+
+    Args:
+        nutrients: Матрицы БЖУ кандидатов завтрака, обеда и ужина
+        incidence: Матрицы ингредиентов тех же кандидатов
+        target: Дневная цель
+        days: Число дней
+        kicks: Число случайных встрясок после сходимости
+        max_sweeps: Ограничение проходов спуска
+
+    Returns:
+        По дню [завтрак, обед, ужин] - номера строк в матрицах кандидатов
+
+    Оценка недели - сумма оценок дней (отклонение от цели плюс штраф за общие
+    ингредиенты блюд одного дня) и штраф за общие ингредиенты одного приёма
+    пищи в соседние дни. Все дневные оценки считаются заранее одним тензором,
+    поэтому спуск по координатам - это argmin по строке тензора. Рецепт
+    не повторяется за неделю, если кандидатов на этот приём пищи хватает.
+    """
+    rng = rng or np.random.default_rng()
+    b, l, d = nutrients
+    ib, il, idn = incidence
+
+    def excess(overlap):
+        return SHARED_DAY_PENALTY * np.maximum(overlap - SHARED_ALLOWED, 0)
+
+    day_cost = score_combinations(b, l, d, target)
+    day_cost += excess(ib @ il.T)[:, :, None]
+    day_cost += excess(ib @ idn.T)[:, None, :]
+    day_cost += excess(il @ idn.T)[None, :, :]
+
+    neighbour = [NEIGHBOUR_PENALTY * (m @ m.T) for m in incidence]
+    unique = [len(m) >= days for m in nutrients]
+
+    def slot_costs(plan, t, k):
+        day = plan[t]
+        if k == 0:
+            costs = day_cost[:, day[1], day[2]].copy()
+        elif k == 1:
+            costs = day_cost[day[0], :, day[2]].copy()
+        else:
+            costs = day_cost[day[0], day[1], :].copy()
+        if t > 0:
+            costs += neighbour[k][:, plan[t - 1][k]]
+        if t < days - 1:
+            costs += neighbour[k][:, plan[t + 1][k]]
+        if unique[k]:
+            costs[[plan[s][k] for s in range(days) if s != t]] = np.inf
+        return costs
+
+    def week_cost(plan):
+        total = sum(day_cost[tuple(day)] for day in plan)
+        for t in range(days - 1):
+            total += sum(neighbour[k][plan[t][k], plan[t + 1][k]] for k in range(3))
+        return float(total)
+
+    def descend(plan):
+        for _ in range(max_sweeps):
+            improved = False
+            for t in range(days):
+                for k in range(3):
+                    costs = slot_costs(plan, t, k)
+                    best = int(np.argmin(costs))
+                    if costs[best] < costs[plan[t][k]] - 1e-12:
+                        plan[t][k] = best
+                        improved = True
+            if not improved:
+                break
+        return plan
+
+    # Начальный план: лучшие дни, не делящие рецепты (как в best_combinations).
+    # Обычно хватает небольшого запаса лучших сочетаний, полная сортировка - запасной путь
+    flat_costs = day_cost.ravel()
+    pool = min(flat_costs.size, days * 200)
+    head = np.argpartition(flat_costs, pool - 1)[:pool] if pool < flat_costs.size else np.arange(pool)
+    used = [set(), set(), set()]
+    plan = []
+    for order in (head[np.argsort(flat_costs[head])], lambda: np.argsort(flat_costs)):
+        for flat in (order() if callable(order) else order):
+            triple = [int(x) for x in np.unravel_index(flat, day_cost.shape)]
+            if any(unique[k] and triple[k] in used[k] for k in range(3)):
+                continue
+            for k in range(3):
+                used[k].add(triple[k])
+            plan.append(triple)
+            if len(plan) >= days:
+                break
+        if len(plan) >= days:
+            break
+
+    best_plan = descend(plan)
+    best_cost = week_cost(best_plan)
+    for _ in range(kicks):
+        # Встряска: случайный рецепт в случайном слоте, затем снова спуск
+        plan = [list(day) for day in best_plan]
+        t, k = int(rng.integers(days)), int(rng.integers(3))
+        free = np.flatnonzero(np.isfinite(slot_costs(plan, t, k)))
+        plan[t][k] = int(rng.choice(free))
+        plan = descend(plan)
+        cost = week_cost(plan)
+        if cost < best_cost:
+            best_plan, best_cost = plan, cost
+    return best_plan
+
+
+class DayMenuOptimizer:
+    """
+    Подбор завтрака, обеда и ужина под дневную норму
+
+    Матрицы БЖУ строятся один раз на версию содержимого загрузчика рецептов.
+    """
+
+    def __init__(self, loader: RecipesLoader):
+        self.loader = loader
+        # (содержимое загрузчика, матрицы разделов) - заменяется целиком
+        self._state = (None, {})
+
+    def _matrices(self, content) -> Dict[Tuple[str, str], np.ndarray]:
+        cached_content, matrices = self._state
+        if cached_content is not content:
+            matrices = {
+                (goal, meal_type): nutrient_matrix(records)
+                for goal, meals in content.records.items()
+                for meal_type, records in meals.items()
+            }
+            self._state = (content, matrices)
+        return matrices
+
+    def _candidates(self, goal: str, ingredients: List[str], excluded: List[str], content):
+        """
+        Кандидаты по каждому приёму пищи: {приём: (номера рецептов, матрица БЖУ)}
+        и {приём: записи раздела}; None, если какой-то раздел пуст
+
+        Если указаны продукты пользователя, берутся рецепты с ними (а при
+        отсутствии таких - весь раздел).
+        """
+        matrices = self._matrices(content)
+        excluded_matcher = get_matcher(excluded or [])
+
+        candidates = {}
+        records = {}
+        for meal in MEALS:
+            key = self.loader._resolve_keys(goal, meal)
+            matrix = matrices.get(key)
+            if matrix is None or not len(matrix):
+                return None
+            meal_records = content.records[key[0]][key[1]]
+            ids = None
+            if ingredients:
+                scores = self.loader.ingredient_scores(goal, meal, ingredients, content)
+                if scores:
+                    ids = np.fromiter(scores, dtype=np.intp, count=len(scores))
+            if ids is None:
+                ids = np.arange(len(matrix))
+            if excluded_matcher:
+                ids = ids[[not excluded_matcher.search(meal_records[i].search_text) for i in ids]]
+                if not len(ids):
+                    return None
+            candidates[meal] = (ids, matrix)
+            records[meal] = meal_records
+        return candidates, records
+
+    def pick_day(self, goal: str, target: np.ndarray, ingredients: List[str] = None,
+                 top: int = 5, rng: Optional[random.Random] = None,
+                 excluded: List[str] = None) -> Optional[Tuple[RecipeRecord, ...]]:
+        """Случайная тройка из top лучших"""
+        found = self._candidates(goal, ingredients, excluded, self.loader.current_content())
+        if found is None:
+            return None
+        candidates, records = found
+
+        combinations = best_combinations(candidates, target, top=top)
+        if not combinations:
+            return None
+        triple, score = (rng or random).choice(combinations)
+        logger.info(f"Day menu picked: score {score:.4f} from {len(combinations)} best combinations")
+        return tuple(records[meal][i] for meal, i in zip(MEALS, triple))
+
+    def plan_week(self, goal: str, target: np.ndarray, days: int = 7,
+                  ingredients: List[str] = None, excluded: List[str] = None,
+                  prune: int = 48, rng: Optional[np.random.Generator] = None) -> Optional[List[Tuple[RecipeRecord, ...]]]:
+        """
+        План на несколько дней одним вызовом
+
+        На каждый приём пищи отбирается 2 × prune рецептов, ближайших к своей
+        доле нормы, из них случайно prune - так недели получаются разными.
+        Дальше - optimize_days над общим тензором оценок.
+
+        Returns:
+            По дню кортеж (завтрак, обед, ужин) или None, если раздел пуст
+        """
+        rng = rng or np.random.default_rng()
+        found = self._candidates(goal, ingredients, excluded, self.loader.current_content())
+        if found is None:
+            return None
+        candidates, records = found
+
+        pools = []
+        for meal in MEALS:
+            ids, matrix = candidates[meal]
+            ids = prune_candidates(matrix, ids, target * MEAL_SHARES[meal], 2 * prune)
+            if len(ids) > prune:
+                ids = rng.choice(ids, prune, replace=False)
+            pools.append(ids)
+
+        pool_records = [[records[meal][i] for i in ids] for meal, ids in zip(MEALS, pools)]
+        vocab = {}
+        for meal_records in pool_records:
+            for record in meal_records:
+                for name in record.ingredient_names:
+                    vocab.setdefault(name, len(vocab))
+
+        plan = optimize_days(
+            [candidates[meal][1][ids] for meal, ids in zip(MEALS, pools)],
+            [incidence_matrix(meal_records, vocab) for meal_records in pool_records],
+            target, days, rng=rng
+        )
+        return [tuple(pool_records[k][day[k]] for k in range(3)) for day in plan]
+
+
+# Глобальный экземпляр
+day_menu_optimizer = DayMenuOptimizer(recipes_loader)
+
+
+if __name__ == "__main__":
+    import time
+    from bench_corpus import load_synthetic_corpus
+
+    load_synthetic_corpus(recipes_loader, per_meal=3000)
+    target = target_vector(2400, 140, 70, 300)
+
+    day_menu_optimizer.pick_day("maintain", target)  # построение матриц
+    n = 50
+    start = time.perf_counter()
+    for _ in range(n):
+        day = day_menu_optimizer.pick_day("maintain", target)
+    elapsed = time.perf_counter() - start
+    print(f"3000 рецептов на приём пищи: {elapsed * 1e3 / n:.2f} мс на подбор дня")
+
+    totals = nutrient_matrix(day).sum(axis=0)
+    print(f"Цель:  {target.astype(int).tolist()}")
+    print(f"Итог:  {totals.astype(int).tolist()}")
+
+    # Для сравнения - прежний независимый случайный выбор
+    records = recipes_loader.records["maintain"]
+    errors = []
+    for _ in range(1000):
+        random_day = [random.choice(records[meal]) for meal in MEALS]
+        errors.append(abs(nutrient_matrix(random_day).sum(axis=0)[0] - target[0]))
+    print(f"Случайный выбор: среднее отклонение калорий {np.mean(errors):.0f} ккал, "
+          f"подбор: {abs(totals[0] - target[0]):.0f} ккал")
+
+    # Неделя одним вызовом против семи отдельных подборов дня
+    def describe(week):
+        repeats = sum(len(week) - len({day[k].name for day in week}) for k in range(3))
+        error = np.mean([abs(nutrient_matrix(day).sum(axis=0)[0] - target[0]) for day in week])
+        return f"повторов {repeats}, среднее отклонение калорий {error:.0f} ккал"
+
+    n = 20
+    start = time.perf_counter()
+    for _ in range(n):
+        week = day_menu_optimizer.plan_week("maintain", target, days=7)
+    week_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(n):
+        separate = [day_menu_optimizer.pick_day("maintain", target) for _ in range(7)]
+    separate_time = time.perf_counter() - start
+
+    print(f"Неделя одним вызовом: {week_time * 1e3 / n:.1f} мс, {describe(week)}")
+    print(f"7 подборов дня:       {separate_time * 1e3 / n:.1f} мс, {describe(separate)}")
@@ -0,0 +1,241 @@
+"""
+НОЧНОЙ ПЕРЕСЧЁТ ПЛАНОВ
+Свежие план питания и тренировка для каждого активного пользователя бота
+(JSON-база database.json): пакетная генерация с общими кандидатами, результаты
+сохраняются по мере готовности в таблицы meal_plans и workout_plans.
+Обработчики бота эти планы пока не читают - генерируют при запросе
+
+    python nightly_plans.py --days 7
+    python nightly_plans.py --synthetic 2000 --compare   # нагрузочный прогон без БД
+"""
+
+import json
+import time
+import random
+import logging
+import argparse
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from database import db
+from intelligent_generator import IntelligentMealPlanner, MealPlanRequest, CALORIE_BUCKET
+from meal_plan import meal_plan_store
+from variety_store import VarietyHistory, variety_store
+from plan_random import plan_rng, MEAL_PLAN, WORKOUT_PLAN
+from workouts_loader_v4 import workouts_loader_v4, WorkoutPlanRequest
+
+logger = logging.getLogger(__name__)
+
+# Цель пользователя -> цель файлов тренировок (как в боте)
+WORKOUT_GOALS = {
+    'lose': 'lose_weight',
+    'lose_weight': 'lose_weight',
+    'gain': 'gain_weight',
+    'gain_muscle': 'gain_weight',
+    'gain_weight': 'gain_weight',
+    'maintain': 'maintain_weight',
+    'maintain_weight': 'maintain_weight'
+}
+
+# Ночная тренировка по умолчанию: всё тело, 45 минут
+NIGHTLY_WORKOUT = {'workout_type': 'full_body', 'muscle_group': 'full_body', 'duration_minutes': 45}
+
+# Как часто печатать прогресс (планов)
+PROGRESS_EVERY = 200
+
+# JSON-база бота (l.py): пользователи, их профили и язык
+BOT_DATABASE = "database.json"
+
+# Без этих полей профиля норму калорий не посчитать - пользователь пропускается
+REQUIRED_PROFILE = ('age', 'weight', 'height', 'gender', 'goal')
+
+
+def _profile(user: dict) -> dict:
+    return {key: user.get(key) for key in ('age', 'weight', 'height', 'gender', 'goal', 'activity_level')}
+
+
+def _last_active(user: dict) -> datetime:
+    """Последняя активность: регистрация или последняя запись дневных итогов"""
+    dates = [user.get('registration_date')] + [result.get('date') for result in user.get('daily_results', [])]
+    moments = []
+    for value in dates:
+        try:
+            moments.append(datetime.fromisoformat(value))
+        except (TypeError, ValueError):
+            continue
+    return max(moments, default=datetime.min)
+
+
+def bot_users(days: int = 7, path: str = BOT_DATABASE) -> List[dict]:
+    """
+    Активные пользователи бота с заполненным профилем
+
+    Бот хранит пользователей в JSON-базе (см. Database в l.py), а не в
+    таблице users SQLite; l.py здесь не импортируется (нужен telegram),
+    файл читается напрямую. Уровень профиля служит уровнем активности,
+    как в calculate_calories бота.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            stored = json.load(f).get('users', {})
+    except (OSError, ValueError) as e:
+        logger.error(f"Cannot read bot database {path}: {e}")
+        return []
+
+    since = datetime.now() - timedelta(days=days)
+    users = []
+    for user_id, user in stored.items():
+        profile = user.get('profile') or {}
+        if not all(profile.get(key) for key in REQUIRED_PROFILE) or _last_active(user) < since:
+            continue
+        users.append({**profile, 'user_id': int(user_id), 'language': user.get('language'),
+                      'activity_level': profile.get('level') or 'intermediate'})
+    return sorted(users, key=lambda user: user['user_id'])
+
+
+def meal_requests(users: Iterable[dict], with_history: bool = True) -> Iterator[MealPlanRequest]:
+    """
+    Заявки на планы питания; история читается из БД по одной
+
+    Аллергии и исключения бот не сохраняет (ответы анкеты живут только в
+    user_data разговора), поэтому у пользователей бота план строится без
+    них; предпочтения есть только у синтетических пользователей.
+    """
+    for user in users:
+        user_id = user.get('user_id')
+        preferences = user.get('preferences') or {}
+        history = variety_store.load(user_id) if with_history else VarietyHistory()
+        rng = plan_rng(user_id, MEAL_PLAN, seed=user.get('seed'))
+        yield MealPlanRequest(user_id, _profile(user), preferences, user.get('language') or 'ru', history, rng)
+
+
+def workout_requests(users: Iterable[dict], with_history: bool = True) -> Iterator[WorkoutPlanRequest]:
+    """Заявки на тренировки по цели, месту и уровню пользователя"""
+    for user in users:
+        user_id = user.get('user_id')
+        location = 'gym' if user.get('location') == 'gym' else 'home'
+        history = variety_store.load(user_id) if with_history else VarietyHistory()
+        yield WorkoutPlanRequest(
+            user_id=user_id,
+            goal=WORKOUT_GOALS.get(user.get('goal'), 'maintain_weight'),
+            location=location,
+            level=user.get('level') or 'intermediate',
+            equipment_type='full' if location == 'gym' else 'bodyweight',
+            history=history,
+            rng=plan_rng(user_id, WORKOUT_PLAN, seed=user.get('seed')),
+            **NIGHTLY_WORKOUT
+        )
+
+
+class _Progress:
+    """Прогресс и пропускная способность пакета"""
+
+    def __init__(self, name: str, total: int):
+        self.name = name
+        self.total = total
+        self.done = 0
+        self.start = time.perf_counter()
+
+    def step(self):
+        self.done += 1
+        if self.done % PROGRESS_EVERY == 0 or self.done == self.total:
+            elapsed = time.perf_counter() - self.start
+            print(f"[{self.name}] {self.done}/{self.total}, {self.done / elapsed:7.1f} планов/с")
+
+    def rate(self) -> float:
+        return self.done / (time.perf_counter() - self.start)
+
+
+def precompute_meal_plans(users: List[dict], planner: IntelligentMealPlanner = None,
+                          calorie_step: int = CALORIE_BUCKET, save: bool = True) -> float:
+    """Планы питания для пользователей; каждый сохраняется сразу. Возвращает планов/с"""
+    planner = planner or IntelligentMealPlanner()
+    progress = _Progress("питание", len(users))
+    for request, plan in planner.build_meal_plans(meal_requests(users, with_history=save), calorie_step):
+        if save and request.user_id:
+            meal_plan_store.save(request.user_id, plan)
+            variety_store.save(request.user_id, request.history)
+        progress.step()
+    return progress.rate()
+
+
+def precompute_workout_plans(users: List[dict], save: bool = True) -> float:
+    """Тренировки для пользователей; каждая сохраняется сразу. Возвращает планов/с"""
+    progress = _Progress("тренировки", len(users))
+    for request, plan in workouts_loader_v4.get_enhanced_workout_plans(workout_requests(users, with_history=save)):
+        if save and request.user_id:
+            db.save_workout_plan(request.user_id, json.dumps(plan, ensure_ascii=False, default=str))
+            variety_store.save(request.user_id, request.history)
+        progress.step()
+    return progress.rate()
+
+
+def synthetic_users(count: int, seed: int = 42) -> List[dict]:
+    """Пользователи для нагрузочного прогона (в БД не пишутся); у каждого своё зерно - прогоны повторяемы"""
+    rng = random.Random(seed)
+    exclusions = [[], [], ['лук'], ['рыба'], ['молоко', 'сыр']]
+    return [
+        {'user_id': None, 'age': rng.randint(18, 60), 'weight': rng.randint(50, 110),
+         'height': rng.randint(155, 195), 'gender': rng.choice(['male', 'female']),
+         'goal': rng.choice(['lose_weight', 'gain_muscle', 'maintain']),
+         'activity_level': rng.choice(['sedentary', 'light', 'moderate', 'active']),
+         'location': rng.choice(['home', 'gym']), 'level': rng.choice(['beginner', 'intermediate']),
+         'preferences': {'exclude': rng.choice(exclusions)}, 'seed': index}
+        for index in range(count)
+    ]
+
+
+def _one_by_one(users: List[dict], planner: IntelligentMealPlanner) -> Tuple[float, float]:
+    """Прежний путь: по одному вызову на пользователя (планов/с питания и тренировок)"""
+    start = time.perf_counter()
+    for request in meal_requests(users, with_history=False):
+        planner.build_meal_plan(request.profile, request.preferences, request.language, request.history,
+                                rng=request.rng)
+    meals_rate = len(users) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for request in workout_requests(users, with_history=False):
+        workouts_loader_v4.get_enhanced_workout_plan(**{
+            field: value for field, value in request._asdict().items() if field != 'user_id'
+        })
+    return meals_rate, len(users) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ночной пересчёт планов активных пользователей")
+    parser.add_argument("--days", type=int, default=7, help="активность за последние N дней")
+    parser.add_argument("--kind", choices=["all", "meals", "workouts"], default="all")
+    parser.add_argument("--calorie-step", type=int, default=CALORIE_BUCKET,
+                        help="ширина корзины калорий при группировке, ккал")
+    parser.add_argument("--synthetic", type=int, default=0,
+                        help="вместо базы бота - N синтетических пользователей и корпус рецептов, без сохранения")
+    parser.add_argument("--database", default=BOT_DATABASE, help="JSON-база бота")
+    parser.add_argument("--compare", action="store_true", help="также замерить генерацию по одному")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    planner = IntelligentMealPlanner()
+    if args.synthetic:
+        from recipes_loader import recipes_loader
+        from bench_corpus import load_synthetic_corpus
+        load_synthetic_corpus(recipes_loader)
+        users = synthetic_users(args.synthetic)
+    else:
+        users = bot_users(args.days, args.database)
+    save = not args.synthetic
+    print(f"Пользователей: {len(users)}")
+
+    rates: Dict[str, float] = {}
+    if args.kind in ("all", "meals"):
+        rates["питание"] = precompute_meal_plans(users, planner, args.calorie_step, save)
+    if args.kind in ("all", "workouts"):
+        rates["тренировки"] = precompute_workout_plans(users, save)
+    print("Пакетом: " + ", ".join(f"{name} {rate:.1f} планов/с" for name, rate in rates.items()))
+
+    if args.compare:
+        meals_rate, workouts_rate = _one_by_one(users, planner)
+        print(f"По одному: питание {meals_rate:.1f} планов/с, тренировки {workouts_rate:.1f} планов/с")
+
+
+if __name__ == "__main__":
+    main()
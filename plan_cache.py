@@ -0,0 +1,253 @@
+"""
+КЭШ ГОТОВЫХ ПЛАНОВ
+Структурированные планы питания по профилю (цель, язык, норма калорий с шагом
+50 ккал, исключения, структура дня): несколько вариантов на ключ выдаются по
+кругу, горячие ключи пополняются свежими вариантами в фоне. Кэш читает только
+IntelligentMealPlanner.generate_meal_plan - планы бота (AIGenerator) идут мимо
+"""
+
+import time
+import queue
+import random
+import hashlib
+import logging
+import threading
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Iterable, Optional, Set, Tuple
+
+from meal_plan import MealPlan
+from recipes_loader import recipes_loader
+
+logger = logging.getLogger(__name__)
+
+# Шаг округления нормы калорий в ключе, ккал: разница до 25 ккал закрывается порциями
+CACHE_CALORIE_STEP = 50
+
+# Вариантов на ключ (самый старый вытесняется свежим) и ключей всего (LRU)
+VARIANTS_PER_KEY = 4
+MAX_KEYS = 5000
+
+# Вариант старше PLAN_TTL не выдаётся
+PLAN_TTL = 6 * 3600
+
+# Ключ горячий, если за HOT_WINDOW секунд было HOT_HITS попаданий; такой ключ
+# пополняется в фоне, но не чаще раза в REFRESH_INTERVAL, когда вариантов уже полный набор
+HOT_HITS = 3
+HOT_WINDOW = 600
+REFRESH_INTERVAL = 60
+
+# Как часто писать в лог статистику (обращений)
+STATS_LOG_EVERY = 1000
+
+
+def plan_key(goal: str, language: str, target_calories: float, excluded: Iterable[str],
+             meal_structure: str, products: Iterable[str] = (), diet_type: str = None) -> tuple:
+    """
+    Ключ кэша
+
+    Исключения (аллергии и нежелательные продукты), продукты пользователя и
+    тип диеты входят в ключ хэшем: порядок и регистр не важны, ключ короткий.
+    """
+    parts = (sorted({name.strip().lower() for name in excluded if name and name.strip()}),
+             sorted({name.strip().lower() for name in products if name and name.strip()}),
+             diet_type or None)
+    digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()[:16]
+    calories = round(target_calories / CACHE_CALORIE_STEP) * CACHE_CALORIE_STEP
+    return goal, language, calories, digest, meal_structure
+
+
+class _Entry:
+    """Варианты одного ключа, очередь выдачи и недавние попадания"""
+
+    __slots__ = ("variants", "turn", "hits", "build", "refreshed", "built")
+
+    def __init__(self, variants: int):
+        self.variants: Deque[Tuple[float, MealPlan]] = deque(maxlen=variants)  # (создан, план)
+        self.turn = 0
+        self.hits: Deque[float] = deque(maxlen=HOT_HITS)
+        self.build: Optional[Callable[[random.Random], MealPlan]] = None
+        self.refreshed = 0.0
+        self.built = 0  # вариантов построено в фоне: номер входит в зерно следующего
+
+
+class PlanCache:
+    """
+    Кэш готовых планов питания
+
+    get отдаёт варианты ключа по очереди, пропуская те, что пользователь
+    недавно получал (выданный план не изменяется - подгонка под
+    пользователя делается на копии). put добавляет вариант и запоминает
+    функцию построения ключа: по ней фоновый поток строит новые варианты
+    для горячих ключей, так что частые профили отдаются из кэша, а
+    разнообразие сохраняется. Функция строит план только из входных данных
+    ключа и получает ГСЧ с зерном от ключа и номера варианта - варианты
+    воспроизводимы и не зависят от того, чей запрос пополнил ключ. При
+    перезагрузке рецептов кэш очищается.
+    """
+
+    def __init__(self, variants: int = VARIANTS_PER_KEY, max_keys: int = MAX_KEYS,
+                 ttl: float = PLAN_TTL, background: bool = True):
+        self.variants = variants
+        self.max_keys = max_keys
+        self.ttl = ttl
+        self.background = background
+        self._entries: "OrderedDict[tuple, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._pending: Set[tuple] = set()
+        self._worker: Optional[threading.Thread] = None
+        self._generation = 0  # растёт при очистке: варианты, начатые до неё, отбрасываются
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.evictions = 0
+
+    def get(self, key: tuple, seen: Callable[[MealPlan], bool] = None) -> Optional[MealPlan]:
+        """
+        Очередной вариант ключа или None (промах)
+
+        seen - проверка, получал ли пользователь вариант недавно: такие
+        пропускаются, пока есть другие.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                while entry.variants and now - entry.variants[0][0] > self.ttl:
+                    entry.variants.popleft()
+            if entry is None or not entry.variants:
+                self.misses += 1
+                self._count()
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self._count()
+            entry.hits.append(now)
+            count = len(entry.variants)
+            order = [entry.variants[(entry.turn + shift) % count][1] for shift in range(count)]
+            plan = next((variant for variant in order if seen is None or not seen(variant)), order[0])
+            entry.turn += 1
+            if self._needs_refresh(entry, now) and key not in self._pending:
+                self._pending.add(key)
+                self._queue.put(key)
+                self._start_worker()
+        return plan
+
+    def put(self, key: tuple, plan: MealPlan, build: Callable[[random.Random], MealPlan] = None):
+        """Добавляет вариант; build(rng) - построение нового варианта этого ключа для фона"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry(self.variants)
+            self._entries.move_to_end(key)
+            entry.variants.append((now, plan))
+            if build is not None:
+                entry.build = build
+            while len(self._entries) > self.max_keys:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "refreshes": self.refreshes,
+                "evictions": self.evictions,
+                "keys": len(self._entries),
+                "variants": sum(len(entry.variants) for entry in self._entries.values()),
+                "pending": len(self._pending),
+            }
+
+    def _count(self):
+        """Периодически пишет статистику в лог (под блокировкой)"""
+        lookups = self.hits + self.misses
+        if lookups % STATS_LOG_EVERY == 0:
+            logger.info(f"Plan cache: {self.hits}/{lookups} hits ({self.hits / lookups:.0%}), "
+                        f"{len(self._entries)} keys, {self.refreshes} refreshes, {self.evictions} evictions")
+
+    def _needs_refresh(self, entry: _Entry, now: float) -> bool:
+        if not self.background or entry.build is None:
+            return False
+        hot = len(entry.hits) == HOT_HITS and now - entry.hits[0] <= HOT_WINDOW
+        if not hot:
+            return False
+        return len(entry.variants) < self.variants or now - entry.refreshed >= REFRESH_INTERVAL
+
+    def _start_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._refresh_loop, name="plan-cache-refresh", daemon=True)
+            self._worker.start()
+
+    def _refresh_loop(self):
+        """Фоновый поток: строит по новому варианту для ключей из очереди"""
+        while True:
+            key = self._queue.get()
+            with self._lock:
+                entry = self._entries.get(key)
+                build = entry.build if entry is not None else None
+                generation = self._generation
+                if build is not None:
+                    rng = random.Random(f"{key}:{entry.built}")
+                    entry.built += 1
+            try:
+                if build is not None:
+                    plan = build(rng)
+                    with self._lock:
+                        stale = generation != self._generation
+                    if not stale:
+                        self.put(key, plan)
+                        with self._lock:
+                            self.refreshes += 1
+                            entry.refreshed = time.monotonic()
+            except Exception as e:
+                logger.warning(f"Plan cache refresh for {key} failed: {e}")
+            finally:
+                with self._lock:
+                    self._pending.discard(key)
+
+
+# Глобальный кэш планов питания
+plan_cache = PlanCache()
+recipes_loader.add_reload_listener(plan_cache.clear)
+
+
+if __name__ == "__main__":
+    # Задержка выдачи плана: генерация (промах) против кэша (попадание с подгонкой под пользователя)
+    import statistics
+    from intelligent_generator import IntelligentMealPlanner
+    from bench_corpus import load_synthetic_corpus
+
+    load_synthetic_corpus(recipes_loader)
+    planner = IntelligentMealPlanner()
+    rng = random.Random(7)
+    # Немного профилей, которые часто повторяются - как у реальных пользователей
+    profiles = [
+        {'age': rng.randint(20, 50), 'weight': rng.choice([60, 70, 80, 90]), 'height': rng.choice([165, 175, 185]),
+         'gender': rng.choice(['male', 'female']), 'goal': rng.choice(['lose_weight', 'gain_muscle', 'maintain']),
+         'activity_level': 'intermediate'}
+        for _ in range(40)
+    ]
+    requests = [rng.choice(profiles) for _ in range(2000)]
+
+    for name, cache in (("без кэша", None), ("с кэшем", PlanCache())):
+        planner.plan_cache = cache
+        latencies = []
+        for profile in requests:
+            start = time.perf_counter()
+            planner.generate_meal_plan(profile, {})
+            latencies.append(time.perf_counter() - start)
+        latencies.sort()
+        print(f"{name:9s}: среднее {statistics.mean(latencies) * 1e3:6.2f} мс, "
+              f"p50 {latencies[len(latencies) // 2] * 1e3:6.2f} мс, p99 {latencies[int(len(latencies) * 0.99)] * 1e3:6.2f} мс")
+        if cache is not None:
+            print(f"           {cache.stats()}")
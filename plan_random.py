@@ -0,0 +1,44 @@
+"""
+СЛУЧАЙНОСТЬ ГЕНЕРАЦИИ
+Генераторы случайных чисел для планов: зерно по умолчанию выводится из
+(пользователь, дата, вид запроса) - одинаковые запросы дают одинаковые планы
+"""
+
+import random
+import hashlib
+from datetime import date
+from typing import Optional
+
+# Виды запросов
+MEAL_PLAN = "meal_plan"
+MEAL_REPLACE = "meal_replace"
+WEEK_PLAN = "week_plan"
+NUTRITION_PLAN = "nutrition_plan"
+WORKOUT_PLAN = "workout_plan"
+WORKOUT_FORECAST = "workout_forecast"
+
+
+def plan_seed(user_id: Optional[int], kind: str, day: date = None) -> int:
+    """
+    Зерно запроса: 64 бита SHA-256 от "пользователь:дата:вид"
+
+    Не зависит от PYTHONHASHSEED и процесса - одинаково в процессах пула
+    генерации и при повторном запуске.
+    """
+    text = f"{user_id}:{(day or date.today()).isoformat()}:{kind}"
+    return int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+
+
+def plan_rng(user_id: Optional[int], kind: str, day: date = None, seed: int = None) -> random.Random:
+    """
+    ГСЧ запроса: от явного seed, иначе от (user_id, day, kind)
+
+    Без пользователя и seed выводить зерно не из чего - общий на всех
+    анонимных запросов день давал бы им одинаковые планы, поэтому
+    генератор инициализируется случайно.
+    """
+    if seed is not None:
+        return random.Random(seed)
+    if user_id is None:
+        return random.Random()
+    return random.Random(plan_seed(user_id, kind, day))
@@ -0,0 +1,178 @@
+"""
+РАСЧЁТ ПОРЦИЙ
+Граммовки продуктов блюда под цель по калориям и БЖУ: ограниченный метод
+наименьших квадратов и перебор округлений до кулинарных шагов
+"""
+
+import itertools
+import logging
+from typing import List, Sequence
+
+import numpy as np
+
+from knowledge_base import NutritionDatabase
+
+try:
+    from scipy.optimize import lsq_linear  # scipy, опционально
+    HAS_LSQ_LINEAR = True
+except ImportError:
+    HAS_LSQ_LINEAR = False
+
+logger = logging.getLogger(__name__)
+
+# Границы граммовки одного продукта
+MIN_GRAMS = 10
+MAX_GRAMS = 500
+
+# Веса квадратов относительных ошибок (ккал, белки, жиры, углеводы). Набор
+# продуктов уже выбран и БЖУ им часто не закрыть - калорийность блюда важнее,
+# поэтому калории весят намного больше, чем при подборе дня (NUTRIENT_WEIGHTS)
+PORTION_WEIGHTS = np.array([25.0, 0.5, 0.25, 0.25])
+
+# Вес притяжения к стартовым граммовкам (относительное отклонение в квадрате).
+# При пяти и более продуктах задача недоопределена - без этого члена решатель
+# мог бы отдать всю калорийность одному продукту.
+PRIOR_WEIGHT = 0.003
+
+# Округления вниз/вверх перебираются целиком (2^n наборов) для не более чем n продуктов
+REPAIR_LIMIT = 8
+
+
+def bounded_lstsq(A: np.ndarray, b: np.ndarray, lower: np.ndarray, upper: np.ndarray,
+                  max_iterations: int = None) -> np.ndarray:
+    """
+    min ||A x - b||² при lower <= x <= upper
+
+    С scipy - lsq_linear(method='bvls'). Без него - тот же метод
+    активных множеств (BVLS): по свободным переменным решается обычный
+    МНК, при выходе за границы делается шаг до первой из них и она
+    фиксируется; затем освобождается переменная на границе, которую
+    градиент сильнее всего тянет внутрь. Для блюда из нескольких
+    продуктов это несколько разложений маленькой матрицы.
+    """
+    lower = np.asarray(lower, dtype=np.float64)
+    upper = np.asarray(upper, dtype=np.float64)
+    if HAS_LSQ_LINEAR:
+        return lsq_linear(A, b, bounds=(lower, upper), method='bvls').x
+
+    tolerance = 1e-9
+    x = np.clip(np.linalg.lstsq(A, b, rcond=None)[0], lower, upper)
+    free = (x > lower) & (x < upper)
+    for _ in range(max_iterations or 3 * A.shape[1] + 10):
+        # Оптимум по свободным переменным; при выходе за границу - шаг до неё
+        while free.any():
+            z = x.copy()
+            z[free] = np.linalg.lstsq(A[:, free], b - A[:, ~free] @ x[~free], rcond=None)[0]
+            outside = free & ((z < lower - tolerance) | (z > upper + tolerance))
+            if not outside.any():
+                x = np.clip(z, lower, upper)
+                break
+            direction = z - x
+            with np.errstate(divide='ignore', invalid='ignore'):
+                limits = np.where(direction > 0, (upper - x) / direction, (lower - x) / direction)
+            alpha = float(np.clip(limits[outside].min(), 0.0, 1.0))
+            x = np.clip(x + alpha * direction, lower, upper)
+            free &= (x > lower + tolerance) & (x < upper - tolerance)
+
+        # Переменная на границе, которую градиент тянет внутрь, освобождается (самая сильная)
+        gradient = A.T @ (A @ x - b)
+        violation = np.where(x <= lower + tolerance, -gradient, 0.0) + \
+                    np.where(x >= upper - tolerance, gradient, 0.0)
+        violation[free] = 0.0
+        worst = int(np.argmax(violation))
+        if violation[worst] <= tolerance:
+            break
+        free[worst] = True
+    return x
+
+
+def solve_portions(product_keys: Sequence[str], target: np.ndarray, prior_grams: Sequence[float],
+                   steps: Sequence[int], minimums: Sequence[int]) -> List[int]:
+    """
+    Граммовки продуктов блюда
+
+    Минимизируется сумма квадратов относительных отклонений (ккал, белки,
+    жиры, углеводы) от цели с весами PORTION_WEIGHTS плюс PRIOR_WEIGHT ×
+    квадраты относительных отклонений от стартовых граммовок. Граммовки
+    ограничены MIN_GRAMS-MAX_GRAMS и минимумом продукта. Непрерывное
+    решение округляется до шага продукта: все сочетания "вниз/вверх"
+    оцениваются одним умножением матриц (NutritionDatabase.total_nutrition),
+    берётся лучшее.
+
+    Args:
+        product_keys: Продукты блюда (без повторов)
+        target: Цель блюда (ккал, белки, жиры, углеводы), см. target_vector
+        prior_grams: Стартовые граммовки (например, жадная раскладка)
+        steps, minimums: Шаг округления и минимальная порция каждого продукта
+    """
+    prior = np.maximum(np.asarray(prior_grams, dtype=np.float64), MIN_GRAMS)
+    steps = np.asarray(steps, dtype=np.float64)
+    lower = np.maximum(np.asarray(minimums, dtype=np.float64), MIN_GRAMS)
+    upper = np.maximum(np.floor(MAX_GRAMS / steps) * steps, lower)
+
+    weights = np.sqrt(PORTION_WEIGHTS)
+    scale = weights / target
+    prior_scale = np.sqrt(PRIOR_WEIGHT) / prior
+    per_gram = NutritionDatabase.nutrient_rows(product_keys) / 100.0
+
+    A = np.vstack([per_gram.T * scale[:, None], np.diag(prior_scale)])
+    b = np.concatenate([weights, np.sqrt(PRIOR_WEIGHT) * np.ones(len(prior))])
+    grams = bounded_lstsq(A, b, lower, upper)
+
+    # Починка округления: ближайшие шаги вниз и вверх для каждого продукта
+    down = np.clip(np.floor(grams / steps) * steps, lower, upper)
+    up = np.clip(np.ceil(grams / steps) * steps, lower, upper)
+    if len(grams) <= REPAIR_LIMIT:
+        candidates = np.array(list(itertools.product(*zip(down, up))))
+    else:
+        candidates = np.clip(np.round(grams / steps) * steps, lower, upper)[None, :]
+    totals = NutritionDatabase.total_nutrition(product_keys, candidates)
+    errors = (((totals - target) * scale) ** 2).sum(axis=1) + \
+             (((candidates - prior) * prior_scale) ** 2).sum(axis=1)
+    return [int(g) for g in candidates[int(np.argmin(errors))]]
+
+
+if __name__ == "__main__":
+    # Точность и время на блюдо: жадная раскладка против решателя на тех же наборах продуктов
+    import random
+    import time
+    from intelligent_generator import IntelligentMealPlanner
+    from menu_optimizer import target_vector
+    from variety_store import VarietyHistory
+
+    planner = IntelligentMealPlanner()
+    products = planner._filter_products({})
+    meals = []
+    for seed in range(200):
+        rng = random.Random(seed)
+        history = VarietyHistory()
+        for meal_type, calories in (("breakfast", 600), ("lunch", 850), ("dinner", 650), ("snack", 250)):
+            macros = planner._calculate_meal_macros(calories, meal_type)
+            selected = planner._select_products_intelligent(products, calories, macros, meal_type, {},
+                                                            history=history, rng=rng)
+            selected = list({p["key"]: p for p in selected if p}.values())
+            target = target_vector(calories, macros["protein"], macros["fat"], macros["carbs"])
+            meals.append((selected, calories, macros, target))
+
+    def greedy(selected, calories, macros, target):
+        return planner._greedy_grams(selected, calories, macros)
+
+    def solver(selected, calories, macros, target):
+        practical = [planner._practical_step(p) for p in selected]
+        return solve_portions([p["key"] for p in selected], target,
+                              planner._greedy_grams(selected, calories, macros),
+                              [s for s, _ in practical], [m for _, m in practical])
+
+    print(f"scipy lsq_linear: {'да' if HAS_LSQ_LINEAR else 'нет (numpy BVLS)'}, блюд: {len(meals)}")
+    for name, method in (("жадно", greedy), ("решатель", solver)):
+        errors = []
+        start = time.perf_counter()
+        results = [method(*meal) for meal in meals]
+        elapsed = time.perf_counter() - start
+        for (selected, _, _, target), grams in zip(meals, results):
+            total = NutritionDatabase.total_nutrition([p["key"] for p in selected], grams)
+            errors.append(np.abs(total - target) / target)
+        errors = np.array(errors)
+        print(f"{name:8s}: ккал {errors[:, 0].mean() * 100:4.1f}% (≤5%: {(errors[:, 0] <= 0.05).mean() * 100:3.0f}%), "
+              f"белки {errors[:, 1].mean() * 100:4.1f}%, жиры {errors[:, 2].mean() * 100:4.1f}%, "
+              f"углеводы {errors[:, 3].mean() * 100:4.1f}%, {elapsed * 1e6 / len(meals):4.0f} мкс/блюдо")
@@ -0,0 +1,235 @@
+"""
+ПОХОЖИЕ РЕЦЕПТЫ
+Индекс ближайших соседей по нормированным БЖУ и составу для быстрой замены блюда
+"""
+
+import logging
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from recipes_loader import recipes_loader, RecipesLoader, RecipeRecord
+from food_filter import food_filter, FoodFilter
+from menu_optimizer import nutrient_matrix, MEALS
+from text_matcher import get_matcher
+
+try:
+    from scipy.spatial import cKDTree  # scipy, опционально
+    HAS_KDTREE = True
+except ImportError:
+    HAS_KDTREE = False
+
+logger = logging.getLogger(__name__)
+
+# Вес различия состава (1 - коэффициент Жаккара) относительно расстояния по БЖУ
+INGREDIENT_WEIGHT = 0.5
+
+# Во сколько раз больше соседей по БЖУ берётся для пересортировки с учётом состава
+OVERSAMPLE = 8
+
+
+class _Partition(NamedTuple):
+    """Рецепты одного (цель, приём пищи) с индексом соседей"""
+    records: Tuple[RecipeRecord, ...]
+    nutrients: np.ndarray       # (n, 4) ккал, белки, жиры, углеводы
+    scale: np.ndarray           # делители столбцов (стандартное отклонение)
+    points: np.ndarray          # nutrients / scale
+    tree: Optional[object]      # cKDTree над points, если есть scipy
+    ingredients: Tuple[frozenset, ...]
+    masks: np.ndarray           # маски аллергенов FoodFilter
+    ids: Dict[RecipeRecord, int]
+
+
+class Neighbour(NamedTuple):
+    """Альтернатива рецепту"""
+    recipe_id: int
+    record: RecipeRecord
+    distance: float
+
+
+class RecipeNeighbourIndex:
+    """
+    Поиск похожих рецептов для замены одного блюда
+
+    Расстояние - евклидово по БЖУ, нормированным на разброс раздела, плюс
+    INGREDIENT_WEIGHT × (1 - доля общих ингредиентов). Сначала берутся
+    k × OVERSAMPLE ближайших по БЖУ (k-d дерево scipy или, без него,
+    один векторный проход по разделу), затем они пересортировываются
+    с учётом состава. Индексы строятся один раз на версию содержимого
+    загрузчика.
+    """
+
+    def __init__(self, loader: RecipesLoader, filter_: FoodFilter):
+        self.loader = loader
+        self.food_filter = filter_
+        # (содержимое загрузчика, разделы) - заменяется целиком
+        self._state = (None, {})
+
+    def _build_partition(self, records, masks) -> _Partition:
+        nutrients = nutrient_matrix(records)
+        scale = nutrients.std(axis=0) if len(records) > 1 else np.ones(4)
+        scale[scale == 0] = 1.0
+        points = nutrients / scale
+        return _Partition(
+            records,
+            nutrients,
+            scale,
+            points,
+            cKDTree(points) if HAS_KDTREE and len(records) else None,
+            tuple(frozenset(r.ingredient_names) for r in records),
+            np.array(masks, dtype=np.int64),
+            {record: i for i, record in enumerate(records)},
+        )
+
+    def _partitions(self, content) -> Dict[Tuple[str, str], _Partition]:
+        cached_content, partitions = self._state
+        if cached_content is content:
+            return partitions
+
+        masks = self.food_filter.get_masks(content)
+        partitions = {
+            (goal, meal_type): self._build_partition(records, masks.get((goal, meal_type), (0,) * len(records)))
+            for goal, meals in content.records.items()
+            for meal_type, records in meals.items()
+        }
+        self._state = (content, partitions)
+        return partitions
+
+    def _nearest(self, partition: _Partition, point: np.ndarray, count: int) -> np.ndarray:
+        """Номера count ближайших по БЖУ рецептов"""
+        n = len(partition.records)
+        if count >= n:
+            return np.arange(n)
+        if partition.tree is not None:
+            _, ids = partition.tree.query(point, k=count)
+            return np.atleast_1d(ids)
+        distances = ((partition.points - point) ** 2).sum(axis=1)
+        return np.argpartition(distances, count)[:count]
+
+    def alternatives(self, goal: str, meal_type: str,
+                     recipe: Union[int, RecipeRecord],
+                     k: int = 5,
+                     wanted: Optional[np.ndarray] = None,
+                     allergies: List[str] = None,
+                     diet_type: str = None,
+                     excluded: List[str] = None,
+                     skip_recipes: Sequence[RecipeRecord] = ()) -> List[Neighbour]:
+        """
+        k рецептов, ближайших к заданному
+
+        Args:
+            goal, meal_type: Раздел рецепта
+            recipe: Номер рецепта в разделе или сама запись
+            wanted: Желаемые (ккал, белки, жиры, углеводы); по умолчанию -
+                как у исходного рецепта
+            allergies, diet_type: Как в FoodFilter
+            excluded: Исключённые продукты (поиск подстрок)
+            skip_recipes: Рецепты, которые предлагать нельзя (например, уже в плане)
+
+        Returns:
+            Альтернативы по возрастанию расстояния, без исходного рецепта
+        """
+        key = self.loader._resolve_keys(goal, meal_type)
+        partition = self._partitions(self.loader.current_content()).get(key)
+        if partition is None or not partition.records:
+            return []
+
+        recipe_id = recipe if isinstance(recipe, int) else partition.ids.get(recipe)
+        if recipe_id is None:
+            return []
+        if wanted is None:
+            wanted = partition.nutrients[recipe_id]
+        point = np.asarray(wanted, dtype=np.float64) / partition.scale
+
+        forbidden = self.food_filter.forbidden_mask(allergies, diet_type)
+        excluded_matcher = get_matcher(excluded or [])
+        skip = {recipe_id}
+        skip.update(i for i in (partition.ids.get(r) for r in skip_recipes) if i is not None)
+        base_ingredients = partition.ingredients[recipe_id]
+
+        # При строгих аллергиях и исключениях подходящих среди ближайших может не хватить - расширяем выборку
+        count = k * OVERSAMPLE
+        while True:
+            ids = self._nearest(partition, point, count + len(skip))
+            ids = [int(i) for i in ids if int(i) not in skip]
+            if forbidden:
+                ids = [i for i in ids if not partition.masks[i] & forbidden]
+            if excluded_matcher:
+                ids = [i for i in ids if not excluded_matcher.search(partition.records[i].search_text)]
+            if len(ids) >= k or count + len(skip) >= len(partition.records):
+                break
+            count *= 4
+
+        if not ids:
+            return []
+        nutrition_distance = np.sqrt(((partition.points[ids] - point) ** 2).sum(axis=1))
+        neighbours = []
+        for i, distance in zip(ids, nutrition_distance):
+            ingredients = partition.ingredients[i]
+            union = len(base_ingredients | ingredients)
+            jaccard = len(base_ingredients & ingredients) / union if union else 0.0
+            neighbours.append(Neighbour(i, partition.records[i],
+                                        float(distance + INGREDIENT_WEIGHT * (1 - jaccard))))
+        neighbours.sort(key=lambda n: n.distance)
+        return neighbours[:k]
+
+    def swap_meal(self, goal: str, day: Sequence[RecipeRecord], meal_type: str,
+                  target: Optional[np.ndarray] = None, k: int = 5,
+                  allergies: List[str] = None, diet_type: str = None,
+                  skip_recipes: Sequence[RecipeRecord] = ()) -> Optional[Tuple[RecipeRecord, ...]]:
+        """
+        День (завтрак, обед, ужин) с заменённым блюдом
+
+        Если задана дневная цель, ищется рецепт, близкий к тому, чего
+        не хватает дню без заменяемого блюда (цель минус остальные блюда),
+        а не к самому заменяемому рецепту - так день заново балансируется.
+        Из k лучших берётся первый; None, если замены нет. День - как у
+        day_menu_optimizer.pick_day; в обработчики бота кнопка замены блюда
+        пока не выведена.
+        """
+        slot = MEALS.index(meal_type)
+        wanted = None
+        if target is not None:
+            others = [record for i, record in enumerate(day) if i != slot]
+            wanted = np.maximum(target - nutrient_matrix(others).sum(axis=0), 0)
+
+        found = self.alternatives(goal, meal_type, day[slot], k=k, wanted=wanted,
+                                  allergies=allergies, diet_type=diet_type,
+                                  skip_recipes=tuple(skip_recipes) + tuple(day))
+        if not found:
+            return None
+        swapped = list(day)
+        swapped[slot] = found[0].record
+        return tuple(swapped)
+
+
+# Глобальный индекс
+recipe_neighbour_index = RecipeNeighbourIndex(recipes_loader, food_filter)
+
+
+if __name__ == "__main__":
+    # Время замены блюда против нового подбора всего дня
+    import time
+    from bench_corpus import load_synthetic_corpus
+    from menu_optimizer import day_menu_optimizer, target_vector
+
+    load_synthetic_corpus(recipes_loader, per_meal=3000)
+    target = target_vector(2400, 140, 70, 300)
+    day = day_menu_optimizer.pick_day("maintain", target)
+    print(f"k-d дерево: {'да' if HAS_KDTREE else 'нет (numpy)'}")
+
+    recipe_neighbour_index.swap_meal("maintain", day, "dinner", target)  # построение индексов
+    n = 500
+    start = time.perf_counter()
+    for _ in range(n):
+        swapped = recipe_neighbour_index.swap_meal("maintain", day, "dinner", target, allergies=["лактоза"])
+    swap_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(20):
+        day_menu_optimizer.pick_day("maintain", target)
+    day_time = time.perf_counter() - start
+
+    print(f"Замена ужина: {swap_time * 1e3 / n:.3f} мс, новый день: {day_time * 1e3 / 20:.2f} мс")
+    print(f"Было:  {day[2].name}, {nutrient_matrix(day).sum(axis=0).astype(int).tolist()}")
+    print(f"Стало: {swapped[2].name}, {nutrient_matrix(swapped).sum(axis=0).astype(int).tolist()}")
@@ -0,0 +1,217 @@
+"""
+ДВИЖОК ЗАПРОСОВ К РЕЦЕПТАМ
+Индексированный поиск по всему корпусу: цель и приём пищи, калории, БЖУ,
+аллергены и ингредиенты
+"""
+
+import bisect
+import logging
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from recipes_loader import recipes_loader, RecipesLoader, RecipeRecord
+from food_filter import food_filter, FoodFilter
+from text_matcher import get_matcher
+
+logger = logging.getLogger(__name__)
+
+Range = Tuple[Optional[float], Optional[float]]
+
+
+class _Partition(NamedTuple):
+    """Рецепты одного (цель, приём пищи) с заранее построенными индексами"""
+    records: Tuple[RecipeRecord, ...]
+    calories: List[int]        # калории по возрастанию
+    order: Tuple[int, ...]     # номера рецептов в том же порядке
+    masks: Tuple[int, ...]     # маски аллергенов FoodFilter
+
+
+class RecipeMatch(NamedTuple):
+    """Найденный рецепт"""
+    recipe_id: int
+    record: RecipeRecord
+    score: int            # число совпавших ингредиентов пользователя
+    calorie_delta: float  # отклонение от целевых калорий
+
+
+class RecipeQueryEngine:
+    """
+    Поиск рецептов по нескольким критериям сразу
+
+    Для каждого (цель, приём пищи) хранится отсортированный индекс калорий:
+    диапазон калорий находится двумя bisect, а не проверкой каждого
+    рецепта. Аллергены и диета - побитовое И с масками FoodFilter,
+    ингредиенты - списки рецептов из инвертированного индекса загрузчика.
+    Индексы строятся один раз на версию содержимого загрузчика.
+    """
+
+    # Перекусы берутся из завтраков
+    MEAL_ALIASES = {
+        'snack': 'breakfast',
+        'snack1': 'breakfast',
+        'snack2': 'breakfast',
+    }
+
+    def __init__(self, loader: RecipesLoader, filter_: FoodFilter):
+        self.loader = loader
+        self.food_filter = filter_
+        # (содержимое загрузчика, разделы) - заменяется целиком
+        self._state = (None, {})
+
+    def _partitions(self, content) -> Dict[Tuple[str, str], _Partition]:
+        cached_content, partitions = self._state
+        if cached_content is content:
+            return partitions
+
+        masks = self.food_filter.get_masks(content)
+        partitions = {}
+        for goal, meals in content.records.items():
+            for meal_type, records in meals.items():
+                order = tuple(sorted(range(len(records)), key=lambda i: records[i].calories))
+                partitions[(goal, meal_type)] = _Partition(
+                    records,
+                    [records[i].calories for i in order],
+                    order,
+                    masks.get((goal, meal_type), (0,) * len(records)),
+                )
+        self._state = (content, partitions)
+        return partitions
+
+    @staticmethod
+    def _in_range(value: float, bounds: Optional[Range]) -> bool:
+        if bounds is None:
+            return True
+        low, high = bounds
+        return (low is None or value >= low) and (high is None or value <= high)
+
+    def query(self, goal: str, meal_type: str,
+              target_calories: Optional[float] = None,
+              calorie_tolerance: float = 0.3,
+              protein: Optional[Range] = None,
+              fats: Optional[Range] = None,
+              carbs: Optional[Range] = None,
+              allergies: List[str] = None,
+              diet_type: str = None,
+              excluded: List[str] = None,
+              ingredients: List[str] = None,
+              limit: int = 10) -> List[RecipeMatch]:
+        """
+        Найти рецепты, подходящие под все условия
+
+        Args:
+            goal, meal_type: Цель и приём пищи (любые названия, понятные загрузчику)
+            target_calories: Целевые калории; окно ±calorie_tolerance
+            protein, fats, carbs: Диапазоны (min, max) в граммах, None - без границы
+            allergies, diet_type: Как в FoodFilter
+            excluded: Исключённые продукты (поиск подстрок)
+            ingredients: Продукты пользователя; если заданы, рецепт должен
+                содержать хотя бы один
+
+        Returns:
+            Рецепты по убыванию числа совпавших ингредиентов, затем по
+            близости к целевым калориям
+        """
+        content = self.loader.current_content()
+        meal_type = self.MEAL_ALIASES.get(meal_type, meal_type)
+        key = self.loader._resolve_keys(goal, meal_type)
+        partition = self._partitions(content).get(key)
+        if partition is None or not partition.records:
+            return []
+
+        records = partition.records
+
+        # Калории: диапазон в отсортированном индексе
+        if target_calories:
+            low_cal = target_calories * (1 - calorie_tolerance)
+            high_cal = target_calories * (1 + calorie_tolerance)
+            lo = bisect.bisect_left(partition.calories, low_cal)
+            hi = bisect.bisect_right(partition.calories, high_cal)
+        else:
+            lo, hi = 0, len(records)
+
+        # Ингредиенты: если заданы, идём по спискам совпавших рецептов (обычно их меньше)
+        scores = {}
+        if ingredients:
+            scores = self.loader.ingredient_scores(goal, meal_type, ingredients, content)
+            if target_calories:
+                candidates = [i for i in scores if low_cal <= records[i].calories <= high_cal]
+            else:
+                candidates = list(scores)
+        else:
+            candidates = partition.order[lo:hi]
+
+        forbidden = self.food_filter.forbidden_mask(allergies, diet_type)
+        masks = partition.masks
+        excluded_matcher = get_matcher(excluded or [])
+
+        matches = []
+        for i in candidates:
+            if masks[i] & forbidden:
+                continue
+            record = records[i]
+            if not (self._in_range(record.protein, protein)
+                    and self._in_range(record.fats, fats)
+                    and self._in_range(record.carbs, carbs)):
+                continue
+            if excluded_matcher and excluded_matcher.search(record.search_text):
+                continue
+            delta = abs(record.calories - target_calories) if target_calories else 0
+            matches.append(RecipeMatch(i, record, scores.get(i, 0), delta))
+
+        matches.sort(key=lambda m: (-m.score, m.calorie_delta))
+        return matches[:limit]
+
+
+# Глобальный движок
+recipe_query_engine = RecipeQueryEngine(recipes_loader, food_filter)
+
+
+if __name__ == "__main__":
+    # Время запроса по всему корпусу против выборки 20 случайных рецептов с фильтрацией
+    import time
+    from bench_corpus import load_synthetic_corpus
+
+    if not any(r for meals in recipes_loader.recipes.values() for r in meals.values()):
+        load_synthetic_corpus(recipes_loader)
+
+    def sample_then_filter(goal, meal_type, target, excluded, products):
+        recipes = recipes_loader.get_recipes(goal, meal_type, count=20)
+        suitable = []
+        for recipe in recipes:
+            if not target * 0.7 <= recipe['calories'] <= target * 1.3:
+                continue
+            names = list(recipe['ingredients'])
+            if any(e in ' '.join(names) for e in excluded):
+                continue
+            count = sum(1 for p in products if any(p in n for n in names))
+            if count:
+                suitable.append((recipe, count))
+        return suitable
+
+    queries = [
+        dict(target_calories=500, excluded=['лук'], ingredients=['курица', 'рис']),
+        dict(target_calories=700, ingredients=['говядина']),
+        dict(target_calories=400, allergies=['лактоза'], protein=(20, None)),
+        dict(target_calories=600, diet_type='vegan'),
+    ]
+    n = 200
+    recipe_query_engine.query('maintain', 'lunch')  # построение индексов
+
+    start = time.perf_counter()
+    found = 0
+    for _ in range(n):
+        for q in queries:
+            found += len(recipe_query_engine.query('maintain', 'lunch', limit=10, **q))
+    engine_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    old_found = 0
+    for _ in range(n):
+        for q in queries:
+            old_found += len(sample_then_filter('maintain', 'lunch', q['target_calories'],
+                                                q.get('excluded', []), q.get('ingredients', [])))
+    old_time = time.perf_counter() - start
+
+    print(f"Движок: {engine_time * 1e3 / (n * len(queries)):.3f} мс/запрос, "
+          f"в среднем {found / (n * len(queries)):.1f} кандидатов")
+    print(f"Выборка 20 + фильтр: {old_time * 1e3 / (n * len(queries)):.3f} мс/запрос, "
+          f"в среднем {old_found / (n * len(queries)):.1f} кандидатов")
@@ -1,13 +1,270 @@
 import random
 import json
 import os
+import re
+import sys
+import time
+import bisect
 import logging
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from content_snapshot import ContentSnapshot, FileWatcher
 
 logger = logging.getLogger(__name__)
 
+# Словарь синонимов для продуктов
+INGREDIENT_SYNONYMS = {
+    "мясо": ["говядина", "свинина", "баранина", "фарш"],
+    "курица": ["куриный", "курице", "курицы"],
+    "рыба": ["треска", "лосось", "тунец", "семга"],
+    "яйца": ["яйцо", "яичный"],
+    "рис": ["рисовый", "рисом"],
+    "гречка": ["гречневая", "гречку"],
+    "картофель": ["картошка", "картофеля"],
+    "молоко": ["молочный", "молока"],
+}
+
+_WORD_RE = re.compile(r"[a-zа-яё]+")
+
+# Окончания русских существительных и прилагательных (от длинных к коротким)
+_ENDINGS = (
+    "иями", "ями", "ами", "ого", "его", "ому", "ему", "ыми", "ими",
+    "ой", "ей", "ий", "ый", "ая", "яя", "ое", "ее", "ую", "юю",
+    "ом", "ем", "ам", "ям", "ах", "ях", "ов", "ев",
+    "ы", "и", "а", "я", "о", "е", "у", "ю", "ь", "й",
+)
+
+_MIN_STEM = 3
+
+
+def _stem(word: str) -> str:
+    """Лёгкий стеммер: отрезает одно окончание, оставляя основу не короче 3 букв"""
+    word = word.replace("ё", "е")
+    for ending in _ENDINGS:
+        if word.endswith(ending) and len(word) - len(ending) >= _MIN_STEM:
+            return word[:-len(ending)]
+    return word
+
+
+def _stems(text: str) -> List[str]:
+    return [_stem(w) for w in _WORD_RE.findall(text.lower())]
+
+
+# Синонимы, свёрнутые в основы: основа синонима -> основы базовых слов
+_SYNONYM_FOLD: Dict[str, set] = defaultdict(set)
+for _base, _words in INGREDIENT_SYNONYMS.items():
+    for _word in _words:
+        _SYNONYM_FOLD[_stem(_word)].add(_stem(_base))
+
+
+class _IngredientIndex(NamedTuple):
+    """Инвертированный индекс ингредиентов одного (цель, приём пищи)"""
+    postings: Dict[str, frozenset]  # основа -> номера рецептов
+    vocab: List[str]                # отсортированные основы для поиска по префиксу
+
+
+class RecipeRecord(NamedTuple):
+    """
+    Нормализованный рецепт: строки БЖУ разобраны, ингредиенты улучшены,
+    инструкции сгенерированы. Создаётся один раз при загрузке, неизменяем.
+    """
+    name: str
+    ingredients: Tuple[str, ...]
+    ingredient_names: Tuple[str, ...]  # названия ингредиентов вида "Название — количество"
+    ingredient_lines: Tuple[str, ...]  # их полные строки, попарно с ingredient_names
+    instructions: str
+    calories: int
+    protein: int
+    carbs: int
+    fats: int
+    search_text: str  # ингредиенты в нижнем регистре, по строке на ингредиент
+
+    def to_dict(self) -> dict:
+        """Словарь в старом формате (новая копия для каждого запроса)"""
+        ingredients = list(self.ingredients)
+        steps = [self.instructions]
+        return {
+            "Название блюда": self.name,
+            "Ингредиенты": ingredients,
+            "Приготовление": self.instructions,
+            "calories": self.calories,
+            "protein": self.protein,
+            "carbs": self.carbs,
+            "fats": self.fats,
+            # Добавляем поля для совместимости со старым кодом
+            "name_ru": self.name,
+            "name_en": self.name,  # Будет переводиться позже
+            "name_uz": self.name,  # Будет переводиться позже
+            "ingredients": dict(zip(self.ingredient_names, self.ingredient_lines)),  # Словарь для фильтрации
+            "steps_ru": steps,
+            "steps_en": list(steps),
+            "steps_uz": list(steps),
+        }
+
+
+class _RecipesContent(NamedTuple):
+    """Всё содержимое загрузчика; при перезагрузке заменяется одним присваиванием"""
+    recipes: Dict[str, Dict[str, list]]
+    records: Dict[str, Dict[str, Tuple[RecipeRecord, ...]]]
+    index: Dict[Tuple[str, str], _IngredientIndex]
+
+
 class RecipesLoader:
+    # Скомпилированный снимок: рецепты, записи и индекс ингредиентов
+    SNAPSHOT = ContentSnapshot("recipes", schema=4)
+    BOOK_PATH = "book"
+    MEAL_FILES = {
+        "breakfast": "breakfast.json",
+        "lunch": "lunch.json",
+        "dinner": "dinner.json"
+    }
+
     def __init__(self):
-        self.recipes = self._load_from_books()
+        self._content: _RecipesContent = self.SNAPSHOT.load(self._source_files(), self._compile)
+        self.content_version = 1
+        self._reload_lock = threading.Lock()
+        self._file_watcher = FileWatcher(self._source_files)
+        self._listeners: List[Callable[[], None]] = []
+
+    @property
+    def recipes(self):
+        return self._content.recipes
+
+    def current_content(self) -> _RecipesContent:
+        """Текущий согласованный снимок рецептов, записей и индекса"""
+        return self._content
+
+    @property
+    def records(self):
+        return self._content.records
+
+    def _source_files(self) -> List[str]:
+        """Файлы рецептов, от которых зависит снимок"""
+        if not os.path.isdir(self.BOOK_PATH):
+            return []
+        files = []
+        for goal_folder in sorted(os.listdir(self.BOOK_PATH)):
+            for filename in self.MEAL_FILES.values():
+                filepath = os.path.join(self.BOOK_PATH, goal_folder, filename)
+                if os.path.isfile(filepath):
+                    files.append(filepath)
+        return files
+
+    def _compile(self) -> _RecipesContent:
+        """Полная сборка из JSON: рецепты, готовые записи, индекс ингредиентов"""
+        recipes = self._load_from_books()
+        return _RecipesContent(recipes, self._build_records(recipes), self._build_ingredient_index(recipes))
+
+    def _build_records(self, recipes) -> Dict[str, Dict[str, Tuple[RecipeRecord, ...]]]:
+        """Конвертирует все рецепты один раз (порядок совпадает с self.recipes)"""
+        return {
+            goal: {meal_type: self._records_bucket(meal_recipes)
+                   for meal_type, meal_recipes in meals.items()}
+            for goal, meals in recipes.items()
+        }
+
+    def _records_bucket(self, meal_recipes) -> Tuple[RecipeRecord, ...]:
+        return tuple(self._make_record(r) for r in meal_recipes)
+
+    # ==================== ГОРЯЧАЯ ПЕРЕЗАГРУЗКА ====================
+
+    def add_reload_listener(self, callback: Callable[[], None]):
+        """Зарегистрировать функцию, вызываемую после каждой перезагрузки"""
+        self._listeners.append(callback)
+
+    def _bucket_for_file(self, path: str) -> Optional[Tuple[str, str]]:
+        """book/<цель>/<приём>.json -> (цель, приём)"""
+        parts = os.path.relpath(path, self.BOOK_PATH).split(os.sep)
+        if len(parts) != 2:
+            return None
+        goal, filename = parts
+        for meal_type, meal_filename in self.MEAL_FILES.items():
+            if filename == meal_filename and goal in self._content.recipes:
+                return goal, meal_type
+        return None
+
+    @staticmethod
+    def _read_meal_file(path: str) -> list:
+        """Читает один файл рецептов (удалённый файл - пустой список)"""
+        if not os.path.exists(path):
+            return []
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, list):
+            raise ValueError("expected a list of recipes")
+        return data
+
+    def reload_if_changed(self) -> bool:
+        """
+        Пересобрать изменённые файлы book/<цель>/<приём>.json
+
+        Пересобираются только затронутые (цель, приём пищи); новое
+        содержимое подменяется одним присваиванием. Возвращает True,
+        если что-то перезагружено.
+        """
+        with self._reload_lock:
+            changed = self._file_watcher.pending()
+            if not changed:
+                return False
+
+            start = time.perf_counter()
+            content = self._content
+            recipes = {goal: dict(meals) for goal, meals in content.recipes.items()}
+            records = {goal: dict(meals) for goal, meals in content.records.items()}
+            index = dict(content.index)
+
+            reloaded = []
+            failed = []
+            for path in changed:
+                bucket = self._bucket_for_file(path)
+                if bucket is None:
+                    self._file_watcher.mark_seen([path])
+                    continue
+                try:
+                    data = self._read_meal_file(path)
+                    bucket_records = self._records_bucket(data)
+                    bucket_index = self._index_bucket(data)
+                except Exception as e:
+                    # Оставляем старые рецепты; файл пробуем снова, когда он опять изменится
+                    logger.error(f"Failed to reload {path}: {e}")
+                    failed.append(path)
+                    continue
+                goal, meal_type = bucket
+                recipes[goal][meal_type] = data
+                records[goal][meal_type] = bucket_records
+                index[bucket] = bucket_index
+                reloaded.append(path)
+
+            self._file_watcher.mark_seen(reloaded + failed)
+            if not reloaded:
+                return False
+
+            # Атомарная подмена: один присваиваемый объект
+            self._content = _RecipesContent(recipes, records, index)
+            self.content_version += 1
+            elapsed = (time.perf_counter() - start) * 1000
+
+        logger.info(f"Recipes reloaded (version {self.content_version}): "
+                    f"{', '.join(reloaded)} in {elapsed:.1f} ms")
+        self._notify_listeners()
+        return True
+
+    def replace_recipes(self, recipes: Dict[str, Dict[str, list]]):
+        """Подменить все рецепты готовым словарём {цель: {приём: [рецепты]}} (бенчмарки, см. bench_corpus)"""
+        with self._reload_lock:
+            self._content = _RecipesContent(recipes, self._build_records(recipes),
+                                            self._build_ingredient_index(recipes))
+            self.content_version += 1
+        self._notify_listeners()
+
+    def _notify_listeners(self):
+        for callback in self._listeners:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Recipes reload listener failed: {e}")
 
     def _load_from_books(self):
         """Загрузка рецептов из папки book/ с разделением по целям"""
@@ -16,7 +273,7 @@ class RecipesLoader:
             "lose_weight": {"breakfast": [], "lunch": [], "dinner": []},
             "maintain": {"breakfast": [], "lunch": [], "dinner": []}
         }
-        book_path = "book"
+        book_path = self.BOOK_PATH
 
         # Проверяем существование папки
         if not os.path.exists(book_path):
@@ -30,13 +287,7 @@ class RecipesLoader:
                 continue
 
             # Загружаем файлы breakfast.json, lunch.json, dinner.json
-            meal_files = {
-                "breakfast": "breakfast.json",
-                "lunch": "lunch.json",
-                "dinner": "dinner.json"
-            }
-
-            for meal_type, filename in meal_files.items():
+            for meal_type, filename in self.MEAL_FILES.items():
                 filepath = os.path.join(folder_path, filename)
                 if os.path.exists(filepath):
                     try:
@@ -50,8 +301,84 @@ class RecipesLoader:
 
         return recipes
 
-    def _filter_by_meal(self, goal, meal_type):
-        """Фильтр по цели и типу приема пищи"""
+    @classmethod
+    def _build_ingredient_index(cls, recipes) -> Dict[Tuple[str, str], _IngredientIndex]:
+        """Строит индекс: основа слова из названия ингредиента -> рецепты"""
+        return {
+            (goal, meal_type): cls._index_bucket(meal_recipes)
+            for goal, meals in recipes.items()
+            for meal_type, meal_recipes in meals.items()
+        }
+
+    @staticmethod
+    def _index_bucket(meal_recipes) -> _IngredientIndex:
+        postings = defaultdict(set)
+        for recipe_id, recipe in enumerate(meal_recipes):
+            for ing in recipe.get("Ингредиенты", []):
+                # Индексируем только название, без количества
+                for stem in _stems(ing.split("—")[0]):
+                    postings[stem].add(recipe_id)
+                    for base in _SYNONYM_FOLD.get(stem, ()):
+                        postings[base].add(recipe_id)
+        return _IngredientIndex(
+            {stem: frozenset(ids) for stem, ids in postings.items()},
+            sorted(postings)
+        )
+
+    @staticmethod
+    def _lookup_stem(index: _IngredientIndex, stem: str) -> set:
+        """Рецепты, где есть слово с этой основой (или основой, начинающейся с неё)"""
+        if len(stem) < _MIN_STEM:
+            return set(index.postings.get(stem, ()))
+        found = set()
+        vocab = index.vocab
+        pos = bisect.bisect_left(vocab, stem)
+        while pos < len(vocab) and vocab[pos].startswith(stem):
+            found.update(index.postings[vocab[pos]])
+            pos += 1
+        return found
+
+    def ingredient_scores(self, goal, meal_type, ingredients,
+                          content: Optional[_RecipesContent] = None) -> Dict[int, int]:
+        """
+        Номер рецепта -> число совпавших ингредиентов пользователя
+
+        Слова одного ингредиента пересекаются (нужны все), разные ингредиенты
+        объединяются.
+        """
+        content = content or self._content
+        index = content.index.get(self._resolve_keys(goal, meal_type))
+        if index is None:
+            return {}
+
+        scores = defaultdict(int)
+        for user_ing in ingredients:
+            stems = _stems(user_ing)
+            if not stems:
+                continue
+            ids = self._lookup_stem(index, stems[0])
+            for stem in stems[1:]:
+                if not ids:
+                    break
+                ids &= self._lookup_stem(index, stem)
+            for recipe_id in ids:
+                scores[recipe_id] += 1
+        return scores
+
+    def _match_by_ingredients(self, goal, meal_type, ingredients,
+                              content: Optional[_RecipesContent] = None,
+                              rng: Optional[random.Random] = None) -> List[int]:
+        """Номера рецептов с ингредиентами пользователя, лучшие совпадения первыми"""
+        scores = self.ingredient_scores(goal, meal_type, ingredients, content)
+
+        # Случайный порядок среди рецептов с одинаковым числом совпадений
+        ranked = list(scores)
+        (rng or random).shuffle(ranked)
+        ranked.sort(key=scores.__getitem__, reverse=True)
+        return ranked
+
+    def _resolve_keys(self, goal, meal_type):
+        """Приводит цель и приём пищи к ключам self.recipes"""
         # Поддержка как русских, так и английских названий
         meal_map = {
             "завтрак": "breakfast",
@@ -64,6 +391,7 @@ class RecipesLoader:
 
         # Маппинг целей
         goal_map = {
+            'gain_weight': 'gain_weight',
             'gain_muscle': 'gain_weight',
             'набор_массы': 'gain_weight',
             'massa_oshirish': 'gain_weight',
@@ -71,92 +399,61 @@ class RecipesLoader:
             'похудение': 'lose_weight',
             'vazn_yoqotish': 'lose_weight',
             'maintain': 'maintain',
+            'maintain_weight': 'maintain',
             'поддержание': 'maintain',
             'saqlash': 'maintain'
         }
 
         eng_type = meal_map.get(meal_type.lower(), meal_type)
         eng_goal = goal_map.get(goal, 'maintain')
+        return eng_goal, eng_type
+
+    def _filter_by_meal(self, goal, meal_type):
+        """Фильтр по цели и типу приема пищи"""
+        eng_goal, eng_type = self._resolve_keys(goal, meal_type)
 
         # Получаем рецепты для конкретной цели
         if eng_goal in self.recipes and eng_type in self.recipes[eng_goal]:
             return self.recipes[eng_goal][eng_type]
         return []
 
-    def search_by_ingredients(self, goal, meal_type, ingredients):
-        filtered = self._filter_by_meal(goal, meal_type)
-        if not filtered or not ingredients:
+    def _records_for(self, goal, meal_type, content: Optional[_RecipesContent] = None) -> Tuple[RecipeRecord, ...]:
+        """Готовые записи рецептов для цели и типа приема пищи"""
+        content = content or self._content
+        eng_goal, eng_type = self._resolve_keys(goal, meal_type)
+        return content.records.get(eng_goal, {}).get(eng_type, ())
+
+    def search_by_ingredients(self, goal, meal_type, ingredients, rng: Optional[random.Random] = None):
+        # rng - источник случайности (без него - модуль random), см. plan_random
+        rng = rng or random
+        # Записи и индекс берём из одного и того же снимка содержимого
+        content = self._content
+        records = self._records_for(goal, meal_type, content)
+        if not records or not ingredients:
             return []
 
-        # Словарь синонимов для продуктов
-        synonyms = {
-            "мясо": ["говядина", "свинина", "баранина", "фарш"],
-            "курица": ["куриный", "курице", "курицы"],
-            "рыба": ["треска", "лосось", "тунец", "семга"],
-            "яйца": ["яйцо", "яичный"],
-            "рис": ["рисовый", "рисом"],
-            "гречка": ["гречневая", "гречку"],
-            "картофель": ["картошка", "картофеля"],
-            "молоко": ["молочный", "молока"],
-        }
-
-        # Ищем рецепты с совпадающими ингредиентами
-        matched = []
-        matched_set = set()
-
-        for recipe in filtered:
-            recipe_ings = recipe.get("Ингредиенты", [])
-            all_ings = " ".join(recipe_ings).lower()
-
-            # Проверяем каждый ингредиент пользователя
-            for user_ing in ingredients:
-                user_ing_lower = user_ing.lower().strip()
-
-                # Получаем синонимы
-                search_words = [user_ing_lower]
-                if user_ing_lower in synonyms:
-                    search_words.extend(synonyms[user_ing_lower])
-
-                # Для каждого слова создаем варианты окончаний
-                search_variants = []
-                for word in search_words:
-                    search_variants.extend([
-                        word,
-                        word + "а", word + "е", word + "и", word + "ы", word + "ом", word + "ой",
-                        word[:-1] if len(word) > 3 else word,
-                    ])
-
-                # Ищем совпадение
-                if any(variant in all_ings for variant in search_variants):
-                    recipe_id = id(recipe)
-                    if recipe_id not in matched_set:
-                        matched.append(recipe)
-                        matched_set.add(recipe_id)
-                    break
+        # Ищем рецепты с совпадающими ингредиентами по индексу
+        matched = self._match_by_ingredients(goal, meal_type, ingredients, content, rng)
 
-        # Если нашли совпадения - возвращаем их
+        # Если нашли совпадения - возвращаем лучшие
         if matched:
-            converted = [self._convert_to_old_format(r) for r in matched]
-            return random.sample(converted, min(10, len(converted)))
+            return [records[i].to_dict() for i in matched[:10]]
 
         # Если нет - возвращаем случайные
-        converted = [self._convert_to_old_format(r) for r in filtered]
-        return random.sample(converted, min(5, len(converted)))
+        return [r.to_dict() for r in rng.sample(records, min(5, len(records)))]
 
-    def get_recipes(self, goal, meal_type, count=10):
-        filtered = self._filter_by_meal(goal, meal_type)
-        if not filtered:
+    def get_recipes(self, goal, meal_type, count=10, rng: Optional[random.Random] = None):
+        records = self._records_for(goal, meal_type)
+        if not records:
             return []
-        # Конвертируем в старый формат
-        converted = [self._convert_to_old_format(r) for r in filtered]
-        return random.sample(converted, min(count, len(converted)))
+        # Сначала выбираем, потом копируем только выбранные
+        return [r.to_dict() for r in (rng or random).sample(records, min(count, len(records)))]
 
-    def get_recipe(self, goal, meal_type):
-        filtered = self._filter_by_meal(goal, meal_type)
-        if not filtered:
+    def get_recipe(self, goal, meal_type, rng: Optional[random.Random] = None):
+        records = self._records_for(goal, meal_type)
+        if not records:
             return self._create_default_recipe(meal_type)
-        recipe = random.choice(filtered)
-        return self._convert_to_old_format(recipe)
+        return (rng or random).choice(records).to_dict()
 
     def _generate_cooking_instructions(self, dish_name, ingredients_list):
         """Генерирует детальные инструкции приготовления на основе названия блюда"""
@@ -368,28 +665,39 @@ class RecipesLoader:
 
         return improved
 
-    def _convert_to_old_format(self, recipe):
-        """Конвертация формата рецепта из book/"""
+    def _make_record(self, recipe) -> RecipeRecord:
+        """Разбор рецепта из book/ в неизменяемую запись"""
         # Парсим БЖУ из строки "35/28/12"
-        bju = recipe.get("Конец. Б/Ж/У", "0/0/0").split("/")
-        protein = int(bju[0]) if len(bju) > 0 else 20
-        fats = int(bju[1]) if len(bju) > 1 else 15
-        carbs = int(bju[2]) if len(bju) > 2 else 40
+        try:
+            bju = recipe.get("Конец. Б/Ж/У", "0/0/0").split("/")
+            protein = int(bju[0]) if len(bju) > 0 else 20
+            fats = int(bju[1]) if len(bju) > 1 else 15
+            carbs = int(bju[2]) if len(bju) > 2 else 40
+        except (AttributeError, TypeError, ValueError):
+            logger.warning(f"Bad Б/Ж/У in recipe: {recipe.get('Название блюда')}")
+            protein, fats, carbs = 20, 15, 40
+
+        try:
+            calories = int(float(recipe.get("Ккал", 400)))
+        except (TypeError, ValueError):
+            logger.warning(f"Bad Ккал in recipe: {recipe.get('Название блюда')}")
+            calories = 400
 
         # Название блюда
-        dish_name = recipe.get("Название блюда", "Блюдо")
+        dish_name = sys.intern(recipe.get("Название блюда", "Блюдо"))
 
         # Ингредиенты - улучшаем их
         ingredients_list = recipe.get("Ингредиенты", [])
-        improved_ingredients = self._improve_ingredients(ingredients_list, dish_name)
+        improved_ingredients = [sys.intern(ing) for ing in self._improve_ingredients(ingredients_list, dish_name)]
 
-        ingredients_dict = {}
+        names = []
+        values = []
         for ing in improved_ingredients:
-            # Парсим "Яйцо — 4 шт" -> {"яйцо": 4}
+            # Парсим "Яйцо — 4 шт" -> {"яйцо": "Яйцо — 4 шт"}
             parts = ing.split("—")
             if len(parts) >= 2:
-                name = parts[0].strip().lower()
-                ingredients_dict[name] = ing  # Сохраняем полную строку
+                names.append(sys.intern(parts[0].strip().lower()))
+                values.append(ing)  # Сохраняем полную строку
 
         # Используем инструкции из JSON, если они есть
         cooking_instructions = recipe.get("Приготовление", "")
@@ -398,23 +706,22 @@ class RecipesLoader:
         if not cooking_instructions:
             cooking_instructions = self._generate_cooking_instructions(dish_name, improved_ingredients)
 
-        return {
-            "Название блюда": dish_name,
-            "Ингредиенты": improved_ingredients,
-            "Приготовление": cooking_instructions,
-            "calories": int(recipe.get("Ккал", 400)),
-            "protein": protein,
-            "carbs": carbs,
-            "fats": fats,
-            # Добавляем поля для совместимости со старым кодом
-            "name_ru": dish_name,
-            "name_en": dish_name,  # Будет переводиться позже
-            "name_uz": dish_name,  # Будет переводиться позже
-            "ingredients": ingredients_dict,  # Словарь для фильтрации
-            "steps_ru": [cooking_instructions],
-            "steps_en": [cooking_instructions],
-            "steps_uz": [cooking_instructions],
-        }
+        return RecipeRecord(
+            name=dish_name,
+            ingredients=tuple(improved_ingredients),
+            ingredient_names=tuple(names),
+            ingredient_lines=tuple(values),
+            instructions=sys.intern(cooking_instructions),
+            calories=calories,
+            protein=protein,
+            carbs=carbs,
+            fats=fats,
+            search_text="\n".join(improved_ingredients).lower(),
+        )
+
+    def _convert_to_old_format(self, recipe):
+        """Конвертация формата рецепта из book/"""
+        return self._make_record(recipe).to_dict()
 
     def _create_default_recipe(self, meal_type):
         return {
@@ -428,3 +735,84 @@ class RecipesLoader:
         }
 
 recipes_loader = RecipesLoader()
+
+
+if __name__ == "__main__":
+    # Сравнение поиска по ингредиентам: полный перебор против индекса
+    from bench_corpus import load_synthetic_corpus
+
+    def scan_search(loader, goal, meal_type, ingredients):
+        """Прежний алгоритм: перебор рецептов с вариантами окончаний"""
+        matched = []
+        for recipe in loader._filter_by_meal(goal, meal_type):
+            all_ings = " ".join(recipe.get("Ингредиенты", [])).lower()
+            for user_ing in ingredients:
+                user_ing_lower = user_ing.lower().strip()
+                search_words = [user_ing_lower] + INGREDIENT_SYNONYMS.get(user_ing_lower, [])
+                search_variants = []
+                for word in search_words:
+                    search_variants.extend([
+                        word,
+                        word + "а", word + "е", word + "и", word + "ы", word + "ом", word + "ой",
+                        word[:-1] if len(word) > 3 else word,
+                    ])
+                if any(variant in all_ings for variant in search_variants):
+                    matched.append(recipe)
+                    break
+        return matched
+
+    loader = recipes_loader
+    total = sum(len(r) for meals in loader.recipes.values() for r in meals.values())
+    if total == 0:
+        # Папки book/ нет - синтетический корпус того же формата
+        load_synthetic_corpus(loader)
+        total = sum(len(r) for meals in loader.recipes.values() for r in meals.values())
+
+    queries = [["курица", "рис"], ["мясо"], ["яйца", "молоко", "сыр"], ["рыба", "картофель"], ["гречка"]]
+    n = 50
+    print(f"Рецептов: {total}")
+
+    start = time.perf_counter()
+    for _ in range(n):
+        for goal in loader.recipes:
+            for meal in ("завтрак", "обед", "ужин"):
+                for q in queries:
+                    scan_search(loader, goal, meal, q)
+    scan_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(n):
+        for goal in loader.recipes:
+            for meal in ("завтрак", "обед", "ужин"):
+                for q in queries:
+                    loader._match_by_ingredients(goal, meal, q)
+    index_time = time.perf_counter() - start
+
+    searches = n * len(loader.recipes) * 3 * len(queries)
+    print(f"Перебор: {scan_time * 1e6 / searches:.1f} мкс/поиск")
+    print(f"Индекс:  {index_time * 1e6 / searches:.1f} мкс/поиск")
+    print(f"Ускорение: x{scan_time / index_time:.1f}")
+
+    # get_recipes: конвертация всех рецептов на каждый запрос против готовых записей
+    def convert_all_then_sample(loader, goal, meal_type, count=10):
+        converted = [loader._convert_to_old_format(r) for r in loader._filter_by_meal(goal, meal_type)]
+        return random.sample(converted, min(count, len(converted)))
+
+    n = 5
+    start = time.perf_counter()
+    for _ in range(n):
+        for goal in loader.recipes:
+            for meal in ("завтрак", "обед", "ужин"):
+                convert_all_then_sample(loader, goal, meal)
+    old_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(n):
+        for goal in loader.recipes:
+            for meal in ("завтрак", "обед", "ужин"):
+                loader.get_recipes(goal, meal)
+    new_time = time.perf_counter() - start
+
+    calls = n * len(loader.recipes) * 3
+    print(f"get_recipes (конвертация на запрос): {old_time * 1e3 / calls:.2f} мс/вызов")
+    print(f"get_recipes (готовые записи):        {new_time * 1e3 / calls:.3f} мс/вызов")
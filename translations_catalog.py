@@ -0,0 +1,259 @@
+"""
+КАТАЛОГ ПЕРЕВОДОВ
+Скомпилированные плоские таблицы переводов с горячей перезагрузкой
+"""
+
+import os
+import json
+import time
+import string
+import logging
+import threading
+from typing import Dict, List, Optional, Callable, Tuple, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+
+class _Template(NamedTuple):
+    """Заранее разобранный шаблон строки с плейсхолдерами"""
+    text: str
+    fields: frozenset
+
+
+class _Snapshot(NamedTuple):
+    """Неизменяемый снимок каталога (заменяется целиком при перезагрузке)"""
+    tables: Dict[str, Dict[str, str]]
+    templates: Dict[str, Dict[str, _Template]]
+    missing: Dict[str, List[str]]
+    mtime: float
+    version: int
+
+
+class TranslationsCatalog:
+    """
+    Скомпилированный каталог переводов
+
+    На каждый язык строится одна плоская таблица, в которой fallback на
+    русский уже подставлен, поэтому get() - это один поиск в словаре.
+    При изменении mtime файла каталог пересобирается и подменяется атомарно.
+    """
+
+    FALLBACK_LANG = "ru"
+
+    def __init__(self, path: str = "translations.json", check_interval: float = 2.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._listeners: List[Callable[[], None]] = []
+        self._snapshot = self._build(self._read(), self._get_mtime(), version=1)
+        self._log_missing_report()
+
+    # ==================== СБОРКА ====================
+
+    def _get_mtime(self) -> float:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return 0.0
+
+    def _read(self) -> Dict[str, Dict[str, str]]:
+        """Читает исходный JSON с переводами"""
+        if not os.path.exists(self.path):
+            logger.warning(f"Translations file not found: {self.path}")
+            return {}
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    @staticmethod
+    def _parse_template(text: str) -> Optional[_Template]:
+        """Возвращает шаблон, если в строке есть плейсхолдеры {name}"""
+        if '{' not in text:
+            return None
+        try:
+            fields = frozenset(
+                field for _, field, _, _ in string.Formatter().parse(text)
+                if field
+            )
+        except ValueError:
+            # Строка с одиночными фигурными скобками - не шаблон
+            return None
+        return _Template(text, fields) if fields else None
+
+    def _build(self, raw: Dict[str, Dict[str, str]], mtime: float, version: int) -> _Snapshot:
+        """Собирает плоские таблицы с уже разрешёнными fallback"""
+        base = raw.get(self.FALLBACK_LANG, {})
+        all_keys = set(base)
+        for lang_table in raw.values():
+            all_keys.update(lang_table)
+
+        tables = {}
+        templates = {}
+        missing = {}
+
+        for lang, lang_table in raw.items():
+            table = {}
+            lang_missing = []
+            for key in all_keys:
+                if key in lang_table:
+                    table[key] = lang_table[key]
+                else:
+                    table[key] = base.get(key, key)
+                    lang_missing.append(key)
+            tables[lang] = table
+            missing[lang] = sorted(lang_missing)
+
+            lang_templates = {}
+            for key, text in table.items():
+                template = self._parse_template(text)
+                if template:
+                    lang_templates[key] = template
+            templates[lang] = lang_templates
+
+        return _Snapshot(tables, templates, missing, mtime, version)
+
+    # ==================== ДОСТУП ====================
+
+    def get(self, key: str, lang: str = "ru") -> str:
+        """Получить перевод по ключу (fallback на русский уже разрешён)"""
+        tables = self._snapshot.tables
+        table = tables.get(lang) or tables.get(self.FALLBACK_LANG)
+        if table is None:
+            return key
+        return table.get(key, key)
+
+    def format(self, key: str, lang: str = "ru", **kwargs) -> str:
+        """
+        Получить перевод и подставить значения в шаблон
+
+        Отсутствующие аргументы не вызывают KeyError - плейсхолдер остаётся как есть.
+        """
+        snapshot = self._snapshot
+        lang_templates = snapshot.templates.get(lang) or snapshot.templates.get(self.FALLBACK_LANG, {})
+        template = lang_templates.get(key)
+        if template is None:
+            return self.get(key, lang)
+        if template.fields.issubset(kwargs):
+            return template.text.format(**kwargs)
+        return template.text.format_map(_SafeDict(kwargs))
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version
+
+    @property
+    def languages(self) -> Tuple[str, ...]:
+        return tuple(self._snapshot.tables)
+
+    # ==================== ГОРЯЧАЯ ПЕРЕЗАГРУЗКА ====================
+
+    def add_reload_listener(self, callback: Callable[[], None]):
+        """Зарегистрировать функцию, вызываемую после каждой перезагрузки"""
+        self._listeners.append(callback)
+
+    def reload_if_changed(self) -> bool:
+        """Перечитать файл, если изменился его mtime. Возвращает True при перезагрузке"""
+        mtime = self._get_mtime()
+        if mtime == self._snapshot.mtime:
+            return False
+
+        with self._lock:
+            if mtime == self._snapshot.mtime:
+                return False
+            try:
+                raw = self._read()
+            except (json.JSONDecodeError, OSError) as e:
+                # Оставляем старый каталог, пока файл не станет валидным
+                logger.error(f"Failed to reload translations: {e}")
+                return False
+
+            # Атомарная подмена: один присваиваемый объект
+            self._snapshot = self._build(raw, mtime, self._snapshot.version + 1)
+
+        logger.info(f"Translations reloaded (version {self._snapshot.version})")
+        self._log_missing_report()
+
+        for callback in self._listeners:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Translations reload listener failed: {e}")
+        return True
+
+    def _watch(self):
+        while not self._stop_event.wait(self.check_interval):
+            try:
+                self.reload_if_changed()
+            except Exception as e:
+                logger.error(f"Translations watcher error: {e}")
+
+    def start_watcher(self):
+        """Запускает фоновый поток, отслеживающий изменения файла"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._watch, name="translations-watcher", daemon=True)
+        self._thread.start()
+
+    def stop_watcher(self):
+        self._stop_event.set()
+
+    # ==================== ОТЧЁТ ====================
+
+    def missing_report(self) -> Dict[str, List[str]]:
+        """Ключи, для которых в языке нет собственного перевода"""
+        return {lang: list(keys) for lang, keys in self._snapshot.missing.items() if keys}
+
+    def _log_missing_report(self):
+        report = self.missing_report()
+        if not report:
+            logger.info("Translations: all keys present in all languages")
+            return
+        for lang, keys in report.items():
+            preview = ", ".join(keys[:10])
+            more = f" (+{len(keys) - 10})" if len(keys) > 10 else ""
+            logger.warning(f"Translations [{lang}]: {len(keys)} missing keys: {preview}{more}")
+
+
+class _SafeDict(dict):
+    """Словарь для format_map, оставляющий неизвестные плейсхолдеры как есть"""
+
+    def __missing__(self, key):
+        return "{" + key + "}"
+
+
+# Глобальный экземпляр каталога
+translations_catalog = TranslationsCatalog()
+
+
+if __name__ == "__main__":
+    # Сравнение скорости со старой реализацией t()
+    with open("translations.json", 'r', encoding='utf-8') as f:
+        raw = json.load(f)
+
+    def old_t(key, lang="ru"):
+        return raw.get(lang, {}).get(key, raw.get("ru", {}).get(key, key))
+
+    keys = list(raw.get("ru", {}))
+    n = 200
+
+    start = time.perf_counter()
+    for _ in range(n):
+        for lang in ("ru", "en", "uz"):
+            for key in keys:
+                old_t(key, lang)
+    old_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(n):
+        for lang in ("ru", "en", "uz"):
+            for key in keys:
+                translations_catalog.get(key, lang)
+    new_time = time.perf_counter() - start
+
+    calls = n * 3 * len(keys)
+    print(f"Calls: {calls}")
+    print(f"Old t(): {old_time * 1e9 / calls:.0f} ns/call")
+    print(f"Catalog: {new_time * 1e9 / calls:.0f} ns/call")
+    print(f"Missing keys: { {k: len(v) for k, v in translations_catalog.missing_report().items()} }")
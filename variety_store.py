@@ -0,0 +1,109 @@
+"""
+ИСТОРИЯ РАЗНООБРАЗИЯ
+Недавно выданные пользователю продукты, сочетания и упражнения: кольцевые
+буферы ограниченной длины, хранятся в БД вместе с пользователем
+"""
+
+import json
+import logging
+from collections import deque
+from contextlib import contextmanager
+from itertools import islice
+from typing import Deque, Dict, FrozenSet, Iterable, Iterator, Optional, Tuple
+
+from database import db, Database
+
+logger = logging.getLogger(__name__)
+
+# Длина буферов: планировщик питания смотрит последние 10-15 продуктов,
+# загрузчик тренировок - последние 20 упражнений раздела
+PRODUCTS_LIMIT = 20
+COMBINATIONS_LIMIT = 30
+EXERCISES_LIMIT = 20
+
+
+class VarietyHistory:
+    """
+    История разнообразия одного пользователя
+
+    Все буферы - deque с maxlen: добавление O(1), старые записи
+    вытесняются сами, размер в БД ограничен. Упражнения хранятся
+    по разделам (уровень_место_цель_тип), как их выбирает загрузчик.
+    """
+
+    VERSION = 1
+
+    def __init__(self, products: Iterable[str] = (), combinations: Iterable[Iterable[str]] = (),
+                 exercises: Dict[str, Iterable[str]] = None):
+        self.products: Deque[str] = deque(products, maxlen=PRODUCTS_LIMIT)
+        self.combinations: Deque[Tuple[str, ...]] = deque(
+            (tuple(combo) for combo in combinations), maxlen=COMBINATIONS_LIMIT
+        )
+        self.exercises: Dict[str, Deque[str]] = {
+            key: deque(names, maxlen=EXERCISES_LIMIT) for key, names in (exercises or {}).items()
+        }
+
+    def recent_products(self, count: int) -> FrozenSet[str]:
+        """Последние count выданных продуктов"""
+        return frozenset(islice(reversed(self.products), count))
+
+    def exercise_buffer(self, key: str) -> Deque[str]:
+        """Буфер недавних упражнений раздела (создаётся при первом обращении)"""
+        buffer = self.exercises.get(key)
+        if buffer is None:
+            buffer = self.exercises[key] = deque(maxlen=EXERCISES_LIMIT)
+        return buffer
+
+    def to_dict(self) -> dict:
+        return {
+            "version": self.VERSION,
+            "products": list(self.products),
+            "combinations": [list(combo) for combo in self.combinations],
+            "exercises": {key: list(names) for key, names in self.exercises.items() if names},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Optional["VarietyHistory"]:
+        if data.get("version") != cls.VERSION:
+            return None
+        return cls(data["products"], data["combinations"], data["exercises"])
+
+
+class VarietyStore:
+    """История разнообразия каждого пользователя (таблица user_variety)"""
+
+    def __init__(self, database: Database):
+        self.db = database
+
+    def load(self, user_id: Optional[int]) -> VarietyHistory:
+        """История пользователя; без user_id или записи в БД - пустая"""
+        if not user_id:
+            return VarietyHistory()
+        history_data = self.db.get_variety_history(user_id)
+        if not history_data:
+            return VarietyHistory()
+        try:
+            history = VarietyHistory.from_dict(json.loads(history_data))
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Stored variety history for {user_id} is unreadable: {e}")
+            history = None
+        return history or VarietyHistory()
+
+    def save(self, user_id: int, history: VarietyHistory) -> bool:
+        return self.db.save_variety_history(user_id, json.dumps(history.to_dict(), ensure_ascii=False))
+
+    @contextmanager
+    def session(self, user_id: Optional[int]) -> Iterator[VarietyHistory]:
+        """
+        История на время одной генерации: загружается, изменяется планировщиком
+        и сохраняется, если генерация прошла без исключения. Без user_id
+        история пустая и не сохраняется.
+        """
+        history = self.load(user_id)
+        yield history
+        if user_id:
+            self.save(user_id, history)
+
+
+# Глобальное хранилище
+variety_store = VarietyStore(db)
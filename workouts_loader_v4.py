@@ -6,8 +6,35 @@
 import random
 import json
 import os
+import time
+import logging
+import threading
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Any, Callable, Tuple
+
+from content_snapshot import ContentSnapshot, FileWatcher, list_json_files
+from text_matcher import get_matcher
+from variety_store import VarietyHistory
+from plan_random import plan_rng, WORKOUT_FORECAST
+
+logger = logging.getLogger(__name__)
+
+
+class WorkoutPlanRequest(NamedTuple):
+    """Заявка на тренировку для пакетной генерации (get_enhanced_workout_plans)"""
+    user_id: Optional[int]
+    goal: str
+    location: str
+    workout_type: str
+    duration_minutes: int = 30
+    level: str = 'intermediate'
+    muscle_group: Optional[str] = None
+    equipment_type: str = 'full'
+    energy_level: str = 'medium'
+    exercise_count: Optional[int] = None
+    history: Optional[VarietyHistory] = None
+    rng: Optional[random.Random] = None
+
 
 class WorkoutsLoaderV4:
     """
@@ -44,12 +71,113 @@ class WorkoutsLoaderV4:
         }
     }
 
+    WORKOUTS_PATH = "book/workouts_by_level"
+
+    # Слова, означающие что упражнению нужно оборудование
+    EQUIPMENT_KEYWORDS = [
+        'штанга', 'гантел', 'тренажер', 'блок', 'скамья',
+        'barbell', 'dumbbell', 'machine', 'bench', 'cable'
+    ]
+    LEVELS = ['beginner', 'intermediate', 'advanced']
+    LOCATIONS = ['home', 'gym', 'both']
+
+    # Скомпилированный снимок всех файлов упражнений
+    SNAPSHOT = ContentSnapshot("workouts", schema=1)
+
     def __init__(self) -> None:
-        self.workouts: Dict[str, Dict[str, Dict[str, List[Dict[str, Any]]]]] = self._load_workouts()
-        self.used_exercises: Dict[str, List[str]] = {}  # История использованных упражнений
+        self.workouts: Dict[str, Dict[str, Dict[str, List[Dict[str, Any]]]]] = self.SNAPSHOT.load(
+            self._source_files(), self._load_workouts
+        )
+        self.content_version = 1
+        self._reload_lock = threading.Lock()
+        self._file_watcher = FileWatcher(self._source_files)
+        self._listeners: List[Callable[[], None]] = []
         self.workout_history_file = "workout_history.json"  # Файл для истории тренировок
         self._init_workout_history()
 
+    def _source_files(self) -> List[str]:
+        return list_json_files(self.WORKOUTS_PATH)
+
+    # ==================== ГОРЯЧАЯ ПЕРЕЗАГРУЗКА ====================
+
+    def add_reload_listener(self, callback: Callable[[], None]):
+        """Зарегистрировать функцию, вызываемую после каждой перезагрузки"""
+        self._listeners.append(callback)
+
+    def _bucket_for_file(self, path: str) -> Optional[Tuple[str, str, str]]:
+        """<уровень>/<место>/<цель_тип>.json -> (уровень, место, цель_тип)"""
+        parts = os.path.relpath(path, self.WORKOUTS_PATH).split(os.sep)
+        if len(parts) != 3 or parts[0] not in self.LEVELS or parts[1] not in self.LOCATIONS:
+            return None
+        return parts[0], parts[1], parts[2].replace('.json', '')
+
+    def reload_if_changed(self) -> bool:
+        """
+        Пересобрать изменённые файлы упражнений
+
+        Копируются только словари на пути к изменённому файлу, остальное
+        дерево разделяется со старой версией; новое дерево подменяется
+        одним присваиванием. Возвращает True, если что-то перезагружено.
+        """
+        with self._reload_lock:
+            changed = self._file_watcher.pending()
+            if not changed:
+                return False
+
+            start = time.perf_counter()
+            workouts = dict(self.workouts)
+            reloaded = []
+            failed = []
+            for path in changed:
+                bucket = self._bucket_for_file(path)
+                if bucket is None:
+                    self._file_watcher.mark_seen([path])
+                    continue
+                level, location, key = bucket
+
+                data = None
+                if os.path.exists(path):
+                    try:
+                        with open(path, 'r', encoding='utf-8') as f:
+                            data = json.load(f)
+                    except (json.JSONDecodeError, OSError) as e:
+                        # Оставляем старые упражнения; файл пробуем снова, когда он опять изменится
+                        logger.error(f"Failed to reload {path}: {e}")
+                        failed.append(path)
+                        continue
+                    if not isinstance(data, list):
+                        logger.error(f"Invalid data format in {path}")
+                        failed.append(path)
+                        continue
+
+                level_dict = dict(workouts.get(level, {}))
+                location_dict = dict(level_dict.get(location, {}))
+                if data is None:
+                    location_dict.pop(key, None)
+                else:
+                    location_dict[key] = data
+                level_dict[location] = location_dict
+                workouts[level] = level_dict
+                reloaded.append(path)
+
+            self._file_watcher.mark_seen(reloaded + failed)
+            if not reloaded:
+                return False
+
+            # Атомарная подмена дерева упражнений
+            self.workouts = workouts
+            self.content_version += 1
+            elapsed = (time.perf_counter() - start) * 1000
+
+        logger.info(f"Workouts reloaded (version {self.content_version}): "
+                    f"{', '.join(reloaded)} in {elapsed:.1f} ms")
+        for callback in self._listeners:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Workouts reload listener failed: {e}")
+        return True
+
     def _init_workout_history(self):
         """Инициализация файла истории тренировок"""
         if not os.path.exists(self.workout_history_file):
@@ -69,11 +197,11 @@ class WorkoutsLoaderV4:
     def _load_workouts(self) -> Dict[str, Dict[str, Dict[str, List[Dict[str, Any]]]]]:
         """Загрузка тренировок из новой структуры"""
         workouts = {}
-        workouts_path = "book/workouts_by_level"
+        workouts_path = self.WORKOUTS_PATH
 
         try:
             # Уровни подготовки
-            for level in ['beginner', 'intermediate', 'advanced']:
+            for level in self.LEVELS:
                 workouts[level] = {}
                 level_path = os.path.join(workouts_path, level)
 
@@ -82,7 +210,7 @@ class WorkoutsLoaderV4:
                     continue
 
                 # Места
-                for location in ['home', 'gym', 'both']:
+                for location in self.LOCATIONS:
                     workouts[level][location] = {}
                     location_path = os.path.join(level_path, location)
 
@@ -122,7 +250,8 @@ class WorkoutsLoaderV4:
 
     def get_workout(self, goal: str, location: str, workout_type: str,
                     level: str = 'intermediate', exclude_recent: bool = True,
-                    muscle_group: str = None) -> Dict[str, Any]:
+                    muscle_group: str = None, history: VarietyHistory = None,
+                    rng: random.Random = None) -> Dict[str, Any]:
         """
         Получить одно упражнение
 
@@ -133,7 +262,12 @@ class WorkoutsLoaderV4:
             level: Уровень (beginner, intermediate, advanced)
             exclude_recent: Исключить недавно использованные
             muscle_group: Группа мышц (chest, back, legs, arms, shoulders, cardio, full_body)
+            history: История разнообразия пользователя (см. variety_store); без неё
+                недавние упражнения не учитываются
+            rng: Источник случайности (без него - модуль random), см. plan_random
         """
+        if history is None:
+            history = VarietyHistory()
         try:
             # Валидация параметров
             if not all([goal, location, workout_type, level]):
@@ -149,30 +283,20 @@ class WorkoutsLoaderV4:
                 return self._create_default_workout(workout_type)
 
             # Фильтруем недавно использованные
+            recent = history.exercise_buffer(f"{level}_{location}_{file_key}")
             if exclude_recent:
-                key = f"{level}_{location}_{file_key}"
-                recent = self.used_exercises.get(key, [])
                 available = [ex for ex in exercises if ex.get('Название упражнения') not in recent]
 
                 if not available:
-                    self.used_exercises[key] = []
+                    recent.clear()
                     available = exercises
             else:
                 available = exercises
 
-            selected = random.choice(available)
-
-            # Добавляем в историю
-            key = f"{level}_{location}_{file_key}"
-            if key not in self.used_exercises:
-                self.used_exercises[key] = []
+            selected = (rng or random).choice(available)
 
-            exercise_name = selected.get('Название упражнения', 'Unknown')
-            self.used_exercises[key].append(exercise_name)
-
-            # Ограничиваем историю
-            if len(self.used_exercises[key]) > 20:
-                self.used_exercises[key] = self.used_exercises[key][-20:]
+            # Добавляем в историю (буфер ограничен, старые вытесняются)
+            recent.append(selected.get('Название упражнения', 'Unknown'))
 
             return selected
         except (ValueError, KeyError, IndexError) as e:
@@ -184,58 +308,65 @@ class WorkoutsLoaderV4:
 
     def get_workouts(self, goal: str, location: str, workout_type: str,
                      level: str = 'intermediate', count: int = 10,
-                     exclude_recent: bool = True, muscle_group: str = None) -> List[Dict[str, Any]]:
+                     exclude_recent: bool = True, muscle_group: str = None,
+                     history: VarietyHistory = None, batch: Dict[tuple, list] = None,
+                     rng: random.Random = None) -> List[Dict[str, Any]]:
         """Получить несколько упражнений без повторений
 
         Args:
             muscle_group: Группа мышц для фильтрации (chest, back, legs, arms, shoulders)
+            history, rng: История разнообразия и источник случайности (как в get_workout)
+            batch: Общие кандидаты пакетной генерации (см. get_enhanced_workout_plans)
         """
+        if history is None:
+            history = VarietyHistory()
 
         file_key = f"{goal}_{workout_type}"
-        exercises = self._get_exercises(level, location, file_key)
+        group = (level, location, file_key, muscle_group)
+        exercises = batch.get(group) if batch is not None else None
+        if exercises is None:
+            exercises = self._get_exercises(level, location, file_key)
 
-        # Фильтруем по группе мышц если указана
-        if muscle_group and muscle_group not in ['full_body', 'cardio']:
-            exercises = self._filter_by_muscle_group(exercises, muscle_group)
+            # Фильтруем по группе мышц если указана
+            if muscle_group and muscle_group not in ['full_body', 'cardio']:
+                exercises = self._filter_by_muscle_group(exercises, muscle_group)
+            if batch is not None:
+                batch[group] = exercises
 
         if not exercises:
             return []
 
         # Фильтруем недавно использованные
+        recent = history.exercise_buffer(f"{level}_{location}_{file_key}")
         if exclude_recent:
-            key = f"{level}_{location}_{file_key}"
-            recent = self.used_exercises.get(key, [])
             available = [ex for ex in exercises if ex['Название упражнения'] not in recent]
 
             if len(available) < count:
-                self.used_exercises[key] = []
+                recent.clear()
                 available = exercises
         else:
             available = exercises
 
         # Выбираем случайные упражнения
-        selected = random.sample(available, min(count, len(available)))
+        selected = (rng or random).sample(available, min(count, len(available)))
 
-        # Обновляем историю
-        key = f"{level}_{location}_{file_key}"
-        if key not in self.used_exercises:
-            self.used_exercises[key] = []
-        self.used_exercises[key].extend([ex['Название упражнения'] for ex in selected])
-
-        if len(self.used_exercises[key]) > 20:
-            self.used_exercises[key] = self.used_exercises[key][-20:]
+        # Обновляем историю (буфер ограничен, старые вытесняются)
+        recent.extend(ex['Название упражнения'] for ex in selected)
 
         return selected
 
     def get_workout_plan_with_details(self, goal: str, location: str, workout_type: str,
                                        duration_minutes: int = 30,
                                        level: str = 'intermediate',
-                                       muscle_group: str = None) -> Dict[str, Any]:
+                                       muscle_group: str = None,
+                                       history: VarietyHistory = None,
+                                       rng: random.Random = None) -> Dict[str, Any]:
         """
         Создать детальный план тренировки с рекомендациями
 
         Args:
             muscle_group: Группа мышц для фильтрации упражнений
+            history, rng: История разнообразия и источник случайности (как в get_workout)
         """
         # Рассчитываем количество упражнений в зависимости от времени
         # 30 минут = 3-4 упражнения, 45 минут = 5-6, 60 минут = 6-8
@@ -251,7 +382,9 @@ class WorkoutsLoaderV4:
         exercises = self.get_workouts(goal, location, workout_type, level,
                                       count=exercise_count,
                                       exclude_recent=True,
-                                      muscle_group=muscle_group)
+                                      muscle_group=muscle_group,
+                                      history=history,
+                                      rng=rng)
 
         # Получаем рекомендации
         recommendations = self.WORKOUT_RECOMMENDATIONS[goal][workout_type]
@@ -394,7 +527,10 @@ class WorkoutsLoaderV4:
                                    muscle_group: str = None,
                                    equipment_type: str = 'full',
                                    energy_level: str = 'medium',
-                                   exercise_count: int = None) -> Dict[str, Any]:
+                                   exercise_count: int = None,
+                                   history: VarietyHistory = None,
+                                   batch: Dict[tuple, list] = None,
+                                   rng: random.Random = None) -> Dict[str, Any]:
         """
         УЛУЧШЕННЫЙ план тренировки с учетом всех параметров
 
@@ -402,6 +538,8 @@ class WorkoutsLoaderV4:
             equipment_type: 'bodyweight' (только вес тела), 'minimal' (минимум), 'full' (все)
             energy_level: 'high', 'medium', 'low', 'recovery'
             exercise_count: точное количество упражнений (если None - автоматически)
+            history, rng: История разнообразия и источник случайности (как в get_workout)
+            batch: Общие кандидаты пакетной генерации (см. get_enhanced_workout_plans)
         """
 
         # 1. РАСЧЕТ количества упражнений если не указано
@@ -428,7 +566,10 @@ class WorkoutsLoaderV4:
             level=level,
             count=exercise_count * 2,  # Берем больше для фильтрации
             exclude_recent=True,
-            muscle_group=muscle_group
+            muscle_group=muscle_group,
+            history=history,
+            batch=batch,
+            rng=rng
         )
 
         # 3. ФИЛЬТРУЕМ ПО ОБОРУДОВАНИЮ И ДОБАВЛЯЕМ FALLBACK
@@ -507,14 +648,39 @@ class WorkoutsLoaderV4:
             'cooldown': cooldown
         }
 
+    def get_enhanced_workout_plans(self, requests: Iterable[WorkoutPlanRequest]
+                                   ) -> Iterator[Tuple[WorkoutPlanRequest, Dict[str, Any]]]:
+        """
+        Пакетная генерация тренировок (например, ночной пересчёт)
+
+        Кандидаты (упражнения файла, отфильтрованные по группе мышц)
+        отбираются один раз на (уровень, место, цель_тип, группа мышц) и
+        общие для всех заявок группы; выбор с учётом истории - свой у
+        каждой. Заявки читаются и планы отдаются по одному.
+        """
+        batch: Dict[tuple, list] = {}
+        for request in requests:
+            plan = self.get_enhanced_workout_plan(
+                goal=request.goal,
+                location=request.location,
+                workout_type=request.workout_type,
+                duration_minutes=request.duration_minutes,
+                level=request.level,
+                muscle_group=request.muscle_group,
+                equipment_type=request.equipment_type,
+                energy_level=request.energy_level,
+                exercise_count=request.exercise_count,
+                history=request.history,
+                batch=batch,
+                rng=request.rng
+            )
+            yield request, plan
+
     def _filter_bodyweight_only(self, exercises: List[Dict[str, Any]], muscle_group: str = None) -> List[Dict[str, Any]]:
         """Фильтр: упражнения с весом тела для конкретной группы мышц"""
 
         # Слова-исключения (требуют оборудования)
-        equipment_keywords = [
-            'штанга', 'гантел', 'тренажер', 'блок', 'скамья',
-            'barbell', 'dumbbell', 'machine', 'bench', 'cable'
-        ]
+        equipment_matcher = get_matcher(self.EQUIPMENT_KEYWORDS)
 
         filtered = []
         for ex in exercises:
@@ -525,9 +691,7 @@ class WorkoutsLoaderV4:
             full_text = f"{name} {description} {technique}"
 
             # Проверяем что НЕТ оборудования
-            has_equipment = any(keyword in full_text for keyword in equipment_keywords)
-
-            if not has_equipment:
+            if not equipment_matcher.search(full_text):
                 filtered.append(ex)
 
         # Если мало упражнений - добавляем базовые для конкретной группы мышц
@@ -1443,9 +1607,11 @@ class WorkoutsLoaderV4:
             'improvement_areas': improvement_areas
         }
 
-    def forecast_progress(self, user_id: int) -> Dict:
+    def forecast_progress(self, user_id: int, rng: random.Random = None) -> Dict:
         """
         ПРОГНОЗ будущих результатов на основе текущего прогресса
+
+        Советы выбираются rng, по умолчанию - от (user_id, дата): в течение дня одни и те же
         """
         history = self._load_workout_history(user_id)
 
@@ -1496,7 +1662,7 @@ class WorkoutsLoaderV4:
         return {
             'month': month_forecast,
             'quarter': quarter_forecast,
-            'tips': random.sample(tips, min(3, len(tips)))
+            'tips': (rng or plan_rng(user_id, WORKOUT_FORECAST)).sample(tips, min(3, len(tips)))
         }
 
     def get_training_insights(self, user_id: int) -> Dict: